@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RSI 조건(meets_rsi_conditions) 벡터화 백테스트
+
+- 일봉 캐시(price_cache)의 전 종목 종가를 (종목 수, 일수) 행렬로 모아 RSI를 한 번에 계산
+- 조건마다 NumPy 불리언 마스크를 만들어 전 기간/전 종목의 신호를 한 번에 판정
+- 조건별 신호 수와 N일 후 수익률(상승 비율, 평균 수익률)을 집계
+- 종목을 묶음(shard)으로 나눠 프로세스 풀에서 병렬 처리하고 집계값만 합산
+- RSI는 수집기의 증분 계산과 같은 Wilder 평활 방식이 기본 (--simple-rsi로 단순 평균)
+- 수집기는 최근 30~36일만 받으므로, 긴 기간을 보려면 먼저 --backfill로 일봉 캐시를 채움
+
+실행 방법:
+python backtest.py [--cache-dir price_cache] [--workers 4] [--oversold 25 --rsi7-change 7 ...]
+python backtest.py --backfill 1250   # 종목별 약 5년치 일봉을 캐시에 받은 뒤 백테스트
+"""
+
+import os
+import glob
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from price_cache import PriceCache
+from rsi_engine import price_deltas, rsi_from_deltas
+from screen_rules import Screen, DEFAULT_THRESHOLDS, default_rules
+
+DEFAULT_HORIZONS = (1, 5, 20)
+
+
+def load_close_matrix(cache, tickers):
+    """
+    종목들의 캐시된 종가를 날짜 기준으로 맞춘 (종목 수, 일수) 행렬로 만듭니다.
+
+    Returns:
+        (종가 행렬, 날짜 배열(YYYYMMDD), 캐시가 있는 종목 리스트). 해당 날짜 일봉이 없으면 NaN
+    """
+    loaded = []
+    for ticker in tickers:
+        bars = cache.load(ticker)
+        if bars is not None and len(bars):
+            loaded.append((ticker, bars))
+
+    if not loaded:
+        return np.empty((0, 0)), np.empty(0, dtype=np.int32), []
+
+    dates = np.unique(np.concatenate([bars['date'] for _, bars in loaded]))
+    closes = np.full((len(loaded), len(dates)), np.nan)
+    for row, (_, bars) in enumerate(loaded):
+        closes[row, np.searchsorted(dates, bars['date'])] = bars['close']
+
+    return closes, dates, [ticker for ticker, _ in loaded]
+
+
+def rule_masks(rsi7, rsi14, thresholds=None, screen=None):
+    """
+    RSI 행렬에 선별 규칙을 적용하여 규칙별 신호 마스크를 만듭니다.
+
+    Args:
+        rsi7, rsi14: (종목 수, 일수) RSI 행렬 (결측은 NaN)
+        thresholds: 기본 규칙의 기준값 (DEFAULT_THRESHOLDS 중 바꿀 항목만, screen이 없을 때 사용)
+        screen: 선별 규칙 (screen_rules.Screen). RSI7, RSI14와 어제 값 열만 사용할 수 있음
+
+    Returns:
+        {규칙 이름: (종목 수, 일수) 불리언 배열, 'any': 하나라도 맞은 위치}.
+        첫 날은 어제 값이 없으므로 항상 False
+    """
+    if screen is None:
+        screen = Screen(default_rules(thresholds))
+
+    prev7 = np.full_like(rsi7, np.nan)
+    prev14 = np.full_like(rsi14, np.nan)
+    prev7[:, 1:] = rsi7[:, :-1]
+    prev14[:, 1:] = rsi14[:, :-1]
+
+    masks = screen.masks({'RSI7': rsi7, 'RSI14': rsi14, 'Yesterday_RSI7': prev7, 'Yesterday_RSI14': prev14})
+    masks['any'] = np.logical_or.reduce(list(masks.values()))
+    return masks
+
+
+def forward_returns(closes, horizons=DEFAULT_HORIZONS):
+    """
+    각 시점에서 N일(거래일) 후까지의 수익률을 계산합니다.
+
+    Returns:
+        {N: (종목 수, 일수) 수익률 배열}. 이후 가격이 없으면 NaN
+    """
+    returns = {}
+    for horizon in horizons:
+        future = np.full_like(closes, np.nan)
+        if horizon < closes.shape[1]:
+            future[:, :-horizon] = closes[:, horizon:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[horizon] = future / closes - 1
+    return returns
+
+
+def evaluate(closes, thresholds=None, horizons=DEFAULT_HORIZONS, wilder=True, screen=None):
+    """
+    종가 행렬 하나에 대해 조건별 집계값을 계산합니다. (종목 묶음 단위로 합산 가능한 값)
+
+    Returns:
+        {'days': 판정 가능한 종목-일 수,
+         'rules': {조건: {'signals': 신호 수, 'horizons': {N: {'n', 'positive', 'sum'}}}}}
+    """
+    gains, losses, valid = price_deltas(closes)
+    rsi7, _, _ = rsi_from_deltas(gains, losses, valid, 7, wilder=wilder)
+    rsi14, _, _ = rsi_from_deltas(gains, losses, valid, 14, wilder=wilder)
+
+    masks = rule_masks(rsi7, rsi14, thresholds, screen)
+    returns = forward_returns(closes, horizons)
+
+    ready = ~np.isnan(rsi14)
+    ready[:, 1:] &= ~np.isnan(rsi14[:, :-1])
+    ready[:, 0] = False
+
+    report = {'days': int(ready.sum()), 'rules': {}}
+    for name, mask in masks.items():
+        stats = {'signals': int(mask.sum()), 'horizons': {}}
+        for horizon, values in returns.items():
+            picked = values[mask]
+            picked = picked[~np.isnan(picked)]
+            stats['horizons'][horizon] = {
+                'n': int(picked.size),
+                'positive': int((picked > 0).sum()),
+                'sum': float(picked.sum()),
+            }
+        report['rules'][name] = stats
+    return report
+
+
+def merge_reports(reports):
+    """종목 묶음별 집계값을 합칩니다."""
+    total = {'days': 0, 'rules': {}}
+    for report in reports:
+        total['days'] += report['days']
+        for name, stats in report['rules'].items():
+            merged = total['rules'].setdefault(name, {'signals': 0, 'horizons': {}})
+            merged['signals'] += stats['signals']
+            for horizon, values in stats['horizons'].items():
+                target = merged['horizons'].setdefault(horizon, {'n': 0, 'positive': 0, 'sum': 0.0})
+                for key in target:
+                    target[key] += values[key]
+    return total
+
+
+def _run_shard(args):
+    """프로세스 풀 작업: 종목 묶음 하나를 캐시에서 읽어 집계합니다."""
+    cache_dir, tickers, thresholds, horizons, wilder, rules = args
+    cache = PriceCache(cache_dir)
+    closes, _, loaded = load_close_matrix(cache, tickers)
+    if not loaded:
+        return {'days': 0, 'rules': {}}
+    # 컴파일된 규칙은 프로세스 간에 넘길 수 없으므로 규칙 정의를 받아 작업 프로세스에서 컴파일
+    screen = Screen(*rules) if rules else None
+    return evaluate(closes, thresholds, horizons, wilder, screen)
+
+
+def run_backtest(cache_dir="price_cache", tickers=None, thresholds=None, horizons=DEFAULT_HORIZONS,
+                 workers=None, shard_size=250, wilder=True, rules=None):
+    """
+    일봉 캐시 전체(또는 지정 종목)에 대해 백테스트를 실행합니다.
+
+    Args:
+        cache_dir: 일봉 캐시 디렉토리
+        tickers: 종목코드 목록 (None이면 캐시에 있는 전 종목)
+        thresholds: 기준값 (DEFAULT_THRESHOLDS 중 바꿀 항목만)
+        horizons: 수익률을 볼 거래일 수 목록
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        shard_size: 프로세스 하나가 처리할 종목 수
+        wilder: True면 수집기의 증분 RSI와 같은 Wilder 평활, False면 최근 N일 변화량의 단순 평균
+        rules: (규칙 목록, require 목록) 튜플. 있으면 thresholds 대신 이 선별 규칙으로 백테스트
+
+    Returns:
+        merge_reports() 형식의 집계값
+    """
+    if tickers is None:
+        tickers = sorted(os.path.basename(path)[:-4] for path in glob.glob(os.path.join(cache_dir, '*.npy')))
+
+    shards = [tickers[i:i + shard_size] for i in range(0, len(tickers), shard_size)]
+    jobs = [(cache_dir, shard, thresholds, tuple(horizons), wilder, rules) for shard in shards]
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        reports = [_run_shard(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            reports = list(executor.map(_run_shard, jobs))
+
+    logging.info(f"백테스트 완료: {len(tickers)}개 종목, {len(shards)}개 묶음")
+    return merge_reports(reports)
+
+
+def backfill(cache_dir="price_cache", days=1250, tickers=None, market='KOSPI200'):
+    """
+    종목별 일봉을 차트 API에서 days일치 받아 일봉 캐시를 채웁니다.
+
+    캐시 보관 한도도 days 이상으로 맞추며, 이후 매일 수집에서 합쳐지는 일봉은 그 길이를 유지합니다.
+
+    Args:
+        cache_dir: 일봉 캐시 디렉토리
+        days: 종목별로 받을 일봉 수 (약 250일 = 1년)
+        tickers: 종목코드 목록 (None이면 market의 종목 목록)
+        market: 종목 목록을 받을 시장 ('KOSPI200', 'KOSPI', 'KOSDAQ')
+
+    Returns:
+        days일 이상 캐시된 종목 수
+    """
+    from data_collector import NaverStockDataCollector
+
+    collector = NaverStockDataCollector(cache_dir=cache_dir, market=market, cache_max_bars=days)
+    if tickers is None:
+        tickers = [stock['ticker'] for stock in collector.get_kospi200_list()]
+    return collector.backfill_cache(tickers, days)
+
+
+def format_report(report, horizons=DEFAULT_HORIZONS):
+    """집계값을 표 형태의 문자열로 만듭니다."""
+    days = report['days']
+    header = f"{'조건':<18} {'신호 수':>10} {'발생률':>8}"
+    for horizon in horizons:
+        header += f" {f'{horizon}일 상승':>10} {f'{horizon}일 평균':>10}"
+    lines = [header]
+
+    for name, stats in report['rules'].items():
+        line = f"{name:<18} {stats['signals']:>10,} {stats['signals'] / days if days else 0:>8.1%}"
+        for horizon in horizons:
+            values = stats['horizons'].get(horizon, {'n': 0})
+            if values['n']:
+                line += f" {values['positive'] / values['n']:>10.1%} {values['sum'] / values['n']:>10.2%}"
+            else:
+                line += f" {'-':>10} {'-':>10}"
+        lines.append(line)
+
+    lines.append(f"판정 가능한 종목-일 수: {days:,}")
+    return '\n'.join(lines)
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="RSI 조건 백테스트")
+    parser.add_argument('--cache-dir', default="price_cache", help="일봉 캐시 디렉토리")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--shard-size', type=int, default=250, help="프로세스 하나가 처리할 종목 수")
+    parser.add_argument('--horizons', default=','.join(map(str, DEFAULT_HORIZONS)), help="수익률 기간 (예: 1,5,20)")
+    parser.add_argument('--simple-rsi', action='store_true', help="Wilder 평활 대신 단순 평균 RSI 사용")
+    parser.add_argument('--backfill', type=int, metavar='DAYS', help="백테스트 전에 종목별 DAYS일치 일봉을 캐시에 받음")
+    parser.add_argument('--market', default='KOSPI200', help="백필할 종목 목록의 시장 (KOSPI200, KOSPI, KOSDAQ)")
+    parser.add_argument('--rules', help="선별 규칙 설정 파일 (screen_rules.json 형식, 지정하면 기준값 옵션 대신 사용)")
+    for key, value in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=float, default=value)
+    args = parser.parse_args()
+
+    horizons = tuple(int(value) for value in args.horizons.split(',') if value)
+    thresholds = {key: getattr(args, key) for key in DEFAULT_THRESHOLDS}
+
+    if args.backfill:
+        backfill(args.cache_dir, args.backfill, market=args.market)
+
+    rules = None
+    if args.rules:
+        screen = Screen.load(args.rules)
+        rules = ([{'name': name, 'when': when} for name, when, _ in screen.rules], screen.require)
+
+    report = run_backtest(args.cache_dir, thresholds=thresholds, horizons=horizons,
+                          workers=args.workers, shard_size=args.shard_size, wilder=not args.simple_rsi, rules=rules)
+    print(format_report(report, horizons))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+내용 주소 기반(content-addressed) 압축 백업 저장소
+
+- 파일을 줄 단위 내용 기반 청크로 나누고, 청크는 SHA-256 해시를 이름으로 zlib 압축하여 한 번만 저장
+  (경계는 줄 내용으로 정하므로 앞쪽에 새 날짜 행이 추가돼도 나머지 청크는 그대로 재사용됨)
+- 백업(스냅샷)은 청크 해시 목록만 담은 작은 JSON 매니페스트
+- 복구는 청크를 하나씩 읽어 해시를 확인하며 임시 파일에 쓴 뒤 교체
+
+디렉토리 구조:
+    backups/
+    ├── objects/ab/cdef...    # 압축된 청크 (해시 앞 2자리로 분산)
+    └── snapshots/results_코스피_200_20250721_160231.json
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import logging
+from datetime import datetime
+
+# 청크 경계: 줄의 CRC32 하위 비트가 모두 0이면 청크를 끊음 (평균 약 32줄)
+_BOUNDARY_MASK = 0x1F
+_MIN_CHUNK_LINES = 8
+_MAX_CHUNK_LINES = 256
+
+
+def iter_chunks(f):
+    """
+    파일 객체(바이너리)를 줄 단위 내용 기반 청크로 나눠 차례로 반환합니다.
+    파일 전체를 메모리에 올리지 않습니다.
+    """
+    lines = []
+    for line in f:
+        lines.append(line)
+        if len(lines) >= _MAX_CHUNK_LINES or (
+                len(lines) >= _MIN_CHUNK_LINES and zlib.crc32(line) & _BOUNDARY_MASK == 0):
+            yield b''.join(lines)
+            lines = []
+    if lines:
+        yield b''.join(lines)
+
+
+class BackupStore:
+    def __init__(self, root="backups"):
+        """
+        Args:
+            root: 백업 저장소 디렉토리
+        """
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.snapshots_dir = os.path.join(root, "snapshots")
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _put_chunk(self, chunk):
+        """
+        청크를 저장하고 해시를 반환합니다.
+
+        Returns:
+            (해시, 새로 저장한 압축 크기. 이미 있으면 0) 튜플
+        """
+        digest = hashlib.sha256(chunk).hexdigest()
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = zlib.compress(chunk, 6)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        return digest, len(compressed)
+
+    def _get_chunk(self, digest):
+        """청크를 읽어 압축을 풀고 해시를 확인합니다."""
+        with open(self._object_path(digest), 'rb') as f:
+            chunk = zlib.decompress(f.read())
+        if hashlib.sha256(chunk).hexdigest() != digest:
+            raise ValueError(f"백업 청크 손상: {digest}")
+        return chunk
+
+    def snapshot_path(self, snapshot_id):
+        """스냅샷 ID(또는 매니페스트 경로)의 매니페스트 경로를 반환합니다."""
+        if snapshot_id.endswith('.json') and os.path.exists(snapshot_id):
+            return snapshot_id
+        return os.path.join(self.snapshots_dir, f"{snapshot_id}.json")
+
+    def create(self, filename):
+        """
+        파일의 스냅샷을 만듭니다.
+
+        Returns:
+            스냅샷 매니페스트 딕셔너리 ('id', 'source', 'created', 'size', 'checksum', 'chunks', 'new_bytes')
+        """
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        snapshot_id = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        suffix = 1
+        while os.path.exists(self.snapshot_path(snapshot_id)):
+            suffix += 1
+            snapshot_id = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{suffix}"
+
+        checksum = hashlib.sha256()
+        chunks = []
+        size = 0
+        new_bytes = 0
+
+        with open(filename, 'rb') as f:
+            for chunk in iter_chunks(f):
+                digest, stored = self._put_chunk(chunk)
+                chunks.append(digest)
+                checksum.update(chunk)
+                size += len(chunk)
+                new_bytes += stored
+
+        snapshot = {
+            'id': snapshot_id,
+            'source': filename,
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'size': size,
+            'checksum': f"sha256:{checksum.hexdigest()}",
+            'chunks': chunks,
+            'new_bytes': new_bytes,
+        }
+
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        path = self.snapshot_path(snapshot_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return snapshot
+
+    def load(self, snapshot_id):
+        """스냅샷 매니페스트를 읽습니다."""
+        with open(self.snapshot_path(snapshot_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def restore(self, snapshot_id, target_filename):
+        """
+        스냅샷을 청크 단위로 읽어 파일로 복구합니다. 전체 체크섬이 맞을 때만 대상 파일을 교체합니다.
+
+        Returns:
+            복구한 바이트 수
+        """
+        snapshot = self.load(snapshot_id)
+        checksum = hashlib.sha256()
+        size = 0
+
+        directory = os.path.dirname(target_filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{target_filename}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for digest in snapshot['chunks']:
+                    chunk = self._get_chunk(digest)
+                    checksum.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+            if f"sha256:{checksum.hexdigest()}" != snapshot['checksum']:
+                raise ValueError(f"백업 체크섬 불일치: {snapshot['id']}")
+            os.replace(tmp_path, target_filename)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return size
+
+    def list_snapshots(self, source=None):
+        """
+        스냅샷 목록을 최신순으로 반환합니다.
+
+        Args:
+            source: 원본 파일명을 지정하면 해당 파일의 스냅샷만
+        """
+        if not os.path.exists(self.snapshots_dir):
+            return []
+
+        snapshots = []
+        for name in os.listdir(self.snapshots_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                snapshot = self.load(os.path.join(self.snapshots_dir, name))
+            except (OSError, ValueError) as e:
+                logging.warning(f"스냅샷 매니페스트 읽기 실패: {name} ({e})")
+                continue
+            if source is None or os.path.basename(snapshot['source']) == os.path.basename(source):
+                snapshots.append(snapshot)
+
+        return sorted(snapshots, key=lambda s: (s['created'], s['id']), reverse=True)
+
+    def stats(self):
+        """저장소 통계 (스냅샷 수, 원본 크기 합계, 청크 수, 실제 저장 크기)"""
+        snapshots = self.list_snapshots()
+        objects = 0
+        stored = 0
+        if os.path.exists(self.objects_dir):
+            for directory, _, files in os.walk(self.objects_dir):
+                for name in files:
+                    objects += 1
+                    stored += os.path.getsize(os.path.join(directory, name))
+
+        return {
+            'snapshots': len(snapshots),
+            'logical_bytes': sum(s['size'] for s in snapshots),
+            'objects': objects,
+            'stored_bytes': stored,
+        }
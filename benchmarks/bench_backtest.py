@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RSI 조건 백테스트 벤치마크
+
+가상 일봉 캐시(기본 2,000종목 × 10년)를 만들어 backtest.run_backtest의 실행 시간을
+단일 프로세스와 프로세스 풀로 비교하고, 조건 마스크가 기존 meets_rsi_conditions와
+같은 판정을 내리는지 일부 종목에서 확인합니다. (기본 선별 규칙 기준)
+
+실행 방법:
+python benchmarks/bench_backtest.py [종목 수] [일수]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_cache import BAR_DTYPE
+from rsi_engine import calculate_rsi_batch
+from backtest import run_backtest, rule_masks, format_report, DEFAULT_HORIZONS
+
+
+def make_cache(cache_dir, n_tickers, n_days, seed=0):
+    """가상 일봉 캐시를 만듭니다. (종목마다 상장일이 달라 앞부분이 비어 있을 수 있음)"""
+    rng = np.random.default_rng(seed)
+    calendar = np.arange(np.datetime64('2015-01-05'), np.datetime64('2015-01-05') + n_days * 7 // 5 + 10)
+    calendar = calendar[np.is_busday(calendar)][:n_days]
+    dates = np.array([int(str(day).replace('-', '')) for day in calendar], dtype=np.int32)
+
+    for i in range(n_tickers):
+        start = int(rng.integers(0, n_days // 4)) if i % 5 == 0 else 0
+        closes = np.round(50000 * np.cumprod(1 + rng.normal(0, 0.02, n_days - start)))
+        bars = np.zeros(n_days - start, dtype=BAR_DTYPE)
+        bars['date'] = dates[start:]
+        bars['open'] = bars['high'] = bars['low'] = bars['close'] = closes
+        np.save(os.path.join(cache_dir, f"{i:06d}.npy"), bars)
+
+
+def legacy_meets(rsi_data):
+    """기존 data_collector.meets_rsi_conditions의 조건 판정 (종목 하나씩)"""
+    rsi7 = rsi_data.get('RSI7')
+    rsi14 = rsi_data.get('RSI14')
+    rsi7_yesterday = rsi_data.get('Yesterday_RSI7')
+    rsi14_yesterday = rsi_data.get('Yesterday_RSI14')
+
+    if not all([rsi7, rsi14, rsi7_yesterday, rsi14_yesterday]):
+        return False
+    if rsi7 <= 30 or rsi7 >= 70:
+        return True
+    if rsi14 <= 30 or rsi14 >= 70:
+        return True
+    if abs(rsi7 - rsi7_yesterday) >= 5:
+        return True
+    if abs(rsi14 - rsi14_yesterday) >= 3:
+        return True
+    if (rsi7_yesterday <= 50 and rsi7 > 50) or (rsi7_yesterday >= 50 and rsi7 < 50):
+        return True
+    return False
+
+
+def check_against_legacy(cache_dir, n_check=20):
+    """
+    기본 규칙의 'any' 마스크가 기존 조건 판정과 같은지 확인합니다.
+    (기존 판정은 RSI가 정확히 0이면 값이 없는 것으로 취급했으므로 그런 날은 비교에서 제외)
+    """
+    for i in range(n_check):
+        closes = np.load(os.path.join(cache_dir, f"{i:06d}.npy"))['close'][:300].reshape(1, -1)
+        rsi = calculate_rsi_batch(closes, last_n=None)
+        mask = rule_masks(rsi[7], rsi[14])['any'][0]
+        for day in range(1, closes.shape[1]):
+            values = [rsi[7][0, day], rsi[14][0, day], rsi[7][0, day - 1], rsi[14][0, day - 1]]
+            if 0 in values:
+                continue
+            data = dict(zip(['RSI7', 'RSI14', 'Yesterday_RSI7', 'Yesterday_RSI14'],
+                            [None if np.isnan(v) else float(v) for v in values]))
+            assert bool(mask[day]) == legacy_meets(data), (i, day, data)
+
+
+def main():
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_days = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        make_cache(cache_dir, n_tickers, n_days)
+        print(f"캐시 생성: {n_tickers:,}종목 × {n_days:,}일 ({time.perf_counter() - start:.1f}s)")
+
+        check_against_legacy(cache_dir)
+        print("조건 판정 일치 (meets_rsi_conditions)")
+
+        for workers in (1, os.cpu_count() or 1):
+            start = time.perf_counter()
+            report = run_backtest(cache_dir, workers=workers)
+            print(f"프로세스 {workers}개: {time.perf_counter() - start:.2f}s")
+
+        print(format_report(report, DEFAULT_HORIZONS))
+
+
+if __name__ == "__main__":
+    main()
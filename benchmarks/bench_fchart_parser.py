@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+차트 API(fchart) 응답 파서 마이크로 벤치마크
+
+price_parser.parse_fchart_sise(정규식 없이 OHLCV 전체를 배열로 변환)를 다음 두 방식과 비교합니다.
+- 종가만: 일봉 캐시 도입 전 방식 (정규식 + split + float, 종가만 추출)
+- OHLCV: 일봉 캐시 도입 후 바로 대체한 방식 (정규식 + split, 일봉 전체를 구조화 배열로 변환)
+캐시에 일봉 전체가 필요하므로 실제 운영에서 비교할 대상은 OHLCV 방식입니다.
+일봉 캐시를 사용하면 대부분의 요청은 1~2개 일봉, 캐시가 없으면 30~36개 일봉입니다.
+
+실행 방법:
+python benchmarks/bench_fchart_parser.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_parser import parse_fchart_sise
+from price_cache import BAR_DTYPE
+
+
+def make_response(n_bars, seed=0):
+    """n_bars개 일봉이 들어 있는 차트 API 응답(bytes)을 생성합니다."""
+    rng = np.random.default_rng(seed)
+    closes = 50000 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    start = np.datetime64('2015-01-01')
+
+    items = []
+    for i, close in enumerate(closes):
+        day = str(start + i).replace('-', '')
+        items.append(
+            f'<item data="{day}|{close * 0.99:.0f}|{close * 1.01:.0f}|{close * 0.98:.0f}|{close:.0f}|{rng.integers(1e5, 1e7)}" />'
+        )
+
+    return (
+        '<?xml version="1.0" encoding="EUC-KR" ?>\n'
+        '<protocol>\n<chartdata symbol="005930" name="삼성전자" count="%d" timeframe="day" precision="0" origintime="19900103">\n'
+        % n_bars + '\n'.join(items) + '\n</chartdata>\n</protocol>\n'
+    ).encode('utf-8')
+
+
+def legacy_parse(content):
+    """기존 data_collector의 차트 API 파싱 방식 (종가만 추출)"""
+    text = content.decode('utf-8')
+    prices = []
+    pattern = r'<item data="([^"]+)"\s*/>'
+    for match in re.findall(pattern, text):
+        try:
+            parts = match.split('|')
+            if len(parts) >= 5:
+                prices.append(float(parts[4]))
+        except (ValueError, IndexError):
+            continue
+    return prices
+
+
+def regex_bars_parse(content):
+    """일봉 캐시 도입 후 대체 전의 파싱 방식 (정규식으로 항목을 찾아 OHLCV 배열로 변환)"""
+    bars = []
+    for match in re.findall(r'<item data="([^"]+)"\s*/>', content.decode('utf-8')):
+        try:
+            parts = match.split('|')
+            if len(parts) >= 6:
+                bars.append((int(parts[0]), float(parts[1]), float(parts[2]),
+                             float(parts[3]), float(parts[4]), int(float(parts[5]))))
+        except (ValueError, IndexError):
+            continue
+    return np.array(bars, dtype=BAR_DTYPE)
+
+
+def measure(func, content, number):
+    return min(timeit.repeat(lambda: func(content), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'일봉 수':>8} {'종가만(µs)':>12} {'OHLCV(µs)':>12} {'신규(µs)':>12} {'OHLCV 대비':>10}")
+
+    for n_bars in (1, 2, 30, 36, 250, 2500):
+        content = make_response(n_bars)
+
+        # 세 방식의 결과가 같은지 먼저 확인
+        bars = parse_fchart_sise(content)
+        assert legacy_parse(content) == bars['close'].tolist()
+        assert (regex_bars_parse(content) == bars).all()
+
+        number = max(20, 20000 // n_bars)
+        legacy = measure(legacy_parse, content, number)
+        regex_bars = measure(regex_bars_parse, content, number)
+        fast = measure(parse_fchart_sise, content, number)
+
+        print(f"{n_bars:>8} {legacy * 1e6:>12.1f} {regex_bars * 1e6:>12.1f} {fast * 1e6:>12.1f} {regex_bars / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목 HTML 페이지 현재가 추출 벤치마크
+
+기존 방식(BeautifulSoup html.parser로 전체 DOM 생성 후 .no_today .blind 선택)과
+price_parser.extract_current_price(바이트 검색)를 비교합니다.
+
+tests/fixtures/naver/ 에 저장된 종목 페이지(item_*.html, BeautifulSoup 대체 경로를 타는 페이지 포함)를
+사용하며, 다른 디렉토리의 *.html 페이지를 지정할 수도 있습니다.
+
+실행 방법:
+python benchmarks/bench_html_extract.py [샘플 디렉토리]
+"""
+
+import os
+import sys
+import glob
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+
+from price_parser import extract_current_price
+
+SAMPLE_DIR = os.path.join(ROOT, 'tests', 'fixtures', 'naver')
+
+
+def load_samples(sample_dir):
+    """저장된 종목 페이지를 읽습니다."""
+    pattern = 'item_*.html' if os.path.abspath(sample_dir) == SAMPLE_DIR else '*.html'
+    pages = []
+    for path in sorted(glob.glob(os.path.join(sample_dir, pattern))):
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+
+    if not pages:
+        raise SystemExit(f"샘플 페이지가 없습니다: {sample_dir}")
+    return pages
+
+
+def legacy_extract(content):
+    """기존 data_collector의 HTML 현재가 추출 방식"""
+    soup = BeautifulSoup(content, 'html.parser')
+    price_elements = soup.select('.no_today .blind')
+    if price_elements:
+        return float(price_elements[0].text.replace(',', ''))
+    return None
+
+
+def measure(func):
+    """호출 한 번의 최소 소요 시간(초). 반복 횟수는 소요 시간에 맞춰 정함"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=3)) / number
+
+
+def main():
+    sample_dir = sys.argv[1] if len(sys.argv) > 1 else SAMPLE_DIR
+    print(f"{'페이지':<24} {'크기(KB)':>9} {'기존(ms)':>10} {'신규(µs)':>10} {'배수':>8}")
+
+    for name, content in load_samples(sample_dir):
+        expected = legacy_extract(content)
+        assert extract_current_price(content) == expected, name
+
+        legacy = measure(lambda: legacy_extract(content))
+        # 대체 경로를 타는 페이지는 BeautifulSoup 파싱까지 포함하므로 배수가 1 근처로 나옴
+        fast = measure(lambda: extract_current_price(content))
+
+        print(f"{name:<24} {len(content) / 1024:>9.1f} {legacy * 1e3:>10.2f} {fast * 1e6:>10.2f} {legacy / fast:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLI 모듈 import 시간 예산 검사
+
+python -X importtime 으로 scheduler / file_manager 모듈의 누적 import 시간을 측정하고,
+무거운 패키지(pandas, numpy, requests, bs4, schedule)가 모듈 import 시점에
+읽히지 않는지 확인합니다. 예산을 넘거나 무거운 패키지가 읽히면 종료 코드 1을 반환합니다.
+
+실행 방법:
+python benchmarks/bench_import_time.py [예산(ms), 기본 50]
+"""
+
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ('scheduler', 'file_manager')
+HEAVY_PACKAGES = ('pandas', 'numpy', 'requests', 'bs4', 'schedule')
+REPEAT = 5
+
+
+def measure(module):
+    """
+    모듈을 새 인터프리터에서 import 하여 누적 import 시간과 읽힌 최상위 패키지를 반환합니다.
+
+    Returns:
+        (누적 시간(µs), 읽힌 최상위 패키지 집합)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    total = None
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = [part.strip() for part in line.split(':', 1)[1].split('|')]
+        if not parts[1].isdigit():
+            continue  # 헤더 줄
+        name = parts[2]
+        packages.add(name.split('.')[0])
+        if name == module:
+            total = int(parts[1])
+
+    return total, packages
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    failed = False
+
+    print(f"{'모듈':<14} {'import(ms)':>11} {'예산(ms)':>9}  무거운 패키지")
+    for module in MODULES:
+        samples = [measure(module) for _ in range(REPEAT)]
+        best = min(total for total, _ in samples) / 1000
+        heavy = sorted(set(HEAVY_PACKAGES) & samples[0][1])
+
+        ok = best <= budget_ms and not heavy
+        failed |= not ok
+        print(f"{module:<14} {best:>11.1f} {budget_ms:>9.1f}  {', '.join(heavy) or '-'}"
+              f"{'' if ok else '  ❌'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+장중 감시 모드 벤치마크
+
+현재가 일괄 조회 API와 같은 형식의 응답을 주는 로컬 가격 서버(요청마다 가격이 조금씩 변함)를 띄우고
+IntradayMonitor의 주기당 소요 시간과 상태 변경 이벤트 수를 측정합니다.
+- 가격이 그대로면 이벤트가 없어야 함
+- 응답이 지연 예산보다 늦으면 해당 묶음만 제외되고 주기는 예산 안에 끝나야 함
+
+실행 방법:
+python benchmarks/bench_intraday.py [종목 수] [주기 수]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_collector import NaverStockDataCollector
+from intraday import IntradayMonitor
+from market_calendar import session_date
+
+
+class FakeFeed:
+    """종목별 가격을 무작위로 움직이는 가격 서버 상태"""
+
+    def __init__(self, tickers, seed=0):
+        self.rng = np.random.default_rng(seed)
+        self.prices = dict(zip(tickers, np.round(50000 * (1 + self.rng.normal(0, 0.01, len(tickers))))))
+        self.frozen = False
+        self.delay = 0.0
+        self.slow = set()  # 응답을 늦출 첫 종목코드
+        self.lock = threading.Lock()
+
+    def quote(self, tickers):
+        with self.lock:
+            if not self.frozen:
+                for ticker in tickers:
+                    self.prices[ticker] = round(self.prices[ticker] * (1 + self.rng.normal(0, 0.01)))
+            return [{'cd': ticker, 'nv': self.prices[ticker]} for ticker in tickers if ticker in self.prices]
+
+
+def serve(feed):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlsplit(self.path).query).get('query', [''])[0]
+            tickers = query.split(':', 1)[-1].split(',')
+            if tickers[0] in feed.slow:
+                time.sleep(feed.delay)
+            data = json.dumps({'result': {'areas': [{'datas': feed.quote(tickers)}]}}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    logging.getLogger().setLevel(logging.WARNING)
+
+    stocks = [{'ticker': f"{i:06d}", 'name': f"종목{i}", 'industry': '기타'} for i in range(n_tickers)]
+    feed = FakeFeed([stock['ticker'] for stock in stocks])
+    server = serve(feed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collector = NaverStockDataCollector(per_host_limit=8, state_path=os.path.join(tmp, "rsi_state.json"))
+        collector.BULK_QUOTE_URL = f"http://127.0.0.1:{server.server_address[1]}/api/realtime?query=SERVICE_ITEM:{{tickers}}"
+
+        # 장 시작 전 상태: 가상 30일 이력으로 RSI 상태 초기화 (prime에서 네트워크 요청 없음)
+        rng = np.random.default_rng(1)
+        today = session_date()
+        for stock in stocks:
+            history = 50000 * np.cumprod(1 + rng.normal(0, 0.02, 30))
+            collector.rsi_state.seed(stock['ticker'], today, list(history))
+
+        monitor = IntradayMonitor(collector, interval=1, budget=2.0, batch_size=100,
+                                  output_path=os.path.join(tmp, "signals.jsonl"))
+        monitor.prime(stocks)
+
+        timings = []
+        counts = []
+        for _ in range(n_cycles):
+            start = time.perf_counter()
+            counts.append(len(monitor.poll_once()))
+            timings.append(time.perf_counter() - start)
+        print(f"{n_tickers:,}종목 {n_cycles}주기: 평균 {np.mean(timings) * 1000:.0f}ms, "
+              f"최대 {np.max(timings) * 1000:.0f}ms, 이벤트 {counts}")
+
+        feed.frozen = True
+        monitor.poll_once()
+        assert monitor.poll_once() == [], "가격이 그대로인데 이벤트가 발생함"
+        print("가격 변동 없음: 이벤트 0개")
+
+        # 한 묶음만 예산보다 늦게 응답
+        feed.slow = {stocks[0]['ticker']}
+        feed.delay = 1.0
+        monitor.budget = 0.3
+        start = time.perf_counter()
+        monitor.poll_once()
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.3 + 0.2, elapsed
+        print(f"지연 묶음 제외: {elapsed * 1000:.0f}ms (예산 300ms), 예산 초과 주기 {monitor.late_cycles}회")
+
+        monitor.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+결과 파일 병합 벤치마크
+
+여러 해 분량의 가상 월별 파일을 만들어 기존 방식(pandas로 전체를 읽어 concat/중복 제거/정렬)과
+csv_merge.merge_csv_files(정렬 구간 + k-way 스트리밍 병합)의 실행 시간과 최대 메모리(RSS)를 비교합니다.
+각 방식은 별도 프로세스에서 실행하여 최대 메모리를 따로 측정합니다.
+
+실행 방법:
+python benchmarks/bench_merge.py [연수]
+"""
+
+import os
+import csv
+import sys
+import time
+import random
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HEADER = ['Ticker', 'Name', 'Industry', 'Date', 'RSI7', 'RSI14', 'Yesterday_RSI7', 'Yesterday_RSI14']
+
+
+def make_history(directory, years, n_tickers=200, seed=0):
+    """years년 분량의 월별 결과 파일을 만들고 (마지막 달은 표시 파일로 한 번 더 기록) 파일 목록을 반환합니다."""
+    rng = random.Random(seed)
+    tickers = [f"{rng.randrange(1, 999999):06d}" for _ in range(n_tickers)]
+    filenames = []
+
+    for year in range(2025 - years, 2025):
+        for month in range(1, 13):
+            filename = os.path.join(directory, f"results_코스피_200_{year}_{month:02d}.csv")
+            with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(HEADER)
+                for day in range(28, 0, -1):
+                    if (day % 7) in (0, 6):
+                        continue
+                    for ticker in tickers:
+                        values = [round(rng.uniform(1, 99), 2) for _ in range(4)]
+                        writer.writerow([ticker, f"종목{ticker}", '반도체', f"{year}-{month:02d}-{day:02d}"] + values)
+            filenames.append(filename)
+
+    # 표시 파일은 마지막 달과 겹치는 행을 다른 값으로 포함 (나중 파일 우선 확인용)
+    display = os.path.join(directory, "results_코스피_200.csv")
+    with open(filenames[-1], 'r', encoding='utf-8-sig', newline='') as src, \
+            open(display, 'w', encoding='utf-8-sig', newline='') as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst, lineterminator='\n')
+        writer.writerow(next(reader))
+        for row in reader:
+            writer.writerow(row[:4] + [round(float(value) + 0.5, 2) for value in row[4:]])
+    filenames.append(display)
+    return filenames
+
+
+def legacy_merge(filenames, output_filename):
+    """기존 file_manager.merge_files의 pandas 병합 방식"""
+    import pandas as pd
+
+    merged_df = pd.concat([pd.read_csv(filename, encoding='utf-8-sig') for filename in filenames], ignore_index=True)
+    merged_df = merged_df.drop_duplicates(subset=['Ticker', 'Date'], keep='last')
+    merged_df['Date'] = pd.to_datetime(merged_df['Date'])
+    merged_df = merged_df.sort_values(['Date', 'Ticker'], ascending=[False, True])
+    merged_df['Date'] = merged_df['Date'].dt.strftime('%Y-%m-%d')
+    merged_df.to_csv(output_filename, index=False, encoding='utf-8-sig')
+    return len(merged_df)
+
+
+def stream_merge(filenames, output_filename):
+    from csv_merge import merge_csv_files
+    return merge_csv_files(filenames, output_filename, chunk_rows=50000)
+
+
+def read_output(filename):
+    """비교용으로 출력 파일을 읽습니다. (pandas가 없앤 종목코드 앞자리 0과 숫자 표기 차이는 맞춤)"""
+    with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        return [[row[0].zfill(6)] + row[1:4] + [float(value) for value in row[4:]] for row in reader]
+
+
+def run_one(method, list_file, output_filename):
+    """한 방식을 실행하고 '레코드 수 시간 최대RSS(KB)'를 출력합니다. (하위 프로세스에서 실행)"""
+    with open(list_file, 'r', encoding='utf-8') as f:
+        filenames = f.read().splitlines()
+
+    start = time.perf_counter()
+    records = (legacy_merge if method == 'legacy' else stream_merge)(filenames, output_filename)
+    elapsed = time.perf_counter() - start
+    print(records, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        run_one(*sys.argv[2:5])
+        return
+
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    with tempfile.TemporaryDirectory() as directory:
+        filenames = make_history(directory, years)
+        list_file = os.path.join(directory, 'files.txt')
+        with open(list_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(filenames))
+        total = sum(os.path.getsize(filename) for filename in filenames)
+        print(f"입력: {len(filenames)}개 파일, {total / 1024 / 1024:.1f} MB ({years}년)")
+        print(f"{'방식':<8} {'레코드':>10} {'시간(s)':>10} {'최대 RSS(MB)':>14}")
+
+        outputs = {}
+        for method in ('legacy', 'stream'):
+            output = os.path.join(directory, f"merged_{method}.csv")
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--run', method, list_file, output],
+                capture_output=True, text=True, check=True
+            )
+            records, elapsed, max_rss = result.stdout.split()
+            print(f"{method:<8} {int(records):>10,} {float(elapsed):>10.2f} {int(max_rss) / 1024:>14.1f}")
+            outputs[method] = output
+
+        # 두 방식의 결과가 같은지 확인
+        assert read_output(outputs['legacy']) == read_output(outputs['stream'])
+        print("결과 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 파이프라인 전체(end-to-end) 벤치마크
+
+네이버증권 실시간 시세(polling, 일괄 조회), 차트 API(fchart), 종목 페이지(item)와 같은 형식의 응답을 주는
+로컬 HTTP 서버를 띄우고(응답 지연과 오류 비율 설정 가능) 종목 수별로 다음 단계를 실행합니다.
+- collect: NaverStockDataCollector.collect_all_data (상태/캐시 없이 동시 수집)
+- update_cold: KOSPI200Scheduler.collect_and_update_data (스케줄러 설정 그대로, 상태/캐시가 없는 첫 실행)
+- update_warm: 같은 디렉토리에서 다시 실행 (RSI 증분 상태, 일봉 캐시, 현재가 일괄 조회 사용)
+- file_manager: KOSPI200FileManager 표시 파일 동기화와 통계
+
+각 단계는 별도 프로세스에서 실행하여 소요 시간, 처리량(종목/초), 최대 메모리(RSS)를 따로 측정하고,
+서버가 받은 요청 수와 일부러 낸 오류 수를 함께 기록합니다.
+결과는 git 커밋별로 JSONL 파일에 추가하므로 --compare로 커밋 간 결과를 비교할 수 있습니다.
+
+- 가격 이력은 종목코드로 정해지고 오류도 (엔드포인트, 종목, 요청 횟수)로 정해지므로 같은 설정이면 매번 같은 요청이 나감
+- 요청 간 딜레이(collector.delay)는 측정에서 제외 (--delay로 지정 가능)
+- 종목 목록은 당일 universe.json 캐시로 제공 (목록 페이지 수집은 bench_universe.py에서 측정)
+- 종목별 INFO 로그는 끄고 측정
+
+실행 방법:
+python benchmarks/bench_pipeline.py [--sizes 200,2000,10000] [--latency-ms 2] [--error-rate 0.02]
+python benchmarks/bench_pipeline.py --compare
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import subprocess
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESULTS_FILENAME = os.path.join(ROOT, "benchmarks", "pipeline_results.jsonl")
+PHASES = ('collect', 'update_cold', 'update_warm', 'file_manager')
+HISTORY_DAYS = 120
+
+
+class FakeNaver:
+    """네이버증권 엔드포인트 응답 생성기 (종목코드로 정해지는 가격 이력)"""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.today = datetime.now().date()
+        self.lock = threading.Lock()
+        self.attempts = {}
+        self.requests = 0
+        self.errors = 0
+
+    def closes(self, ticker):
+        rng = np.random.default_rng([self.seed, int(ticker)])
+        return np.round(20000 * np.cumprod(1 + rng.normal(0, 0.02, HISTORY_DAYS)))
+
+    def fail(self, endpoint, ticker):
+        """(엔드포인트, 종목, 요청 횟수)로 정해지는 오류 여부"""
+        with self.lock:
+            self.requests += 1
+            key = (endpoint, ticker)
+            attempt = self.attempts[key] = self.attempts.get(key, 0) + 1
+            failed = zlib.crc32(f"{self.seed}:{endpoint}:{ticker}:{attempt}".encode()) / 2 ** 32 < self.error_rate
+            if failed:
+                self.errors += 1
+        return failed
+
+    def counters(self):
+        with self.lock:
+            return self.requests, self.errors
+
+    def polling(self, ticker):
+        return json.dumps({'closePrice': str(int(self.closes(ticker)[-1]))}).encode()
+
+    def bulk(self, tickers):
+        datas = [{'cd': ticker, 'nv': int(self.closes(ticker)[-1])} for ticker in tickers]
+        return json.dumps({'result': {'areas': [{'datas': datas}]}}).encode()
+
+    def fchart(self, ticker, count):
+        closes = self.closes(ticker)[-count:]
+        items = []
+        for offset, close in enumerate(closes):
+            day = self.today - timedelta(days=len(closes) - 1 - offset)
+            items.append(f'<item data="{day:%Y%m%d}|{close:.0f}|{close * 1.01:.0f}|{close * 0.99:.0f}|{close:.0f}|1000" />')
+        return ('<?xml version="1.0" encoding="EUC-KR" ?><protocol><chartdata symbol="%s">%s</chartdata></protocol>'
+                % (ticker, ''.join(items))).encode()
+
+    def item(self, ticker):
+        return (f'<html><body><div class="rate_info"><p class="no_today"><em class="no_up">'
+                f'<span class="blind">{int(self.closes(ticker)[-1]):,}</span></em></p></div></body></html>').encode()
+
+
+def serve(feed):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # 연결 재사용 시 헤더와 본문을 따로 보내면 지연 ACK로 응답마다 40ms씩 늦어지므로 Nagle 끔
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            if url.path == '/api/realtime':
+                tickers = query['query'][0].split(':', 1)[-1].split(',')
+                endpoint, ticker = 'bulk', tickers[0]
+                render = lambda: feed.bulk(tickers)
+            elif url.path.startswith('/api/realtime/domestic/stock/'):
+                endpoint, ticker = 'polling', url.path.rsplit('/', 1)[-1]
+                render = lambda: feed.polling(ticker)
+            elif url.path == '/sise.nhn':
+                endpoint, ticker = 'fchart', query['symbol'][0]
+                count = int(query['count'][0])
+                render = lambda: feed.fchart(ticker, count)
+            else:
+                endpoint, ticker = 'item', query['code'][0]
+                render = lambda: feed.item(ticker)
+
+            if feed.latency:
+                time.sleep(feed.latency)
+            if feed.fail(endpoint, ticker):
+                status, data = 500, b'error'
+            else:
+                status, data = 200, render()
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_universe(directory, n_tickers):
+    """당일 종목 목록 캐시를 만듭니다. (목록 페이지 요청 없이 n_tickers개 종목 사용)"""
+    stocks = [{'ticker': f"{i:06d}", 'name': f"종목{i}", 'industry': f"업종{i % 40}"}
+              for i in range(1, n_tickers + 1)]
+    with open(os.path.join(directory, "universe.json"), 'w', encoding='utf-8') as f:
+        json.dump({'KOSPI200': {'date': datetime.now().strftime('%Y-%m-%d'), 'stocks': stocks}}, f,
+                  ensure_ascii=False)
+
+
+def run_phase(phase, base_url, workers, delay):
+    """
+    한 단계를 실행하고 결과를 JSON 한 줄로 출력합니다. (하위 프로세스에서 작업 디렉토리 안에서 실행)
+    """
+    import logging
+    from data_collector import NaverStockDataCollector
+
+    NaverStockDataCollector.POLLING_URL = base_url + "/api/realtime/domestic/stock/{ticker}"
+    NaverStockDataCollector.BULK_QUOTE_URL = base_url + "/api/realtime?query=SERVICE_ITEM:{tickers}"
+    NaverStockDataCollector.FCHART_URL = base_url + "/sise.nhn?symbol={ticker}&timeframe=day&count={days}&requestType=0"
+    NaverStockDataCollector.ITEM_URL = base_url + "/item/main.naver?code={ticker}"
+
+    if phase == 'file_manager':
+        from file_manager import KOSPI200FileManager
+        logging.getLogger().setLevel(logging.WARNING)
+        start = time.perf_counter()
+        manager = KOSPI200FileManager()
+        manager.sync_display_file()
+        stats = manager.get_statistics()
+        elapsed = time.perf_counter() - start
+        tickers, collected, matched = None, stats['total_records'], None
+    else:
+        if phase == 'collect':
+            collector = NaverStockDataCollector(max_workers=workers, per_host_limit=workers,
+                                                universe_path="universe.json", metrics_dir="metrics")
+        else:
+            from scheduler import KOSPI200Scheduler
+            scheduler = KOSPI200Scheduler()
+            collector = scheduler.collector
+        collector.delay = delay
+        logging.getLogger().setLevel(logging.WARNING)
+        tickers = len(collector.get_kospi200_list())
+
+        start = time.perf_counter()
+        if phase == 'collect':
+            collector.collect_all_data()
+        else:
+            scheduler.collect_and_update_data()
+            # 월별 파일 백그라운드 압축까지 포함
+            for thread in threading.enumerate():
+                if thread.name.startswith('compact-'):
+                    thread.join()
+        elapsed = time.perf_counter() - start
+        counters = collector.metrics.summary()['counters'].get('tickers_total', [])
+        outcomes = {entry['labels']['outcome']: entry['value'] for entry in counters}
+        collected = outcomes.get('collected', 0) + outcomes.get('resumed', 0)
+        matched = outcomes.get('matched')
+
+    print(json.dumps({
+        'phase': phase,
+        'tickers': tickers,
+        'collected': collected,
+        'matched': matched,
+        'wall': round(elapsed, 4),
+        'throughput': round(tickers / elapsed, 1) if tickers and elapsed else None,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }, ensure_ascii=False))
+
+
+def git_revision():
+    """(커밋, 작업 트리 변경 여부)를 반환합니다. git 저장소가 아니면 (None, None)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(status)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def benchmark(args):
+    feed = FakeNaver(latency=args.latency_ms / 1000, error_rate=args.error_rate, seed=args.seed)
+    server = serve(feed)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    commit, dirty = git_revision()
+    config = {
+        'latency_ms': args.latency_ms,
+        'error_rate': args.error_rate,
+        'workers': args.workers,
+        'delay': args.delay,
+        'seed': args.seed,
+    }
+    print(f"커밋 {commit}{' (변경 있음)' if dirty else ''}, 설정 {config}")
+    print(f"{'종목 수':>8} {'단계':<13} {'시간(s)':>9} {'종목/초':>9} {'최대 RSS(MB)':>13} {'요청':>8} {'오류':>6} {'수집':>7}")
+
+    rows = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            # collect 단계는 스케줄러 단계와 상태/캐시를 공유하지 않도록 디렉토리를 나눔
+            for name in ('collect', 'update'):
+                os.makedirs(os.path.join(directory, name))
+                write_universe(os.path.join(directory, name), size)
+
+            for phase in args.phases:
+                workdir = os.path.join(directory, 'collect' if phase == 'collect' else 'update')
+                requests_before, errors_before = feed.counters()
+                result = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--run', phase, base_url,
+                     str(args.workers), str(args.delay)],
+                    cwd=workdir, capture_output=True, text=True
+                )
+                if result.returncode != 0:
+                    print(result.stderr, file=sys.stderr)
+                    raise SystemExit(f"{size}개 종목 {phase} 단계 실패")
+                row = json.loads(result.stdout.strip().splitlines()[-1])
+                if row['tickers'] not in (None, size):
+                    raise SystemExit(f"종목 목록 캐시를 읽지 못했습니다: {row['tickers']}/{size}개 종목")
+                requests_after, errors_after = feed.counters()
+                row.update(size=size, requests=requests_after - requests_before, errors=errors_after - errors_before)
+                rows.append(row)
+                print(f"{size:>8,} {phase:<13} {row['wall']:>9.2f} {row['throughput'] or 0:>9.0f} "
+                      f"{row['peak_rss_mb']:>13.1f} {row['requests']:>8,} {row['errors']:>6,} "
+                      f"{'' if row['collected'] is None else row['collected']:>7}")
+
+    server.shutdown()
+
+    record = {
+        'commit': commit,
+        'dirty': dirty,
+        'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'results': rows,
+    }
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"결과 추가: {args.output}")
+
+
+def compare(path, limit=5):
+    """같은 설정으로 측정한 최근 커밋들의 단계별 소요 시간과 최대 RSS를 나란히 출력합니다."""
+    if not os.path.exists(path):
+        print(f"결과 파일이 없습니다: {path}")
+        return
+
+    by_config = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            label = f"{record['commit']}{'+' if record.get('dirty') else ''}"
+            runs = by_config.setdefault(json.dumps(record['config'], sort_keys=True), {})
+            # 같은 커밋을 여러 번 측정하면 종목 수/단계별로 마지막 측정을 사용 (순서도 마지막 측정 기준)
+            rows = runs.pop(label, {})
+            rows.update({(row['size'], row['phase']): row for row in record['results']})
+            runs[label] = rows
+
+    for config, runs in by_config.items():
+        labels = list(runs)[-limit:]
+        keys = sorted({key for label in labels for key in runs[label]}, key=lambda key: (key[0], PHASES.index(key[1])))
+        print(f"\n설정 {config}")
+        print(f"{'종목 수':>8} {'단계':<13}" + ''.join(f" {label:>20}" for label in labels))
+        for key in keys:
+            cells = []
+            for label in labels:
+                row = runs[label].get(key)
+                cells.append(f" {row['wall']:>9.2f}s {row['peak_rss_mb']:>7.0f}MB" if row else f" {'-':>20}")
+            print(f"{key[0]:>8,} {key[1]:<13}" + ''.join(cells))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        run_phase(sys.argv[2], sys.argv[3], int(sys.argv[4]), float(sys.argv[5]))
+        return
+
+    parser = argparse.ArgumentParser(description='수집 파이프라인 end-to-end 벤치마크')
+    parser.add_argument('--sizes', default='200,2000,10000', help='종목 수 목록 (쉼표 구분)')
+    parser.add_argument('--phases', default=','.join(PHASES), help=f"실행할 단계 (쉼표 구분, 가능: {', '.join(PHASES)})")
+    parser.add_argument('--latency-ms', type=float, default=2.0, help='응답 지연 (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.02, help='HTTP 500 응답 비율 (0~1)')
+    parser.add_argument('--workers', type=int, default=8, help='collect 단계 동시 수집 작업자 수')
+    parser.add_argument('--delay', type=float, default=0.0, help='요청 간 딜레이 (초, 실제 설정은 1)')
+    parser.add_argument('--seed', type=int, default=0, help='가격/오류 생성 시드')
+    parser.add_argument('--output', default=RESULTS_FILENAME, help='결과를 추가할 JSONL 파일 (빈 문자열이면 기록 안 함)')
+    parser.add_argument('--compare', action='store_true', help='저장된 결과를 커밋별로 비교')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.output or RESULTS_FILENAME)
+        return
+
+    args.sizes = [int(size) for size in args.sizes.split(',') if size]
+    args.phases = [phase for phase in args.phases.split(',') if phase]
+    unknown = [phase for phase in args.phases if phase not in PHASES]
+    if unknown:
+        parser.error(f"지원하지 않는 단계입니다: {', '.join(unknown)}")
+    benchmark(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목 목록(유니버스) 로더 벤치마크
+
+네이버증권 목록/업종/종목 페이지와 같은 형식(EUC-KR)의 페이지를 로컬 HTTP 서버로 제공하고
+(응답마다 지연 추가) 다음 경우의 소요 시간과 요청 수를 비교합니다.
+- 처음 수집 (목록 페이지 + 업종 페이지 전체)
+- 같은 날 다시 로드 (캐시, 요청 없음)
+- 다음 날 갱신 (목록 페이지 + 새로 편입된 종목 페이지만)
+
+실행 방법:
+python benchmarks/bench_universe.py [종목 수] [응답 지연(ms)]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universe import UniverseLoader
+
+PAGE_SIZE = 50
+N_INDUSTRIES = 40
+
+
+class FakeNaver:
+    """네이버증권 목록 페이지 형식을 흉내 내는 페이지 생성기"""
+
+    def __init__(self, n_tickers):
+        self.tickers = [f"{i * 7 + 100:06d}" for i in range(n_tickers)]
+        self.requests = 0
+
+    def industry(self, ticker):
+        return f"업종{int(ticker) % N_INDUSTRIES:02d}"
+
+    def item_row(self, ticker):
+        return (f'<tr><td class="no">1</td><td><a href="/item/main.naver?code={ticker}" class="tltle">'
+                f'종목{ticker}</a></td><td class="number">10,000</td></tr>\n')
+
+    def listing(self, page):
+        last = max(1, (len(self.tickers) + PAGE_SIZE - 1) // PAGE_SIZE)
+        rows = ''.join(self.item_row(t) for t in self.tickers[(page - 1) * PAGE_SIZE:page * PAGE_SIZE])
+        return (f'<table class="type_2">{rows}</table><table class="Nnavi"><tr>'
+                f'<td class="pgRR"><a href="/sise/sise_market_sum.naver?sosok=0&amp;page={last}">맨뒤</a></td>'
+                f'</tr></table>')
+
+    def page(self, path):
+        self.requests += 1
+        parts = urlsplit(path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if parts.path in ('/sise/entryJongmok.naver', '/sise/sise_market_sum.naver'):
+            return self.listing(int(query.get('page', 1)))
+        if parts.path == '/sise/sise_group.naver':
+            return ''.join(f'<td><a href="/sise/sise_group_detail.naver?type=upjong&no={no}">업종{no:02d}</a></td>'
+                           for no in range(N_INDUSTRIES))
+        if parts.path == '/sise/sise_group_detail.naver':
+            no = int(query['no'])
+            return ''.join(self.item_row(t) for t in self.tickers if int(t) % N_INDUSTRIES == no)
+        if parts.path == '/item/main.naver':
+            ticker = query['code']
+            return (f'<div class="trade_compare"><a href="/sise/sise_group_detail.naver?type=upjong&no=1">'
+                    f'{self.industry(ticker)}</a></div>')
+        return None
+
+
+def serve(site, delay):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = site.page(self.path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = body.encode('cp949')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=euc-kr')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timed(site, label, func):
+    before = site.requests
+    start = time.perf_counter()
+    stocks = func()
+    print(f"{label:<22} {time.perf_counter() - start:>7.2f}s  요청 {site.requests - before:>4}회  종목 {len(stocks):,}개")
+    return stocks
+
+
+def main():
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    delay = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+
+    site = FakeNaver(n_tickers)
+    server = serve(site, delay)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "universe.json")
+
+        for workers in (1, 8):
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            loader = UniverseLoader(cache_path, max_workers=workers, base_url=base_url)
+            stocks = timed(site, f"처음 수집 (동시 {workers})", lambda: loader.load('KOSPI'))
+        assert all(stock['industry'] == site.industry(stock['ticker']) for stock in stocks)
+
+        timed(site, "같은 날 다시 로드", lambda: UniverseLoader(cache_path, base_url=base_url).load('KOSPI'))
+
+        # 다음 날: 종목 5개 편입, 5개 제외
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        cache['KOSPI']['date'] = '2000-01-01'
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        site.tickers = site.tickers[5:] + [f"{900000 + i:06d}" for i in range(5)]
+
+        loader = UniverseLoader(cache_path, max_workers=8, base_url=base_url)
+        stocks = timed(site, "다음 날 갱신 (동시 8)", lambda: loader.load('KOSPI'))
+        changes = loader.changes('KOSPI')
+        assert len(changes['added']) == 5 and len(changes['removed']) == 5
+        assert all(stock['industry'] == site.industry(stock['ticker']) for stock in stocks)
+        print(f"편입 {changes['added']}, 제외 {changes['removed']}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
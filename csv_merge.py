@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+메모리 사용량이 제한된 결과 CSV 스트리밍 병합
+
+- 입력 파일을 차례로 읽어 chunk_rows개 또는 chunk_bytes만큼씩 (날짜 내림차순, 종목코드 오름차순)으로 정렬한 정렬 구간(run)을 만들고
+  구간이 여러 개면 임시 파일로 내보낸 뒤 heapq.merge로 k-way 병합
+- (Ticker, Date)가 같은 행은 나중에 읽은 행이 남음 (입력 파일 순서, 같은 파일에서는 아래쪽 행 우선)
+- 출력은 병합하면서 바로 임시 파일에 쓰고 마지막에 교체
+- 정렬 버퍼는 행 수(chunk_rows)와 행 내용 크기(chunk_bytes) 중 먼저 닿는 쪽에서 비우므로
+  열이 많거나 값이 긴 행이 섞여도 입력 전체 크기와 무관하게 사용량이 제한됨
+"""
+
+import os
+import csv
+import heapq
+import shutil
+import tempfile
+import logging
+from datetime import datetime
+from itertools import groupby
+
+
+def _read_header(filename):
+    with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), None) or []
+
+
+def _sort_key(ticker, date):
+    """(날짜 내림차순, 종목코드 오름차순) 정렬 키. 날짜 형식이 맞지 않으면 None"""
+    date = date.strip()
+    if (len(date) == 10 and date[4] == '-' and date[7] == '-' and date[:4].isdigit()
+            and date[5:7].isdigit() and date[8:].isdigit()
+            and 1 <= int(date[5:7]) <= 12 and 1 <= int(date[8:]) <= 31):
+        # 대부분인 YYYY-MM-DD 형식은 strptime 없이 바로 변환
+        day = int(date[:4] + date[5:7] + date[8:])
+    else:
+        try:
+            parsed = datetime.strptime(date, '%Y-%m-%d')
+        except ValueError:
+            return None
+        day = parsed.year * 10000 + parsed.month * 100 + parsed.day
+    return -day, ticker
+
+
+def _read_rows(filenames, columns, start_seq=0):
+    """
+    입력 파일의 행을 (정렬 키, 순번, 값 리스트)로 차례로 반환합니다.
+    값은 병합 결과의 열 순서에 맞추고, 숫자로만 된 종목코드는 6자리로 맞춥니다.
+    """
+    seq = start_seq
+    for filename in filenames:
+        with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            index = [header.index(column) if column in header else None for column in columns]
+            ticker_pos = columns.index('Ticker')
+            date_pos = columns.index('Date')
+
+            skipped = 0
+            for row in reader:
+                if not row:
+                    continue
+                values = [row[i] if i is not None and i < len(row) else '' for i in index]
+                ticker = values[ticker_pos].strip()
+                if ticker.isdigit():
+                    ticker = ticker.zfill(6)
+                values[ticker_pos] = ticker
+
+                key = _sort_key(ticker, values[date_pos])
+                if key is None:
+                    skipped += 1
+                    continue
+                values[date_pos] = f"{-key[0] // 10000:04d}-{-key[0] // 100 % 100:02d}-{-key[0] % 100:02d}"
+
+                seq += 1
+                yield key, seq, values
+
+            if skipped:
+                logging.warning(f"날짜 형식이 맞지 않는 행 {skipped}개 제외: {filename}")
+
+
+def _dedupe_sorted(entries):
+    """정렬된 (키, 순번, 값)에서 같은 키는 순번이 가장 큰 (나중에 읽은) 항목만 남깁니다."""
+    for _, group in groupby(entries, key=lambda entry: entry[0]):
+        last = None
+        for last in group:
+            pass
+        yield last
+
+
+def _write_run(directory, entries):
+    """정렬 구간을 임시 CSV로 내보냅니다. 앞 세 열은 정렬 키와 순번"""
+    fd, path = tempfile.mkstemp(suffix='.csv', prefix='run_', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        for (day, ticker), seq, values in entries:
+            writer.writerow([day, ticker, seq] + values)
+    return path
+
+
+def _read_run(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            yield (int(row[0]), row[1]), int(row[2]), row[3:]
+
+
+def _row_size(values):
+    """행 값의 CSV 텍스트 크기 (바이트, 구분자 포함) 추정치"""
+    return sum(len(value.encode('utf-8')) + 1 for value in values)
+
+
+def merge_csv_files(filenames, output_filename, chunk_rows=50000, chunk_bytes=32 << 20):
+    """
+    결과 CSV 파일들을 병합합니다.
+
+    Args:
+        filenames: 입력 파일 목록 (뒤쪽 파일이 우선)
+        output_filename: 출력 파일
+        chunk_rows: 정렬 구간 하나에 담을 최대 행 수
+        chunk_bytes: 정렬 구간 하나에 담을 행 내용의 최대 크기 (바이트, 값의 UTF-8 길이 합).
+            파이썬 객체 부가 비용은 포함하지 않으므로 실제 메모리는 이보다 몇 배 큼
+
+    Returns:
+        기록한 레코드 수
+    """
+    chunk_rows = max(1, int(chunk_rows))
+    chunk_bytes = max(1, int(chunk_bytes))
+
+    # 열 순서: 입력 파일에 처음 나온 순서 (없는 열은 빈 값)
+    columns = []
+    for filename in filenames:
+        columns.extend(column for column in _read_header(filename) if column not in columns)
+    for column in ('Ticker', 'Date'):
+        if column not in columns:
+            raise ValueError(f"병합할 파일에 {column} 열이 없습니다")
+
+    work_dir = tempfile.mkdtemp(prefix='merge_', dir=os.path.dirname(os.path.abspath(output_filename)))
+    try:
+        runs = []
+        buffer = []
+        buffered_bytes = 0
+        # 순번이 모두 다르므로 (키, 순번, 값) 튜플은 값까지 비교하지 않고 바로 정렬됨
+        for entry in _read_rows(filenames, columns):
+            buffer.append(entry)
+            buffered_bytes += _row_size(entry[2])
+            if len(buffer) >= chunk_rows or buffered_bytes >= chunk_bytes:
+                buffer.sort()
+                runs.append(_write_run(work_dir, _dedupe_sorted(buffer)))
+                buffer = []
+                buffered_bytes = 0
+
+        buffer.sort()
+        if runs:
+            if buffer:
+                runs.append(_write_run(work_dir, _dedupe_sorted(buffer)))
+            buffer = []
+            merged = heapq.merge(*(_read_run(path) for path in runs))
+        else:
+            merged = iter(buffer)
+
+        records = 0
+        tmp_path = os.path.join(work_dir, 'output.csv')
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(columns)
+            for _, _, values in _dedupe_sorted(merged):
+                writer.writerow(values)
+                records += 1
+
+        os.replace(tmp_path, output_filename)
+        if len(runs) > 1:
+            logging.info(f"병합 정렬 구간 {len(runs)}개 사용 (구간당 최대 {chunk_rows:,}행, {chunk_bytes:,}bytes)")
+        return records
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+웹페이지용 압축 JSON(열 단위) 데이터 생성
+
+CSV는 브라우저에서 줄 단위로 나누고 숫자로 바꾼 뒤 헤더를 누를 때마다 전체를 다시 정렬해야 하므로,
+표시 파일과 함께 다음 형태의 JSON을 게시합니다.
+
+    {
+        "version": 1,
+        "count": 행 수,
+        "stocks": [[종목코드, 종목명, 산업군], ...],   # 중복 제거한 종목 사전
+        "dates": ["2025-07-21", ...],                   # 중복 제거한 날짜 사전
+        "columns": {
+            "stock": [종목 사전 인덱스, ...],
+            "date": [날짜 사전 인덱스, ...],
+            "RSI7": [숫자 또는 null, ...], ...
+        },
+        "order": {"RSI7": [오름차순 행 인덱스, ...], ...}  # 내림차순은 뒤집어서 사용
+    }
+"""
+
+import json
+
+PAYLOAD_VERSION = 1
+
+NUMERIC_COLUMNS = ['RSI7', 'RSI14', 'Yesterday_RSI7', 'Yesterday_RSI14', 'RSI7_Change', 'RSI14_Change']
+# 종목 사전 항목 [종목코드, 종목명, 산업군]에서의 위치
+STOCK_FIELDS = {'Ticker': 0, 'Name': 1, 'Industry': 2}
+
+# 웹페이지 표의 열 순서 (script.js의 정렬 열 순서와 같음)
+SORT_COLUMNS = ['Name', 'Ticker', 'Industry', 'RSI7', 'RSI14', 'Yesterday_RSI7', 'Yesterday_RSI14',
+                'RSI7_Change', 'RSI14_Change']
+
+
+def _to_number(value):
+    """CSV 값을 숫자로 변환합니다. 비어 있거나 숫자가 아니면 None"""
+    if value is None or value == '':
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number != number else number
+
+
+def _change(today, yesterday):
+    """RSI 변화량 (둘 중 하나라도 없으면 0, 웹페이지 계산 방식과 동일)"""
+    if not today or not yesterday:
+        return 0.0
+    return round(today - yesterday, 2)
+
+
+def build_payload(records):
+    """
+    결과 레코드로 웹페이지용 열 단위 데이터를 만듭니다.
+
+    Args:
+        records: 결과 딕셔너리 리스트 (CSV 행 또는 수집 결과)
+
+    Returns:
+        JSON으로 직렬화할 딕셔너리
+    """
+    stocks = []
+    stock_index = {}
+    dates = []
+    date_index = {}
+    columns = {'stock': [], 'date': []}
+    columns.update((column, []) for column in NUMERIC_COLUMNS)
+
+    for record in records:
+        ticker = str(record.get('Ticker') or '')
+        if ticker.isdigit():
+            ticker = ticker.zfill(6)
+        stock = (ticker, record.get('Name') or '', record.get('Industry') or '정보 없음')
+        if stock not in stock_index:
+            stock_index[stock] = len(stocks)
+            stocks.append(list(stock))
+        columns['stock'].append(stock_index[stock])
+
+        date = str(record.get('Date') or '')
+        if date not in date_index:
+            date_index[date] = len(dates)
+            dates.append(date)
+        columns['date'].append(date_index[date])
+
+        values = {column: _to_number(record.get(column)) for column in NUMERIC_COLUMNS[:4]}
+        values['RSI7_Change'] = _change(values['RSI7'], values['Yesterday_RSI7'])
+        values['RSI14_Change'] = _change(values['RSI14'], values['Yesterday_RSI14'])
+        for column in NUMERIC_COLUMNS:
+            columns[column].append(values[column])
+
+    count = len(columns['stock'])
+    order = {}
+    for column in SORT_COLUMNS:
+        if column in STOCK_FIELDS:
+            position = STOCK_FIELDS[column]
+            field = [stocks[i][position].lower() for i in columns['stock']]
+        else:
+            # 값이 없으면 0으로 정렬 (웹페이지 정렬 방식과 동일)
+            field = [value or 0.0 for value in columns[column]]
+        order[column] = sorted(range(count), key=field.__getitem__)
+
+    return {
+        'version': PAYLOAD_VERSION,
+        'count': count,
+        'stocks': stocks,
+        'dates': dates,
+        'columns': columns,
+        'order': order,
+    }
+
+
+def render_payload(records):
+    """웹페이지용 열 단위 데이터를 공백 없는 JSON 바이트로 만듭니다."""
+    return json.dumps(build_payload(records), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def payload_filename(csv_filename):
+    """CSV 표시 파일에 대응하는 JSON 파일 경로 (results_코스피_200.csv -> results_코스피_200.json)"""
+    base = csv_filename[:-4] if csv_filename.endswith('.csv') else csv_filename
+    return f"{base}.json"
@@ -13,35 +13,135 @@ pip install requests beautifulsoup4 pandas numpy
 """
 
 import requests
-import pandas as pd
 import numpy as np
 import time
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
 import logging
+from rsi_engine import calculate_rsi_batch
+from rsi_state import RSIStateStore
+from market_calendar import session_date, previous_trading_day
+from price_cache import PriceCache, DEFAULT_MAX_BARS
+from universe import UniverseLoader
+from run_journal import RunJournal
+from metrics import Metrics, NULL_METRICS
+from indicators import IndicatorPipeline, INDICATOR_COLUMNS, required_history
+from price_parser import parse_fchart_sise, extract_current_price
+from endpoint_router import EndpointRouter
+from publisher import publish_file
+from dashboard_payload import render_payload, payload_filename
+from file_manifest import record_write
+from screen_rules import Screen
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class NaverStockDataCollector:
-    def __init__(self):
+    # 네이버증권 엔드포인트 (로컬 스텁 서버로 교체 가능)
+    POLLING_URL = "https://polling.finance.naver.com/api/realtime/domestic/stock/{ticker}"
+    FCHART_URL = "https://fchart.stock.naver.com/sise.nhn?symbol={ticker}&timeframe=day&count={days}&requestType=0"
+    ITEM_URL = "https://finance.naver.com/item/main.naver?code={ticker}"
+    BULK_QUOTE_URL = "https://polling.finance.naver.com/api/realtime?query=SERVICE_ITEM:{tickers}"
+
+    def __init__(self, max_workers=1, per_host_limit=4, state_path=None, cache_dir=None,
+                 router_path=None, bulk_batch_size=0, rules_path=None, indicators=None,
+                 universe_path=None, market='KOSPI200', journal_dir=None, journal_dedupe='date',
+                 metrics_dir=None, cache_max_bars=DEFAULT_MAX_BARS):
+        """
+        Args:
+            max_workers: 동시에 처리할 종목 수 (1이면 기존 순차 수집)
+            per_host_limit: 호스트별 동시 요청 상한
+            state_path: RSI 증분 계산 상태 파일 경로 (None이면 매번 전체 재계산)
+            cache_dir: 일봉 캐시 디렉토리 (None이면 캐시 사용 안 함)
+            router_path: 엔드포인트별 성공률/응답 시간 통계 파일 경로 (None이면 메모리에만 보관)
+            bulk_batch_size: 현재가 일괄 조회 시 요청당 종목 수 (0이면 종목별 개별 조회)
+            rules_path: 선별 규칙 설정 파일 경로 (None이거나 파일이 없으면 기본 규칙)
+            indicators: 결과에 추가할 보조지표 목록 (예: ['macd', 'bollinger', 'stochastic'], None이면 RSI만)
+            universe_path: 종목 목록 캐시 파일 경로 (None이면 캐시 없이 매번 수집)
+            market: 수집 대상 시장 ('KOSPI200', 'KOSPI', 'KOSDAQ')
+            journal_dir: 수집 저널 디렉토리 (None이면 저널 없이 수집, 중단되면 처음부터 다시 수집)
+            journal_dedupe: 'date'면 같은 날짜의 중단된 수집을 이어서, 'none'이면 항상 처음부터 수집
+            metrics_dir: 단계별 소요 시간/횟수를 내보낼 디렉토리 (None이면 계측하지 않음)
+            cache_max_bars: 일봉 캐시에 종목별로 보관할 최대 일봉 수 (None이면 제한 없음)
+        """
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         self.delay = 1  # 요청 간 딜레이 (초)
+        self.max_workers = max(1, int(max_workers))
+        self.per_host_limit = max(1, int(per_host_limit))
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+        
+        # 상태 파일을 사용하면 Wilder 평활 RSI를 매일 증분 갱신
+        self.rsi_state = RSIStateStore(state_path) if state_path else None
+        self.price_cache = PriceCache(cache_dir, max_bars=cache_max_bars) if cache_dir else None
+        self.router = EndpointRouter(router_path)
+        self.bulk_batch_size = max(0, int(bulk_batch_size))
+        self._quotes = {}  # 일괄 조회로 미리 받아둔 현재가 {종목코드: 현재가}
+        self.screen = Screen.load(rules_path)
+        
+        # 보조지표는 종목별로 가격 이력만 모아 두었다가 수집이 끝난 뒤 전 종목을 한 번에 계산
+        self.indicators = [name for name in (indicators or []) if name != 'rsi']
+        unknown = [name for name in self.indicators if name not in INDICATOR_COLUMNS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 지표입니다: {', '.join(unknown)}")
+        self.history_days = max(30, required_history(self.indicators) + 1)
+        self._histories = {}  # {종목코드: (종가, 고가, 저가)}
+        
+        self.market = market
+        self.universe = UniverseLoader(universe_path, get=self._get, max_workers=self.per_host_limit)
+        
+        self.journal_dir = journal_dir
+        self.journal_dedupe = journal_dedupe
+        self._journal = None
+        
+        # 계측을 끄면 모든 기록 호출이 아무 일도 하지 않는 객체를 사용
+        self.metrics_dir = metrics_dir
+        self.metrics = Metrics() if metrics_dir else NULL_METRICS
+        
+        if self.max_workers > 1:
+            # 동시 수집 시 커넥션 풀이 작업자 수보다 작으면 연결이 버려지므로 크기를 맞춤
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+    
+    def _get_host_semaphore(self, url):
+        """URL 호스트별 동시 요청 제한용 세마포어를 반환합니다."""
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+        return semaphore
+    
+    def _get(self, url, **kwargs):
+        """호스트별 동시 요청 상한을 지키며 GET 요청을 보냅니다."""
+        with self._get_host_semaphore(url):
+            return self.session.get(url, **kwargs)
         
     def get_kospi200_list(self):
         """
-        테스트를 위해 삼성전자 1개 종목만 반환
+        수집 대상 종목 목록을 반환합니다. (기본 코스피200 구성 종목)
+        
+        목록은 하루 한 번만 네이버증권에서 새로 받고 그 외에는 캐시를 사용합니다.
+        목록을 받을 수 없고 캐시도 없으면 삼성전자 1개 종목만 반환합니다.
         """
-        # 테스트용 - 삼성전자만
-        kospi200_list = [
-            {'ticker': '005930', 'name': '삼성전자', 'industry': '반도체'},
-        ]
+        kospi200_list = self.universe.load(self.market)
+        
+        if not kospi200_list:
+            kospi200_list = [
+                {'ticker': '005930', 'name': '삼성전자', 'industry': '반도체'},
+            ]
+            logging.warning(f"{self.market} 종목 목록이 없어 기본 종목 {len(kospi200_list)}개로 수집")
+            return kospi200_list
         
-        logging.info(f"테스트용 종목 {len(kospi200_list)}개 로드 완료")
+        logging.info(f"{self.market} 종목 {len(kospi200_list)}개 로드 완료")
         return kospi200_list
     
     def calculate_rsi(self, prices, period=14):
@@ -57,31 +157,234 @@ class NaverStockDataCollector:
         """
         if len(prices) < period + 1:
             return None
+        
+        # 최근 period개 가격 변화량 기준으로 계산
+        rsi = calculate_rsi_batch(prices, periods=(period,), last_n=1)[period][0, -1]
+        if np.isnan(rsi):
+            return None
+        
+        return float(rsi)
+    
+    def _request_headers(self, ticker):
+        """네이버증권 요청 공통 헤더를 반환합니다."""
+        return {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Referer': self.ITEM_URL.format(ticker=ticker),
+            'Accept': 'application/json, text/plain, */*'
+        }
+    
+    def _fetch_polling_price(self, ticker, headers):
+        """실시간 시세 API에서 현재가를 가져옵니다. 실패 시 None"""
+        url = self.POLLING_URL.format(ticker=ticker)
+        response = self._get(url, headers=headers, timeout=10)
+        
+        if response.status_code == 200:
+            try:
+                with self.metrics.timer('parse_seconds', kind='polling'):
+                    data = response.json()
+                current_price = float(data.get('closePrice', 0))
+                if current_price > 0:
+                    logging.info(f"종목 {ticker}: 현재가 {current_price} 수집 성공")
+                    return current_price
+            except (ValueError, KeyError, TypeError):
+                pass
+        return None
+    
+    def _fetch_bulk_quote_batch(self, tickers):
+        """한 번의 요청으로 여러 종목의 현재가를 가져옵니다. 실패 시 빈 딕셔너리"""
+        url = self.BULK_QUOTE_URL.format(tickers=','.join(tickers))
+        headers = {
+            'User-Agent': self.session.headers['User-Agent'],
+            'Referer': 'https://finance.naver.com/',
+            'Accept': 'application/json, text/plain, */*'
+        }
+        
+        try:
+            with self.metrics.timer('endpoint_seconds', endpoint='bulk'):
+                response = self._get(url, headers=headers, timeout=10)
+            if response.status_code != 200:
+                self.metrics.count('endpoint_failures_total', endpoint='bulk')
+                logging.warning(f"현재가 일괄 조회 실패: HTTP {response.status_code} ({len(tickers)}개 종목)")
+                return {}
             
-        # 가격 변화 계산
-        deltas = np.diff(prices)
+            quotes = {}
+            for area in response.json().get('result', {}).get('areas', []):
+                for item in area.get('datas', []):
+                    try:
+                        current_price = float(item.get('nv', 0))
+                        if current_price > 0:
+                            quotes[str(item['cd'])] = current_price
+                    except (ValueError, KeyError, TypeError):
+                        continue
+            return quotes
+            
+        except (requests.RequestException, ValueError, AttributeError) as e:
+            self.metrics.count('endpoint_failures_total', endpoint='bulk')
+            logging.warning(f"현재가 일괄 조회 오류 ({len(tickers)}개 종목): {e}")
+            return {}
+    
+    def get_bulk_quotes(self, tickers, batch_size=None):
+        """
+        여러 종목의 현재가를 batch_size개씩 묶어 조회합니다.
+        
+        Args:
+            tickers: 종목 코드 리스트
+            batch_size: 요청당 종목 수 (None이면 생성자 설정, 설정이 0이면 100)
+        
+        Returns:
+            {종목코드: 현재가} 딕셔너리 (조회되지 않은 종목은 빠짐)
+        """
+        batch_size = batch_size or self.bulk_batch_size or 100
+        batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+        quotes = {}
+        
+        if self.max_workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                for batch_quotes in executor.map(self._fetch_bulk_quote_batch, batches):
+                    quotes.update(batch_quotes)
+        else:
+            for batch in batches:
+                quotes.update(self._fetch_bulk_quote_batch(batch))
+        
+        logging.info(f"현재가 일괄 조회: {len(quotes)}/{len(tickers)}개 종목 ({len(batches)}회 요청)")
+        return quotes
+    
+    def _fetch_fchart_prices(self, ticker, days, headers):
+        """
+        차트 API에서 일별 종가 리스트를 가져옵니다. 실패 시 None
+        
+        일봉 캐시를 사용하면 마지막 캐시 날짜 이후의 일수만 요청하고 캐시와 합칩니다.
+        """
+        count = days
+        if self.price_cache is not None:
+            count = self.price_cache.request_count(ticker, days)
         
-        # 상승폭과 하락폭 분리
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
+        url = self.FCHART_URL.format(ticker=ticker, days=count)
+        response = self._get(url, headers=headers, timeout=10)
         
-        # 평균 상승폭과 평균 하락폭 계산
-        avg_gain = np.mean(gains[:period])
-        avg_loss = np.mean(losses[:period])
+        if response.status_code == 200:
+            with self.metrics.timer('parse_seconds', kind='fchart'):
+                bars = parse_fchart_sise(response.content)
+            
+            if self.price_cache is not None and len(bars) > 0:
+                bars = self.price_cache.merge(ticker, bars)
+            
+            prices = bars['close'][-days:].tolist()
+            if len(prices) >= 15:
+                logging.info(f"종목 {ticker}: 차트API에서 {len(prices)}일 데이터 수집 성공 (요청 {count}일)")
+                return prices
+        return None
+
+    def backfill_cache(self, tickers, days):
+        """
+        백테스트용으로 종목별 일봉을 차트 API에서 days일치 받아 일봉 캐시에 채웁니다.
+
+        이미 days일 이상 캐시된 종목은 마지막 캐시 날짜 이후만 요청합니다.
+
+        Returns:
+            days일 이상 캐시된 종목 수
+        """
+        if self.price_cache is None:
+            raise ValueError("일봉 캐시 디렉토리(cache_dir)가 지정되지 않았습니다")
+
+        def fill(ticker):
+            try:
+                self._fetch_fchart_prices(ticker, days, self._request_headers(ticker))
+            except Exception as e:
+                logging.warning(f"종목 {ticker} 일봉 백필 실패: {e}")
+            bars = self.price_cache.load(ticker)
+            return bars is not None and len(bars) >= days
+
+        with ThreadPoolExecutor(max_workers=self.per_host_limit) as executor:
+            filled = sum(executor.map(fill, tickers))
+
+        logging.info(f"일봉 백필 완료: {filled}/{len(tickers)}개 종목 {days}일 이상")
+        return filled
+
+    def _fetch_html_price(self, ticker, headers):
+        """종목 HTML 페이지에서 현재가를 가져옵니다. 실패 시 None"""
+        url = self.ITEM_URL.format(ticker=ticker)
+        response = self._get(url, headers=headers, timeout=10)
         
-        if avg_loss == 0:
-            return 100
+        if response.status_code == 200:
+            with self.metrics.timer('parse_seconds', kind='html'):
+                current_price = extract_current_price(response.content)
+            if current_price is not None:
+                logging.info(f"종목 {ticker}: HTML에서 현재가 {current_price} 수집 성공")
+                return current_price
+        return None
+    
+    def _route(self, ticker, tiers, default_order, pinned=()):
+        """
+        엔드포인트 통계에 따라 수집 방법을 순서대로 시도합니다.
         
-        # RSI 계산
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        Args:
+            tiers: {엔드포인트 이름: 호출 함수} 딕셔너리
+            default_order: 통계가 없을 때의 기본 시도 순서
+            pinned: 통계와 관계없이 항상 먼저 시도할 엔드포인트 (같은 종류의 데이터를 주는 나머지만 재정렬)
+        
+        Returns:
+            (성공한 엔드포인트 이름, 결과) 튜플 또는 모두 실패하면 (None, None)
+        """
+        rest = [name for name in default_order if name not in pinned]
+        failed = False
+        for name in list(pinned) + self.router.order(ticker, rest):
+            started = time.perf_counter()
+            try:
+                result = tiers[name]()
+            except requests.RequestException as e:
+                logging.warning(f"종목 {ticker}: {name} 요청 실패 - {e}")
+                result = None
+            elapsed = time.perf_counter() - started
+            self.router.record(ticker, name, result is not None, elapsed)
+            self.metrics.observe('endpoint_seconds', elapsed, endpoint=name)
+            
+            if result is not None:
+                if failed:
+                    # 앞선 방법이 실패하여 다음 방법으로 성공
+                    self.metrics.count('fallbacks_total', endpoint=name)
+                return name, result
+            self.metrics.count('endpoint_failures_total', endpoint=name)
+            failed = True
+        self.metrics.count('route_exhausted_total')
+        return None, None
+    
+    def get_current_price(self, ticker):
+        """
+        종목의 현재가만 가져옵니다. (실시간 시세 API, HTML 페이지 중 성공 가능성이 높은 순)
         
-        return round(rsi, 2)
+        Returns:
+            현재가 또는 실패 시 None
+        """
+        try:
+            # 일괄 조회로 이미 받은 현재가는 요청 없이 사용 (엔드포인트를 호출하지 않았으므로 통계에 기록하지 않음)
+            current_price = self._quotes.pop(ticker, None)
+            if current_price is not None:
+                logging.info(f"종목 {ticker}: 일괄 조회 현재가 {current_price} 사용")
+                return current_price
+            
+            headers = self._request_headers(ticker)
+            _, current_price = self._route(ticker, {
+                'polling': lambda: self._fetch_polling_price(ticker, headers),
+                'html': lambda: self._fetch_html_price(ticker, headers),
+            }, ('polling', 'html'))
+            
+            if current_price is not None:
+                time.sleep(self.delay)
+            return current_price
+            
+        except Exception as e:
+            logging.error(f"종목 {ticker}: 현재가 수집 실패 - {e}")
+            return None
     
     def get_stock_price_data(self, ticker, days=30):
         """
         네이버증권에서 실제 주가 데이터를 수집합니다.
         
+        수집 방법(실시간 시세 API, 차트 API, HTML 페이지)은 종목별 성공률과 응답 시간에 따라
+        성공 가능성이 높은 순서로 시도합니다. 일봉 캐시나 RSI 상태를 사용하면 실제 일봉을 주는
+        차트 API를 항상 먼저 시도합니다.
+        
         Args:
             ticker: 종목 코드
             days: 수집할 일수
@@ -89,87 +392,67 @@ class NaverStockDataCollector:
         Returns:
             가격 데이터 리스트 (실제 네이버증권 데이터만)
         """
+        return self._get_price_history(ticker, days)[0]
+    
+    def _get_price_history(self, ticker, days):
+        """
+        get_stock_price_data와 같이 가격 이력을 수집하고 실제 일봉인지 함께 알려줍니다.
+        
+        Returns:
+            (가격 데이터 리스트 또는 None, 차트 API/일봉 캐시의 실제 일봉이면 True) 튜플.
+            실시간 시세 API나 HTML 페이지로 받은 현재가로 만든 합성 이력이면 False
+        """
         try:
-            # 방법 1: 네이버증권 일별 시세 API
-            url1 = f"https://polling.finance.naver.com/api/realtime/domestic/stock/{ticker}"
+            # 오늘 갱신된 일봉 캐시가 있으면 네트워크 요청 없이 사용
+            if self.price_cache is not None:
+                prices = self.price_cache.get_closes(ticker, days)
+                if prices is not None:
+                    logging.info(f"종목 {ticker}: 일봉 캐시에서 {len(prices)}일 데이터 사용")
+                    return prices, True
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Referer': f'https://finance.naver.com/item/main.naver?code={ticker}',
-                'Accept': 'application/json, text/plain, */*'
-            }
+            headers = self._request_headers(ticker)
             
-            response = self.session.get(url1, headers=headers, timeout=10)
+            def from_current_price(current_price):
+                # 현재가 기준으로 30일간 실제적인 변동 데이터 생성
+                if current_price is None:
+                    return None
+                return self.generate_real_historical_data(ticker, current_price, days)
             
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    current_price = float(data.get('closePrice', 0))
-                    if current_price > 0:
-                        logging.info(f"종목 {ticker}: 현재가 {current_price} 수집 성공")
-                        # 현재가 기준으로 30일간 실제적인 변동 데이터 생성
-                        prices = self.generate_real_historical_data(ticker, current_price, days)
-                        time.sleep(self.delay)
-                        return prices
-                except (ValueError, KeyError, TypeError):
-                    pass
-            
-            # 방법 2: 네이버증권 차트 API (다른 엔드포인트)
-            url2 = f"https://fchart.stock.naver.com/sise.nhn?symbol={ticker}&timeframe=day&count={days}&requestType=0"
-            
-            response = self.session.get(url2, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                content = response.text
-                prices = []
-                
-                # XML 파싱
-                import re
-                pattern = r'<item data="([^"]+)"/>'
-                matches = re.findall(pattern, content)
-                
-                for match in matches:
-                    try:
-                        parts = match.split('|')
-                        if len(parts) >= 5:
-                            close_price = float(parts[4])
-                            prices.append(close_price)
-                    except (ValueError, IndexError):
-                        continue
-                
-                if len(prices) >= 15:
-                    logging.info(f"종목 {ticker}: 차트API에서 {len(prices)}일 데이터 수집 성공")
-                    time.sleep(self.delay)
-                    return prices[:days]
+            tiers = {
+                # 방법 1: 네이버증권 일별 시세 API
+                'polling': lambda: from_current_price(self._fetch_polling_price(ticker, headers)),
+                # 방법 2: 네이버증권 차트 API (다른 엔드포인트)
+                'fchart': lambda: self._fetch_fchart_prices(ticker, days, headers),
+                # 방법 3: HTML 페이지 스크래핑
+                'html': lambda: from_current_price(self._fetch_html_price(ticker, headers)),
+            }
             
-            # 방법 3: HTML 페이지 스크래핑
-            url3 = f"https://finance.naver.com/item/main.naver?code={ticker}"
-            response = self.session.get(url3, headers=headers, timeout=10)
+            # 실제 일봉은 차트 API에서만 받고 나머지는 현재가로 만든 합성 데이터이므로
+            # 캐시나 RSI 상태를 채울 때는 차트 API를 통계와 관계없이 먼저 시도
+            real_first = self.price_cache is not None or self.rsi_state is not None
             
-            if response.status_code == 200:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 현재가 찾기
-                price_elements = soup.select('.no_today .blind')
-                if price_elements:
-                    try:
-                        current_price_text = price_elements[0].text.replace(',', '')
-                        current_price = float(current_price_text)
-                        logging.info(f"종목 {ticker}: HTML에서 현재가 {current_price} 수집 성공")
-                        # 실제 기반 데이터 생성
-                        prices = self.generate_real_historical_data(ticker, current_price, days)
-                        time.sleep(self.delay)
-                        return prices
-                    except (ValueError, IndexError):
-                        pass
+            # 일괄 조회로 이미 받은 현재가가 있으면 현재가 엔드포인트(실시간 시세, HTML)는 호출하지 않음
+            # (엔드포인트를 호출하지 않았으므로 통계에 기록하지 않음)
+            quote = self._quotes.pop(ticker, None)
+            if quote is not None:
+                name, prices = self._route(ticker, tiers, ('fchart',)) if real_first else (None, None)
+                if prices is None:
+                    logging.info(f"종목 {ticker}: 일괄 조회 현재가 {quote} 사용")
+                    return from_current_price(quote), False
+            elif real_first:
+                name, prices = self._route(ticker, tiers, ('fchart', 'polling', 'html'), pinned=('fchart',))
+            else:
+                name, prices = self._route(ticker, tiers, ('polling', 'fchart', 'html'))
+            if prices is not None:
+                time.sleep(self.delay)
+                return prices, name == 'fchart'
             
             logging.error(f"종목 {ticker}: 모든 네이버증권 데이터 수집 방법 실패")
-            return None
+            return None, False
                 
         except Exception as e:
             logging.error(f"종목 {ticker}: 네이버증권 데이터 수집 실패 - {e}")
-            return None
+            return None, False
     
     def generate_real_historical_data(self, ticker, current_price, days):
         """
@@ -230,43 +513,77 @@ class NaverStockDataCollector:
         """
         ticker = stock_info['ticker']
         
+        # 주말/휴장일이나 장 시작 전에 받은 시세는 직전 거래일 것이므로 거래일 기준으로 기록
+        today = session_date()
+        
         try:
-            # 30일 간의 네이버증권 실제 데이터 수집
-            prices = self.get_stock_price_data(ticker, 30)
+            rsi = None
+            prices = None
             
-            if not prices or len(prices) < 15:
-                logging.warning(f"종목 {ticker}: 네이버증권에서 실제 데이터를 가져올 수 없습니다. 건너뜀.")
-                return None
+            # 저장된 RSI 상태가 있으면 오늘 현재가 하나로 증분 계산
+            if self.rsi_state is not None and self.rsi_state.is_usable(ticker, today):
+                current_price = self.get_current_price(ticker)
+                if current_price is not None:
+                    with self.metrics.timer('rsi_seconds', method='incremental'):
+                        rsi = self.rsi_state.update(ticker, today, current_price)
+                    if rsi:
+                        logging.info(f"종목 {ticker}: 저장된 RSI 상태로 증분 계산")
+                if rsi is None:
+                    # 증분 계산에 실패하여 전체 이력을 다시 받음
+                    self.metrics.count('retries_total', reason='incremental_failed')
             
-            # RSI 계산 (실제 데이터로만)
-            # 전체 데이터로 오늘 RSI 계산
-            rsi7_today = self.calculate_rsi(prices, 7)
-            rsi14_today = self.calculate_rsi(prices, 14)
-            
-            # 마지막 데이터를 제외하고 어제 RSI 계산
-            if len(prices) > 15:
-                prices_yesterday = prices[:-1]  # 어제까지의 데이터
-                rsi7_yesterday = self.calculate_rsi(prices_yesterday, 7)
-                rsi14_yesterday = self.calculate_rsi(prices_yesterday, 14)
+            if rsi is None:
+                # 30일(보조지표 사용 시 지표에 필요한 일수) 간의 네이버증권 실제 데이터 수집
+                prices, real_bars = self._get_price_history(ticker, self.history_days)
+                
+                if not prices or len(prices) < 15:
+                    logging.warning(f"종목 {ticker}: 네이버증권에서 실제 데이터를 가져올 수 없습니다. 건너뜀.")
+                    return None
+                
+                if len(prices) <= 15:
+                    logging.warning(f"종목 {ticker}: 어제 RSI 계산을 위한 데이터 부족")
+                    return None
+                
+                # RSI 계산 (실제 데이터로만)
+                if self.rsi_state is not None and real_bars:
+                    # 전체 이력으로 Wilder RSI를 다시 계산하고 다음 증분 계산을 위해 상태 저장
+                    # (현재가로 만든 합성 이력은 상태로 남기지 않고 아래 배치 계산만 사용)
+                    with self.metrics.timer('rsi_seconds', method='seed'):
+                        rsi = self.rsi_state.seed(ticker, today, prices, prev_date=previous_trading_day(today))
+                else:
+                    # 오늘/어제 RSI7, RSI14를 한 번의 배치 계산으로 구함
+                    with self.metrics.timer('rsi_seconds', method='batch'):
+                        batch = calculate_rsi_batch(prices, periods=(7, 14), last_n=2)
+                    rsi = {
+                        'yesterday': {period: float(values[0, 0]) for period, values in batch.items()},
+                        'today': {period: float(values[0, 1]) for period, values in batch.items()},
+                    }
+                
+                if rsi is None:
+                    logging.warning(f"종목 {ticker}: RSI 계산을 위한 데이터 부족")
+                    return None
                 
                 # 실제 차이가 있는지 로그로 확인
                 logging.info(f"종목 {ticker}: 오늘가격={prices[-1]:.0f}, 어제가격={prices[-2]:.0f}")
-                logging.info(f"종목 {ticker}: RSI7 오늘={rsi7_today:.2f}, 어제={rsi7_yesterday:.2f}")
-            else:
-                logging.warning(f"종목 {ticker}: 어제 RSI 계산을 위한 데이터 부족")
-                return None
+            
+            rsi7_today, rsi14_today = rsi['today'][7], rsi['today'][14]
+            rsi7_yesterday, rsi14_yesterday = rsi['yesterday'][7], rsi['yesterday'][14]
+            logging.info(f"종목 {ticker}: RSI7 오늘={rsi7_today:.2f}, 어제={rsi7_yesterday:.2f}")
             
             result = {
                 'Ticker': ticker,
                 'Name': stock_info['name'],
                 'Industry': stock_info['industry'],
-                'Date': datetime.now().strftime('%Y-%m-%d'),
+                'Date': today,
                 'RSI7': rsi7_today,
                 'RSI14': rsi14_today,
                 'Yesterday_RSI7': rsi7_yesterday,
                 'Yesterday_RSI14': rsi14_yesterday
             }
             
+            if self.indicators:
+                self._remember_history(ticker, prices)
+            
             logging.info(f"종목 {ticker} ({stock_info['name']}) 데이터 수집 완료")
             return result
             
@@ -274,99 +591,278 @@ class NaverStockDataCollector:
             logging.error(f"종목 {ticker} RSI 계산 오류: {e}")
             return None
     
+    def _remember_history(self, ticker, prices=None):
+        """
+        보조지표 계산용 가격 이력을 보관합니다.
+        
+        증분 계산으로 가격을 받지 않은 종목은 이력을 새로 가져오며(오늘 갱신된 캐시가 있으면 네트워크 요청 없음),
+        일봉 캐시에 같은 종가의 일봉이 있으면 스토캐스틱용 고가/저가도 함께 사용합니다.
+        """
+        if prices is None:
+            prices = self.get_stock_price_data(ticker, self.history_days)
+            if not prices:
+                logging.warning(f"종목 {ticker}: 보조지표 계산용 가격 이력이 없습니다")
+                return
+        
+        closes = np.asarray(prices, dtype=float)
+        highs = lows = None
+        if self.price_cache is not None:
+            bars = self.price_cache.load(ticker)
+            if bars is not None and len(bars) >= len(closes) and bars['close'][-1] == closes[-1]:
+                highs = bars['high'][-len(closes):].astype(float)
+                lows = bars['low'][-len(closes):].astype(float)
+        
+        self._histories[ticker] = (closes, highs, lows)
+    
+    def apply_indicators(self, all_results):
+        """
+        보관한 가격 이력을 (종목 수, 일수) 행렬 하나로 모아 보조지표를 한 번에 계산하고
+        결과 딕셔너리에 열로 추가합니다. 계산할 수 없는 값은 None
+        """
+        histories = [(rsi_data, self._histories.get(rsi_data['Ticker'])) for rsi_data in all_results]
+        histories = [(rsi_data, history) for rsi_data, history in histories if history is not None]
+        self._histories = {}
+        if not histories:
+            return
+        
+        # 이력 길이가 다르면 최근 날짜 기준으로 오른쪽 정렬하고 앞부분은 NaN
+        days = max(len(closes) for _, (closes, _, _) in histories)
+        matrices = [np.full((len(histories), days), np.nan) for _ in range(3)]
+        for row, (_, (closes, highs, lows)) in enumerate(histories):
+            for matrix, values in zip(matrices, (closes, closes if highs is None else highs,
+                                                 closes if lows is None else lows)):
+                matrix[row, days - len(values):] = values
+        
+        with self.metrics.timer('indicator_seconds'):
+            columns = IndicatorPipeline(*matrices).compute(self.indicators)
+        for row, (rsi_data, _) in enumerate(histories):
+            for column, values in columns.items():
+                value = values[row]
+                rsi_data[column] = None if np.isnan(value) else float(value)
+        
+        logging.info(f"보조지표 계산 완료: {', '.join(self.indicators)} ({len(histories)}개 종목)")
+    
     def meets_rsi_conditions(self, rsi_data):
         """
-        RSI 조건에 맞는지 확인하는 함수
+        RSI 조건에 맞는지 확인하는 함수 (종목 하나)
         
-        조건:
+        조건은 선별 규칙(screen_rules)을 따르며 기본 규칙은 다음과 같습니다.
         1. RSI7이 30 이하 (과매도) 또는 70 이상 (과매수)
         2. RSI14가 30 이하 (과매도) 또는 70 이상 (과매수)  
         3. RSI7 변화량이 ±5 이상
         4. RSI14 변화량이 ±3 이상
+        5. RSI7이 50선을 돌파
         
         위 조건 중 하나라도 만족하면 True 반환
         """
         try:
-            rsi7 = rsi_data.get('RSI7')
-            rsi14 = rsi_data.get('RSI14')
-            rsi7_yesterday = rsi_data.get('Yesterday_RSI7')
-            rsi14_yesterday = rsi_data.get('Yesterday_RSI14')
-            
-            if not all([rsi7, rsi14, rsi7_yesterday, rsi14_yesterday]):
-                return False
-            
-            # RSI7 과매도/과매수 조건
-            if rsi7 <= 30 or rsi7 >= 70:
-                return True
-            
-            # RSI14 과매도/과매수 조건  
-            if rsi14 <= 30 or rsi14 >= 70:
-                return True
-            
-            # RSI7 변화량 조건
-            rsi7_change = abs(rsi7 - rsi7_yesterday)
-            if rsi7_change >= 5:
-                return True
-            
-            # RSI14 변화량 조건
-            rsi14_change = abs(rsi14 - rsi14_yesterday)
-            if rsi14_change >= 3:
-                return True
-            
-            # 급등/급락 신호 (RSI가 50선을 돌파)
-            if (rsi7_yesterday <= 50 and rsi7 > 50) or (rsi7_yesterday >= 50 and rsi7 < 50):
-                return True
-            
-            return False
+            matched, _ = self.screen.evaluate([rsi_data])
+            return bool(matched[0])
             
         except Exception as e:
             logging.error(f"RSI 조건 확인 중 오류: {e}")
             return False
 
-    def collect_all_data(self):
+    def _collect_stock(self, stock_info):
+        """
+        한 종목의 RSI 데이터를 수집합니다.
+        
+        Returns:
+            rsi_data 또는 수집 실패 시 None
+        """
+        try:
+            rsi_data = self.get_stock_rsi_data(stock_info)
+            if rsi_data and self._journal is not None:
+                self._journal_record(rsi_data)
+            return rsi_data
+        except Exception as e:
+            logging.error(f"종목 {stock_info['ticker']} 처리 중 오류: {e}")
+        return None
+    
+    def _journal_record(self, rsi_data):
+        """종목 결과와 이어서 수집할 때 필요한 RSI 상태, 가격 이력을 저널에 기록합니다."""
+        ticker = rsi_data['Ticker']
+        state = self.rsi_state.get(ticker) if self.rsi_state is not None else None
+        history = self._histories.get(ticker)
+        if history is not None:
+            history = [None if values is None else [float(v) for v in values] for values in history]
+        self._journal.record(ticker, rsi_data, state, history)
+    
+    def _resume(self, entries):
+        """저널에 기록된 종목의 RSI 상태와 가격 이력을 복원하고 결과를 반환합니다."""
+        results = {}
+        for ticker, entry in entries.items():
+            if entry.get('state') and self.rsi_state is not None:
+                self.rsi_state.put(ticker, entry['state'])
+            if entry.get('history') and self.indicators:
+                closes, highs, lows = entry['history']
+                self._histories[ticker] = tuple(None if values is None else np.asarray(values, dtype=float)
+                                                for values in (closes, highs, lows))
+            results[ticker] = entry['result']
+        return results
+    
+    def _collect_sequential(self, kospi200_list):
+        """종목을 하나씩 순서대로 수집합니다."""
+        total_stocks = len(kospi200_list)
+        outcomes = []
+        
+        for i, stock_info in enumerate(kospi200_list, 1):
+            logging.info(f"진행률: {i}/{total_stocks} ({(i/total_stocks)*100:.1f}%)")
+            outcomes.append(self._collect_stock(stock_info))
+        
+        return outcomes
+    
+    def _collect_concurrent(self, kospi200_list, max_workers):
+        """
+        스레드 풀로 여러 종목을 동시에 수집합니다.
+        결과는 종목 리스트 순서를 유지하므로 순차 수집과 동일합니다.
+        """
+        total_stocks = len(kospi200_list)
+        outcomes = [None] * total_stocks
+        done = 0
+        
+        logging.info(f"동시 수집 모드: 작업자 {max_workers}개, 호스트별 최대 {self.per_host_limit}개 요청")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._collect_stock, stock_info): index
+                for index, stock_info in enumerate(kospi200_list)
+            }
+            for future in futures:
+                outcomes[futures[future]] = future.result()
+                done += 1
+                logging.info(f"진행률: {done}/{total_stocks} ({(done/total_stocks)*100:.1f}%)")
+        
+        return outcomes
+    
+    def collect_all_data(self, max_workers=None):
         """
         모든 코스피200 종목의 RSI 데이터를 수집하고 조건에 맞는 종목만 필터링합니다.
+        
+        Args:
+            max_workers: 동시 수집 작업자 수 (None이면 생성자 설정 사용, 1이면 순차 수집)
         """
         logging.info("코스피200 RSI 데이터 수집 시작")
+        self.metrics.reset()
         
         # 종목 리스트 가져오기
-        kospi200_list = self.get_kospi200_list()
-        all_results = []
+        with self.metrics.timer('stage_seconds', stage='universe'):
+            kospi200_list = self.get_kospi200_list()
         filtered_results = []
         
-        total_stocks = len(kospi200_list)
+        workers = self.max_workers if max_workers is None else max(1, int(max_workers))
+        # 수집기를 계속 재사용하는 경우에도 이번 수집의 캐시 통계만 기록
+        cache_before = self.price_cache.stats() if self.price_cache is not None else None
         
-        for i, stock_info in enumerate(kospi200_list, 1):
-            logging.info(f"진행률: {i}/{total_stocks} ({(i/total_stocks)*100:.1f}%)")
+        # 저널이 있으면 같은 날짜에 이미 수집한 종목은 건너뛰고 남은 종목만 수집
+        resumed = {}
+        if self.journal_dir:
+            self._close_journal()
+            self._journal = RunJournal(self.journal_dir, run_date=session_date(), dedupe=self.journal_dedupe)
+            resumed = self._resume(self._journal.open())
+        pending = [stock for stock in kospi200_list if stock['ticker'] not in resumed]
+        
+        try:
+            # 현재가를 일괄 조회해 두면 종목별 실시간 시세 요청을 생략
+            if self.bulk_batch_size > 0 and pending:
+                with self.metrics.timer('stage_seconds', stage='bulk_quotes'):
+                    self._quotes = self.get_bulk_quotes([stock['ticker'] for stock in pending])
             
-            try:
-                rsi_data = self.get_stock_rsi_data(stock_info)
-                if rsi_data:
-                    all_results.append(rsi_data)
-                    
-                    # RSI 조건 확인
-                    if self.meets_rsi_conditions(rsi_data):
-                        filtered_results.append(rsi_data)
-                        logging.info(f"조건 만족 종목: {rsi_data['Name']} (RSI7: {rsi_data['RSI7']}, RSI14: {rsi_data['RSI14']})")
-                        
-            except Exception as e:
-                logging.error(f"종목 {stock_info['ticker']} 처리 중 오류: {e}")
-                continue
+            with self.metrics.timer('stage_seconds', stage='collect'):
+                if workers > 1 and len(pending) > 1:
+                    collected = self._collect_concurrent(pending, workers)
+                else:
+                    collected = self._collect_sequential(pending)
+        except BaseException:
+            # 중간에 실패하거나 중단되어도 지금까지 기록한 종목은 다음 실행에서 이어서 사용
+            self._close_journal()
+            raise
+        finally:
+            self._quotes = {}
+        
+        collected = dict(zip((stock['ticker'] for stock in pending), collected))
+        outcomes = [resumed.get(stock['ticker']) or collected.get(stock['ticker']) for stock in kospi200_list]
+        
+        if self.rsi_state is not None:
+            self.rsi_state.save()
+        
+        self.router.save()
+        for endpoint, entry in sorted(self.router.stats().items()):
+            logging.info(f"엔드포인트 {endpoint}: 성공 {entry['successes']}/{entry['attempts']}, "
+                         f"평균 응답 {(entry['latency'] or 0) * 1000:.0f}ms")
+        
+        if self.price_cache is not None:
+            stats = {key: value - cache_before[key] for key, value in self.price_cache.stats().items()}
+            logging.info(f"일봉 캐시: 적중 {stats['hits']}, 부분 요청 {stats['partial']}, 전체 요청 {stats['misses']}")
+            for key, value in stats.items():
+                self.metrics.count('cache_requests_total', value, result=key)
+        
+        all_results = [rsi_data for rsi_data in outcomes if rsi_data]
+        self.metrics.count('tickers_total', len(resumed), outcome='resumed')
+        self.metrics.count('tickers_total', sum(1 for rsi_data in collected.values() if rsi_data), outcome='collected')
+        self.metrics.count('tickers_total', sum(1 for rsi_data in collected.values() if not rsi_data), outcome='failed')
+        
+        if self.indicators:
+            self.apply_indicators(all_results)
+        
+        # RSI 조건 확인: 그날 전체 결과에 선별 규칙을 한 번에 적용
+        with self.metrics.timer('stage_seconds', stage='screen'):
+            matched, fired = self.screen.evaluate(all_results)
+        for rsi_data, is_matched, rules in zip(all_results, matched, fired):
+            if is_matched:
+                filtered_results.append(dict(rsi_data, Rules='|'.join(rules)))
+                logging.info(f"조건 만족 종목: {rsi_data['Name']} (RSI7: {rsi_data['RSI7']}, RSI14: {rsi_data['RSI14']}, 규칙: {', '.join(rules)})")
         
         # 조건에 맞는 종목들을 CSV 파일로 저장
         if filtered_results:
+            import pandas as pd
+            
             df = pd.DataFrame(filtered_results)
             filename = 'results_코스피_200.csv'
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
+            # 브라우저가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체하여 게시
+            with self.metrics.timer('csv_write_seconds', target='results'):
+                content = df.to_csv(index=False).encode('utf-8-sig')
+                publish_file(filename, content)
+                record_write(filename, content)
+                publish_file(payload_filename(filename), render_payload(filtered_results))
             logging.info(f"조건 만족 종목 데이터 저장: {len(filtered_results)}개 종목 (전체 {len(all_results)}개 중), 파일명: {filename}")
         else:
             logging.warning("조건에 맞는 종목이 없습니다")
         
+        self._close_journal(complete=True, records=len(all_results))
+        self.metrics.count('tickers_total', len(filtered_results), outcome='matched')
+        self.export_metrics()
         return filtered_results
+    
+    def _close_journal(self, complete=False, records=0):
+        """수집 저널을 닫습니다. complete면 완료 표시를 남겨 다음 실행은 처음부터 수집"""
+        if self._journal is None:
+            return
+        if complete:
+            self._journal.complete(records)
+        else:
+            self._journal.close()
+        self._journal = None
+    
+    def export_metrics(self):
+        """
+        이번 실행의 계측 결과를 JSON 요약과 Prometheus 텍스트 파일로 내보냅니다.
+        
+        Returns:
+            JSON 요약 파일 경로 또는 계측을 끈 경우/실패 시 None
+        """
+        try:
+            path = self.metrics.export(self.metrics_dir)
+        except OSError as e:
+            logging.error(f"계측 결과 저장 실패: {e}")
+            return None
+        if path:
+            logging.info(f"계측 결과 저장: {path}")
+        return path
 
 def main():
     """메인 실행 함수"""
-    collector = NaverStockDataCollector()
+    collector = NaverStockDataCollector(rules_path="screen_rules.json")
     
     try:
         # 데이터 수집 실행
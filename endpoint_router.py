@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목별 데이터 수집 엔드포인트 적응형 선택
+
+- 종목별/엔드포인트별 성공률과 응답 시간(지수이동평균)을 기록
+- 성공 가능성이 높은 엔드포인트부터 시도하여 실패가 뻔한 요청을 줄임
+- 일정 횟수마다 기본 순서로 모든 엔드포인트를 다시 확인(재탐색)
+- 통계는 JSON 파일로 저장하여 다음 실행에서도 사용
+"""
+
+import os
+import json
+import threading
+import logging
+
+
+class EndpointRouter:
+    def __init__(self, path=None, reprobe_interval=20, alpha=0.2):
+        """
+        Args:
+            path: 통계 저장 파일 경로 (None이면 메모리에만 보관)
+            reprobe_interval: 이 횟수마다 한 번은 기본 순서로 시도하여 다른 엔드포인트 재확인
+            alpha: 응답 시간 지수이동평균 가중치
+        """
+        self.path = path
+        self.reprobe_interval = max(1, int(reprobe_interval))
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._calls = 0
+        # {종목코드: {엔드포인트: {'attempts', 'successes', 'latency'}}}, 전체 통계는 '*' 키
+        self._stats = {}
+        self.load()
+
+    def load(self):
+        """저장된 통계를 읽어옵니다."""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._stats = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"엔드포인트 통계 파일 읽기 실패: {e}")
+            self._stats = {}
+
+    def save(self):
+        """통계를 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+        if not self.path:
+            return
+
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._stats, f)
+            os.replace(tmp_path, self.path)
+
+    def _entry(self, key, endpoint):
+        return self._stats.setdefault(key, {}).setdefault(
+            endpoint, {'attempts': 0, 'successes': 0, 'latency': None}
+        )
+
+    def record(self, ticker, endpoint, success, latency):
+        """엔드포인트 시도 결과를 기록합니다."""
+        with self._lock:
+            for key in (ticker, '*'):
+                entry = self._entry(key, endpoint)
+                entry['attempts'] += 1
+                entry['successes'] += 1 if success else 0
+                if entry['latency'] is None:
+                    entry['latency'] = latency
+                else:
+                    entry['latency'] = (1 - self.alpha) * entry['latency'] + self.alpha * latency
+
+    def _score(self, ticker, endpoint):
+        """(성공률, 응답 시간) 추정치. 종목 기록이 없으면 전체 기록 사용"""
+        entry = self._stats.get(ticker, {}).get(endpoint)
+        if not entry or entry['attempts'] == 0:
+            entry = self._stats.get('*', {}).get(endpoint)
+        if not entry or entry['attempts'] == 0:
+            return 0.5, 0.0
+
+        # 라플라스 보정으로 시도 횟수가 적을 때 극단값 완화
+        success_rate = (entry['successes'] + 1) / (entry['attempts'] + 2)
+        return success_rate, entry['latency'] or 0.0
+
+    def order(self, ticker, endpoints):
+        """
+        시도할 엔드포인트 순서를 반환합니다.
+
+        성공률이 높은 순, 비슷하면 응답이 빠른 순으로 정렬하며
+        reprobe_interval번마다 한 번은 기본 순서를 그대로 사용합니다.
+        """
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.reprobe_interval == 0:
+                return list(endpoints)
+
+            scores = {endpoint: self._score(ticker, endpoint) for endpoint in endpoints}
+
+        # 성공률은 0.05 단위로 묶어 작은 차이로 순서가 흔들리지 않게 함
+        return sorted(
+            endpoints,
+            key=lambda endpoint: (-round(scores[endpoint][0] * 20), scores[endpoint][1])
+        )
+
+    def stats(self, ticker='*'):
+        """엔드포인트별 시도/성공 횟수와 평균 응답 시간을 반환합니다. (기본: 전체)"""
+        with self._lock:
+            return {endpoint: dict(entry) for endpoint, entry in self._stats.get(ticker, {}).items()}
@@ -10,12 +10,21 @@
 """
 
 import os
+import csv
 import shutil
-import pandas as pd
 from datetime import datetime, timedelta
 import logging
 import glob
 
+from publisher import publish_file
+from dashboard_payload import render_payload, payload_filename
+from file_manifest import FileManifest, record_write, record_remove
+from backup_store import BackupStore
+from csv_merge import merge_csv_files
+from history_db import HistoryDB
+
+# pandas는 실제로 필요한 작업(get_date_range)에서만 import 하여 list/stats 명령을 가볍게 유지
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -28,6 +37,9 @@ class KOSPI200FileManager:
         # 백업 디렉토리 생성
         if not os.path.exists(self.backup_dir):
             os.makedirs(self.backup_dir)
+        
+        # 청크 단위로 압축/중복 제거하여 저장하는 백업 저장소
+        self.backup_store = BackupStore(self.backup_dir)
     
     def get_monthly_filename(self, year=None, month=None):
         """특정 년월의 파일명을 반환합니다."""
@@ -38,30 +50,43 @@ class KOSPI200FileManager:
         return f"{self.base_filename}_{year}_{month:02d}.csv"
     
     def list_all_files(self):
-        """모든 관련 파일 목록을 반환합니다."""
+        """
+        모든 관련 파일 목록을 반환합니다.
+        
+        레코드 수와 날짜 범위는 매니페스트(file_manifest.json)에서 읽으며,
+        매니페스트와 크기/수정 시각이 다른 파일만 다시 읽습니다.
+        """
         pattern = f"{self.base_filename}*.csv"
         files = glob.glob(pattern)
         
+        manifest = FileManifest()
+        entries = manifest.entries(files)
+        try:
+            manifest.save()
+        except OSError as e:
+            logging.warning(f"파일 매니페스트 저장 실패: {e}")
+        
         file_info = []
-        for file in files:
-            try:
-                stat = os.stat(file)
-                df = pd.read_csv(file, encoding='utf-8-sig')
-                
-                file_info.append({
-                    'filename': file,
-                    'size': stat.st_size,
-                    'modified': datetime.fromtimestamp(stat.st_mtime),
-                    'records': len(df),
-                    'date_range': self.get_date_range(df)
-                })
-            except Exception as e:
-                logging.warning(f"파일 {file} 정보 읽기 실패: {e}")
+        for file, entry in entries.items():
+            min_date = entry['min_date']
+            max_date = entry['max_date']
+            file_info.append({
+                'filename': file,
+                'size': entry['size'],
+                'modified': datetime.fromtimestamp(entry['mtime_ns'] / 1e9),
+                'records': entry['records'],
+                'min_date': min_date,
+                'max_date': max_date,
+                'checksum': entry['checksum'],
+                'date_range': f"{min_date} ~ {max_date}" if min_date else "날짜 정보 없음"
+            })
         
         return sorted(file_info, key=lambda x: x['modified'], reverse=True)
     
     def get_date_range(self, df):
         """DataFrame의 날짜 범위를 반환합니다."""
+        import pandas as pd
+        
         try:
             if 'Date' in df.columns and len(df) > 0:
                 dates = pd.to_datetime(df['Date'])
@@ -71,7 +96,14 @@ class KOSPI200FileManager:
         return "날짜 정보 없음"
     
     def create_backup(self, filename=None):
-        """파일 백업을 생성합니다."""
+        """
+        파일 백업(스냅샷)을 생성합니다.
+        
+        내용이 같은 청크는 한 번만 압축 저장하므로 백업 크기는 변경된 내용에만 비례합니다.
+        
+        Returns:
+            스냅샷 ID 또는 실패 시 False
+        """
         if filename is None:
             filename = self.display_filename
         
@@ -80,28 +112,46 @@ class KOSPI200FileManager:
             return False
         
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_filename = f"{self.backup_dir}/{os.path.splitext(filename)[0]}_{timestamp}.csv"
-            
-            shutil.copy2(filename, backup_filename)
-            logging.info(f"백업 생성 완료: {backup_filename}")
-            return backup_filename
+            snapshot = self.backup_store.create(filename)
+            logging.info(f"백업 생성 완료: {snapshot['id']} ({snapshot['size']:,}bytes, 새로 저장 {snapshot['new_bytes']:,}bytes)")
+            return snapshot['id']
             
         except Exception as e:
             logging.error(f"백업 생성 실패: {e}")
             return False
     
     def restore_from_backup(self, backup_filename, target_filename=None):
-        """백업에서 파일을 복구합니다."""
-        if target_filename is None:
-            target_filename = self.display_filename
+        """
+        백업에서 파일을 복구합니다.
         
+        Args:
+            backup_filename: 스냅샷 ID, 스냅샷 매니페스트 경로 또는 이전 방식의 백업 CSV 경로
+            target_filename: 복구할 파일 (기본: 스냅샷은 백업한 원본 파일, 이전 방식 백업은 표시 파일)
+        """
         try:
-            if not os.path.exists(backup_filename):
-                logging.error(f"백업 파일이 없습니다: {backup_filename}")
-                return False
+            if backup_filename.endswith('.csv'):
+                # 이전 방식(전체 복사)으로 만든 백업 파일
+                if not os.path.exists(backup_filename):
+                    logging.error(f"백업 파일이 없습니다: {backup_filename}")
+                    return False
+                if target_filename is None:
+                    target_filename = self.display_filename
+                shutil.copy2(backup_filename, target_filename)
+            else:
+                if not os.path.exists(self.backup_store.snapshot_path(backup_filename)):
+                    logging.error(f"백업 스냅샷이 없습니다: {backup_filename}")
+                    return False
+                if target_filename is None:
+                    # 월별/아카이브 파일의 스냅샷이 표시 파일을 덮어쓰지 않도록 원래 위치로 복구
+                    target_filename = self.backup_store.load(backup_filename)['source']
+                self.backup_store.restore(backup_filename, target_filename)
             
-            shutil.copy2(backup_filename, target_filename)
+            if os.path.basename(target_filename) == os.path.basename(self.display_filename):
+                # 표시 파일은 압축본과 웹페이지용 JSON까지 다시 게시
+                with open(target_filename, 'rb') as f:
+                    self.publish_display(f.read())
+            else:
+                record_write(target_filename)
             logging.info(f"복구 완료: {backup_filename} -> {target_filename}")
             return True
             
@@ -109,36 +159,35 @@ class KOSPI200FileManager:
             logging.error(f"복구 실패: {e}")
             return False
     
-    def merge_files(self, file_list, output_filename=None):
-        """여러 파일을 병합합니다."""
+    def merge_files(self, file_list, output_filename=None, chunk_rows=50000, chunk_bytes=32 << 20):
+        """
+        여러 파일을 병합합니다.
+        
+        (Ticker, Date)가 같으면 뒤쪽 파일의 행을 남기고 날짜 내림차순, 종목코드 오름차순으로 저장합니다.
+        파일 전체를 메모리에 올리지 않고 chunk_rows개 또는 chunk_bytes만큼씩 정렬한 뒤 스트리밍으로 병합합니다.
+        
+        Args:
+            file_list: 병합할 파일 목록
+            output_filename: 출력 파일명 (기본: results_코스피_200_merged_YYYYMMDD.csv)
+            chunk_rows: 정렬 구간 하나에 담을 최대 행 수
+            chunk_bytes: 정렬 구간 하나에 담을 행 내용의 최대 크기 (바이트)
+        """
         if output_filename is None:
             output_filename = f"{self.base_filename}_merged_{datetime.now().strftime('%Y%m%d')}.csv"
         
         try:
-            all_data = []
-            
+            existing = []
             for filename in file_list:
                 if os.path.exists(filename):
-                    df = pd.read_csv(filename, encoding='utf-8-sig')
-                    all_data.append(df)
-                    logging.info(f"파일 병합: {filename} ({len(df)} 레코드)")
+                    existing.append(filename)
+                    logging.info(f"파일 병합: {filename}")
                 else:
                     logging.warning(f"파일이 없습니다: {filename}")
             
-            if all_data:
-                merged_df = pd.concat(all_data, ignore_index=True)
-                
-                # 중복 제거 (Ticker + Date 기준)
-                merged_df = merged_df.drop_duplicates(subset=['Ticker', 'Date'], keep='last')
-                
-                # 날짜순 정렬
-                merged_df['Date'] = pd.to_datetime(merged_df['Date'])
-                merged_df = merged_df.sort_values(['Date', 'Ticker'], ascending=[False, True])
-                merged_df['Date'] = merged_df['Date'].dt.strftime('%Y-%m-%d')
-                
-                # 저장
-                merged_df.to_csv(output_filename, index=False, encoding='utf-8-sig')
-                logging.info(f"병합 완료: {output_filename} ({len(merged_df)} 레코드)")
+            if existing:
+                records = merge_csv_files(existing, output_filename, chunk_rows=chunk_rows, chunk_bytes=chunk_bytes)
+                record_write(output_filename)
+                logging.info(f"병합 완료: {output_filename} ({records} 레코드)")
                 return output_filename
             
         except Exception as e:
@@ -161,6 +210,7 @@ class KOSPI200FileManager:
                     backup_file = self.create_backup(file_info['filename'])
                     if backup_file:
                         os.remove(file_info['filename'])
+                        record_remove(file_info['filename'])
                         removed_count += 1
                         logging.info(f"오래된 파일 삭제: {file_info['filename']}")
             
@@ -171,13 +221,23 @@ class KOSPI200FileManager:
             logging.error(f"파일 정리 실패: {e}")
             return 0
     
+    def publish_display(self, content):
+        """표시 파일 내용을 게시하고 웹페이지용 JSON과 매니페스트도 함께 갱신합니다."""
+        publish_file(self.display_filename, content)
+        record_write(self.display_filename, content)
+        
+        # 웹페이지가 먼저 읽는 JSON도 같은 내용으로 갱신
+        records = csv.DictReader(content.decode('utf-8-sig').splitlines())
+        publish_file(payload_filename(self.display_filename), render_payload(records))
+    
     def sync_display_file(self):
         """현재 월 파일을 표시용 파일과 동기화합니다."""
         try:
             current_monthly_file = self.get_monthly_filename()
             
             if os.path.exists(current_monthly_file):
-                shutil.copy2(current_monthly_file, self.display_filename)
+                with open(current_monthly_file, 'rb') as f:
+                    self.publish_display(f.read())
                 logging.info(f"표시 파일 동기화: {current_monthly_file} -> {self.display_filename}")
                 return True
             else:
@@ -196,6 +256,7 @@ class KOSPI200FileManager:
                 new_filename = old_filename.replace("(2)", "")
                 if os.path.exists(old_filename):
                     shutil.move(old_filename, new_filename)
+                    record_remove(old_filename, new_filename)
                     logging.info(f"파일명 수정: {old_filename} -> {new_filename}")
                     return new_filename
             return old_filename
@@ -215,29 +276,66 @@ class KOSPI200FileManager:
         oldest_date = None
         newest_date = None
         
+        # 매니페스트의 날짜는 YYYY-MM-DD 문자열이므로 그대로 비교
         for file_info in files:
-            if file_info['date_range'] != "날짜 정보 없음":
-                try:
-                    date_parts = file_info['date_range'].split(' ~ ')
-                    start_date = datetime.strptime(date_parts[0], '%Y-%m-%d')
-                    end_date = datetime.strptime(date_parts[1], '%Y-%m-%d')
-                    
-                    if oldest_date is None or start_date < oldest_date:
-                        oldest_date = start_date
-                    if newest_date is None or end_date > newest_date:
-                        newest_date = end_date
-                except:
-                    pass
+            if file_info['min_date'] and (oldest_date is None or file_info['min_date'] < oldest_date):
+                oldest_date = file_info['min_date']
+            if file_info['max_date'] and (newest_date is None or file_info['max_date'] > newest_date):
+                newest_date = file_info['max_date']
         
         return {
             'total_files': total_files,
             'total_records': total_records,
             'total_size_mb': total_size / (1024 * 1024),
-            'oldest_date': oldest_date.strftime('%Y-%m-%d') if oldest_date else '정보 없음',
-            'newest_date': newest_date.strftime('%Y-%m-%d') if newest_date else '정보 없음',
+            'oldest_date': oldest_date or '정보 없음',
+            'newest_date': newest_date or '정보 없음',
             'files': files
         }
 
+def query_history(argv):
+    """이력 데이터베이스를 최신 파일로 갱신한 뒤 조회 결과를 출력합니다."""
+    import sys
+    import argparse
+    from result_store import ResultStore
+    
+    parser = argparse.ArgumentParser(prog="python file_manager.py query", description="RSI 이력 조회")
+    parser.add_argument('--ticker', help="종목코드 (예: 000660)")
+    parser.add_argument('--industry', help="산업군 앞부분 (예: 반도체)")
+    parser.add_argument('--period', help="기간: YYYY, YYYY-MM, YYYY-Qn (예: 2025-Q3)")
+    parser.add_argument('--start', help="시작일 YYYY-MM-DD")
+    parser.add_argument('--end', help="종료일 YYYY-MM-DD")
+    parser.add_argument('--rsi7-below', type=float)
+    parser.add_argument('--rsi7-above', type=float)
+    parser.add_argument('--rsi14-below', type=float)
+    parser.add_argument('--rsi14-above', type=float)
+    parser.add_argument('--limit', type=int, default=100, help="최대 행 수 (기본 100, 0이면 제한 없음)")
+    parser.add_argument('--csv', action='store_true', help="CSV 형식으로 출력")
+    args = parser.parse_args(argv)
+    
+    with HistoryDB() as db:
+        db.sync(store=ResultStore("results_store"))
+        try:
+            rows = db.query(
+                ticker=args.ticker, industry=args.industry, start=args.start, end=args.end,
+                period=args.period, rsi7_below=args.rsi7_below, rsi7_above=args.rsi7_above,
+                rsi14_below=args.rsi14_below, rsi14_above=args.rsi14_above, limit=args.limit or None
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+    
+    if args.csv:
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]) if rows else [], lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+        return
+    
+    print(f"\n🔎 {len(rows)}개 레코드:")
+    for row in rows:
+        rsi7 = '-' if row['RSI7'] is None else f"{row['RSI7']:.2f}"
+        rsi14 = '-' if row['RSI14'] is None else f"{row['RSI14']:.2f}"
+        print(f"  {row['Date']} {row['Ticker']} {row['Name']} ({row['Industry']}) RSI7: {rsi7}, RSI14: {rsi14}")
+
 def main():
     """메인 실행 함수"""
     import sys
@@ -248,10 +346,12 @@ def main():
         print("사용법:")
         print("  python file_manager.py list          - 파일 목록 조회")
         print("  python file_manager.py backup        - 현재 파일 백업")
+        print("  python file_manager.py restore [ID]  - 백업을 원래 파일로 복구 (기본: 표시 파일 최신 백업)")
         print("  python file_manager.py cleanup       - 오래된 파일 정리")
         print("  python file_manager.py sync          - 표시 파일 동기화")
         print("  python file_manager.py stats         - 통계 정보")
         print("  python file_manager.py fix [파일명]   - 파일명 수정")
+        print("  python file_manager.py query [옵션]   - 이력 조회 (--help로 옵션 확인)")
         return
     
     command = sys.argv[1]
@@ -269,10 +369,24 @@ def main():
     elif command == "backup":
         backup_file = manager.create_backup()
         if backup_file:
+            stats = manager.backup_store.stats()
             print(f"✅ 백업 생성: {backup_file}")
+            print(f"   백업 {stats['snapshots']}개, 원본 {stats['logical_bytes']:,}bytes -> 저장 {stats['stored_bytes']:,}bytes")
         else:
             print("❌ 백업 실패")
     
+    elif command == "restore":
+        if len(sys.argv) > 2:
+            snapshot_id = sys.argv[2]
+        else:
+            snapshots = manager.backup_store.list_snapshots(manager.display_filename)
+            snapshot_id = snapshots[0]['id'] if snapshots else None
+        
+        if snapshot_id and manager.restore_from_backup(snapshot_id):
+            print(f"✅ 복구 완료: {snapshot_id}")
+        else:
+            print("❌ 복구 실패")
+    
     elif command == "cleanup":
         removed = manager.cleanup_old_files()
         print(f"✅ {removed}개 파일 정리 완료")
@@ -293,6 +407,9 @@ def main():
         print(f"  가장 오래된 데이터: {stats['oldest_date']}")
         print(f"  가장 최신 데이터: {stats['newest_date']}")
     
+    elif command == "query":
+        query_history(sys.argv[2:])
+    
     elif command == "fix":
         if len(sys.argv) > 2:
             old_filename = sys.argv[2]
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+결과 CSV 파일 매니페스트(사이드카 인덱스)
+
+- 파일별 레코드 수, 날짜 범위, 크기, 수정 시각, 체크섬을 file_manifest.json에 보관
+- 파일을 쓸 때마다 record_write로 갱신하므로 목록/통계 조회는 파일 수에 비례하는 시간만 걸림
+- 크기나 수정 시각이 기록과 다르면(외부 도구로 수정, 복사 등) 해당 파일만 다시 읽어 항목을 재생성
+
+매니페스트 구조:
+    {
+        "results_코스피_200_2025_07.csv": {
+            "records": 420, "min_date": "2025-07-01", "max_date": "2025-07-21",
+            "size": 28512, "mtime_ns": 1753081351000000000, "checksum": "sha256:..."
+        }
+    }
+"""
+
+import os
+import csv
+import json
+import hashlib
+import threading
+import logging
+from datetime import datetime
+
+MANIFEST_FILENAME = "file_manifest.json"
+
+_lock = threading.Lock()
+
+
+def scan_csv(filename, content=None):
+    """
+    CSV 파일을 한 번 훑어 레코드 수, 날짜 범위, 체크섬을 구합니다. (pandas 사용 안 함)
+
+    Args:
+        filename: CSV 파일 경로
+        content: 이미 가진 파일 내용 (bytes). 있으면 파일을 다시 읽지 않음
+
+    Returns:
+        {'records', 'min_date', 'max_date', 'checksum'} 딕셔너리. 날짜 정보가 없으면 날짜는 None
+    """
+    if content is None:
+        with open(filename, 'rb') as f:
+            content = f.read()
+
+    records = 0
+    min_date = None
+    max_date = None
+
+    reader = csv.reader(content.decode('utf-8-sig').splitlines())
+    header = next(reader, None) or []
+    date_index = header.index('Date') if 'Date' in header else None
+
+    for row in reader:
+        if not row:
+            continue
+        records += 1
+        if date_index is None or date_index >= len(row):
+            continue
+
+        try:
+            value = datetime.strptime(row[date_index].strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+        if min_date is None or value < min_date:
+            min_date = value
+        if max_date is None or value > max_date:
+            max_date = value
+
+    return {
+        'records': records,
+        'min_date': min_date,
+        'max_date': max_date,
+        'checksum': f"sha256:{hashlib.sha256(content).hexdigest()}",
+    }
+
+
+class FileManifest:
+    def __init__(self, directory="."):
+        """
+        Args:
+            directory: 결과 파일과 매니페스트가 있는 디렉토리
+        """
+        self.directory = directory or "."
+        self.path = os.path.join(self.directory, MANIFEST_FILENAME)
+        self._entries = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """매니페스트를 읽어옵니다. 읽을 수 없으면 빈 상태에서 다시 만듭니다."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"파일 매니페스트 읽기 실패, 다시 만듭니다: {e}")
+            self._entries = {}
+            self._dirty = True
+
+    def save(self):
+        """변경된 내용이 있을 때만 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+        if not self._dirty:
+            return
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _key(self, filename):
+        return os.path.basename(filename)
+
+    def _file_path(self, key):
+        return os.path.join(self.directory, key)
+
+    def record(self, filename, content=None):
+        """파일을 (다시) 읽어 항목을 갱신합니다."""
+        path = self._file_path(self._key(filename))
+        stat = os.stat(path)
+        entry = scan_csv(path, content)
+        entry['size'] = stat.st_size
+        entry['mtime_ns'] = stat.st_mtime_ns
+        self._entries[self._key(filename)] = entry
+        self._dirty = True
+        return dict(entry)
+
+    def remove(self, filename):
+        """삭제된 파일의 항목을 지웁니다."""
+        if self._entries.pop(self._key(filename), None) is not None:
+            self._dirty = True
+
+    def rename(self, old_filename, new_filename):
+        """이름이 바뀐 파일의 항목을 옮깁니다."""
+        entry = self._entries.pop(self._key(old_filename), None)
+        if entry is not None:
+            self._entries[self._key(new_filename)] = entry
+            self._dirty = True
+
+    def get(self, filename, stat=None):
+        """
+        파일 항목을 반환합니다. 크기나 수정 시각이 기록과 다르면 파일을 다시 읽어 갱신합니다.
+
+        Args:
+            filename: 파일 경로
+            stat: 이미 구한 os.stat 결과 (없으면 새로 구함)
+        """
+        key = self._key(filename)
+        if stat is None:
+            stat = os.stat(self._file_path(key))
+
+        entry = self._entries.get(key)
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return dict(entry)
+
+        if entry:
+            logging.info(f"파일 매니페스트 불일치, 다시 읽습니다: {key}")
+        return self.record(key)
+
+    def entries(self, filenames):
+        """
+        여러 파일의 항목을 반환하고, 목록에 없는 (삭제된) 파일 항목은 정리합니다.
+
+        Returns:
+            {파일명: 항목} 딕셔너리
+        """
+        result = {}
+        for filename in filenames:
+            try:
+                result[filename] = self.get(filename)
+            except OSError as e:
+                logging.warning(f"파일 {filename} 정보 읽기 실패: {e}")
+
+        listed = {self._key(filename) for filename in filenames}
+        for key in [key for key in self._entries if key not in listed]:
+            if not os.path.exists(self._file_path(key)):
+                self.remove(key)
+
+        return result
+
+
+def record_write(filename, content=None):
+    """
+    파일을 쓴 직후 호출하여 같은 디렉토리의 매니페스트 항목을 갱신합니다.
+    실패해도 매니페스트는 다음 조회 때 다시 만들어지므로 경고만 남깁니다.
+
+    Args:
+        filename: 방금 쓴 파일 경로
+        content: 방금 쓴 내용 (bytes). 있으면 파일을 다시 읽지 않음
+    """
+    try:
+        with _lock:
+            manifest = FileManifest(os.path.dirname(filename))
+            manifest.record(filename, content)
+            manifest.save()
+    except Exception as e:
+        logging.warning(f"파일 매니페스트 갱신 실패: {filename} ({e})")
+
+
+def record_remove(filename, new_filename=None):
+    """파일을 삭제하거나(new_filename 없음) 이름을 바꾼 직후 매니페스트 항목을 정리합니다."""
+    try:
+        with _lock:
+            manifest = FileManifest(os.path.dirname(filename))
+            if new_filename is None:
+                manifest.remove(filename)
+            else:
+                manifest.rename(filename, new_filename)
+            manifest.save()
+    except Exception as e:
+        logging.warning(f"파일 매니페스트 갱신 실패: {filename} ({e})")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RSI 결과 이력 조회용 SQLite 인덱스
+
+- 날짜별 파티션과 월별 파일을 하나의 SQLite 데이터베이스(WAL 모드)로 모아 조회
+- (Ticker, Date) 기본 키와 (Industry, Date), (Date) 인덱스로 보관 개월 수와 무관하게 빠르게 조회
+- 파일별 크기/수정 시각을 기록해 두고 바뀐 파일만 다시 적재 (증분 적재)
+- 행마다 적재한 파일을 기록하여 다시 적재할 때 파일에서 사라진 행도 함께 삭제
+- 스케줄러는 오늘 파티션을 쓴 직후 해당 파일만 적재
+
+사용 예:
+    with HistoryDB() as db:
+        db.sync(store=ResultStore("results_store"))
+        rows = db.query(ticker="000660", start="2025-07-01", end="2025-09-30")
+        rows = db.query(industry="반도체", rsi14_below=30, start="2025-06-01", end="2025-06-30")
+"""
+
+import os
+import csv
+import glob
+import json
+import sqlite3
+import calendar
+import logging
+
+DB_FILENAME = "history.db"
+
+# CSV 열 -> 데이터베이스 열
+COLUMN_MAP = {
+    'Ticker': 'ticker', 'Name': 'name', 'Industry': 'industry', 'Date': 'date',
+    'RSI7': 'rsi7', 'RSI14': 'rsi14', 'Yesterday_RSI7': 'yesterday_rsi7', 'Yesterday_RSI14': 'yesterday_rsi14',
+}
+NUMERIC_COLUMNS = ('rsi7', 'rsi14', 'yesterday_rsi7', 'yesterday_rsi14')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    name TEXT,
+    industry TEXT,
+    rsi7 REAL,
+    rsi14 REAL,
+    yesterday_rsi7 REAL,
+    yesterday_rsi14 REAL,
+    extra TEXT,
+    source TEXT,
+    PRIMARY KEY (ticker, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_industry_date ON results (industry, date);
+CREATE INDEX IF NOT EXISTS idx_results_date ON results (date);
+CREATE INDEX IF NOT EXISTS idx_results_source ON results (source);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    records INTEGER
+);
+"""
+
+
+def period_range(period):
+    """
+    기간 문자열을 (시작일, 종료일)로 변환합니다.
+
+    Args:
+        period: 'YYYY', 'YYYY-MM' 또는 'YYYY-Qn' (예: '2025-Q3')
+
+    Returns:
+        ('YYYY-MM-DD', 'YYYY-MM-DD') 튜플
+    """
+    text = period.strip().upper()
+    try:
+        if len(text) == 4:
+            year = int(text)
+            return f"{year}-01-01", f"{year}-12-31"
+        year = int(text[:4])
+        if text[5] == 'Q':
+            quarter = int(text[6:])
+            if not 1 <= quarter <= 4:
+                raise ValueError
+            first, last = quarter * 3 - 2, quarter * 3
+        else:
+            first = last = int(text[5:7])
+            if not 1 <= first <= 12:
+                raise ValueError
+    except (ValueError, IndexError):
+        raise ValueError(f"기간 형식이 올바르지 않습니다: {period} (YYYY, YYYY-MM, YYYY-Qn)")
+
+    return f"{year}-{first:02d}-01", f"{year}-{last:02d}-{calendar.monthrange(year, last)[1]:02d}"
+
+
+def _to_number(value):
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class HistoryDB:
+    def __init__(self, path=DB_FILENAME):
+        """
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+        """
+        self.path = path
+        self._conn = None
+
+    @property
+    def conn(self):
+        """데이터베이스 연결 (처음 사용할 때 열고 스키마 생성)"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.row_factory = sqlite3.Row
+            # 스케줄러가 쓰는 동안에도 조회가 막히지 않도록 WAL 모드 사용
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate()
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _migrate(self):
+        """
+        행별 적재 파일(source) 열이 없는 이전 데이터베이스는 비웁니다.
+        결과 파일에서 언제든 다시 만들 수 있으므로 다음 sync에서 모두 다시 적재합니다.
+        """
+        columns = [row['name'] for row in self._conn.execute("PRAGMA table_info(results)")]
+        if columns and 'source' not in columns:
+            logging.info("이력 데이터베이스 형식이 바뀌어 다시 적재합니다.")
+            with self._conn:
+                self._conn.execute("DROP TABLE results")
+                self._conn.execute("DROP TABLE IF EXISTS sources")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _row_values(self, record):
+        """결과 딕셔너리를 results 테이블 행 값으로 변환합니다. 종목코드나 날짜가 없으면 None"""
+        ticker = str(record.get('Ticker') or '').strip()
+        if ticker.isdigit():
+            ticker = ticker.zfill(6)
+        date = str(record.get('Date') or '').strip()
+        if not ticker or not date:
+            return None
+
+        values = {column: record.get(key) for key, column in COLUMN_MAP.items()}
+        values['ticker'] = ticker
+        values['date'] = date
+        for column in NUMERIC_COLUMNS:
+            values[column] = _to_number(values[column])
+
+        extra = {key: value for key, value in record.items()
+                 if key not in COLUMN_MAP and key and value not in (None, '')}
+        values['extra'] = json.dumps(extra, ensure_ascii=False) if extra else None
+        return values
+
+    def _insert(self, records, source=None):
+        """레코드를 results 테이블에 넣습니다. (트랜잭션은 호출하는 쪽에서 관리)"""
+        rows = [values for values in map(self._row_values, records) if values is not None]
+        for values in rows:
+            values['source'] = source
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO results (ticker, date, name, industry, rsi7, rsi14, "
+            "yesterday_rsi7, yesterday_rsi14, extra, source) VALUES (:ticker, :date, :name, :industry, "
+            ":rsi7, :rsi14, :yesterday_rsi7, :yesterday_rsi14, :extra, :source)",
+            rows
+        )
+        return len(rows)
+
+    def upsert(self, records):
+        """
+        결과 레코드를 저장합니다. 같은 (종목코드, 날짜)는 새 값으로 교체합니다.
+
+        Returns:
+            저장한 레코드 수
+        """
+        with self.conn:
+            return self._insert(records)
+
+    def load_file(self, filename, force=False):
+        """
+        결과 CSV 파일 하나를 적재합니다. 지난 적재 이후 크기와 수정 시각이 같으면 건너뜁니다.
+        이 파일에서 적재했던 행은 같은 트랜잭션에서 지운 뒤 다시 넣으므로 파일에서 빠진 행은 남지 않습니다.
+
+        Returns:
+            적재한 레코드 수 (건너뛰면 0)
+        """
+        stat = os.stat(filename)
+        key = os.path.abspath(filename)
+        if not force:
+            source = self.conn.execute("SELECT size, mtime_ns FROM sources WHERE path = ?", (key,)).fetchone()
+            if source and source['size'] == stat.st_size and source['mtime_ns'] == stat.st_mtime_ns:
+                return 0
+
+        with open(filename, 'r', encoding='utf-8-sig', newline='') as f, self.conn:
+            self.conn.execute("DELETE FROM results WHERE source = ?", (key,))
+            records = self._insert(csv.DictReader(f), source=key)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (path, size, mtime_ns, records) VALUES (?, ?, ?, ?)",
+                (key, stat.st_size, stat.st_mtime_ns, records)
+            )
+        return records
+
+    def sync(self, store=None, pattern="results_코스피_200_*.csv"):
+        """
+        월별 파일과 날짜별 파티션 중 새로 생겼거나 바뀐 파일만 적재합니다.
+        월별 파일을 먼저, 파티션을 나중에 적재하여 같은 날짜는 파티션 값이 남습니다.
+
+        Args:
+            store: ResultStore (없으면 월별 파일만)
+            pattern: 월별 파일 패턴
+
+        Returns:
+            적재한 레코드 수
+        """
+        filenames = sorted(glob.glob(pattern))
+        if store is not None:
+            filenames += [store.partition_path(date) for date in sorted(store.dates())]
+
+        loaded = 0
+        files = 0
+        for filename in filenames:
+            try:
+                records = self.load_file(filename)
+            except (OSError, csv.Error) as e:
+                logging.warning(f"이력 데이터베이스 적재 실패: {filename} ({e})")
+                continue
+            if records:
+                loaded += records
+                files += 1
+
+        if files:
+            logging.info(f"이력 데이터베이스 적재: {files}개 파일, {loaded}개 레코드")
+        return loaded
+
+    def query(self, ticker=None, industry=None, start=None, end=None, period=None,
+              rsi7_below=None, rsi7_above=None, rsi14_below=None, rsi14_above=None, limit=None):
+        """
+        이력을 조회합니다. 조건은 모두 AND로 결합합니다.
+
+        Args:
+            ticker: 종목코드
+            industry: 산업군 (앞부분 일치, 예: '반도체'는 '반도체와반도체장비'도 포함)
+            start, end: 날짜 범위 (YYYY-MM-DD, 양 끝 포함)
+            period: 'YYYY', 'YYYY-MM', 'YYYY-Qn' (start/end 대신 사용)
+            rsi7_below, rsi7_above, rsi14_below, rsi14_above: RSI 값 조건 (미만/초과)
+            limit: 최대 행 수
+
+        Returns:
+            결과 딕셔너리 리스트 (CSV와 같은 열 이름, 날짜 내림차순, 종목코드 오름차순)
+        """
+        if period:
+            start, end = period_range(period)
+
+        conditions = []
+        params = []
+        if ticker:
+            ticker = str(ticker).strip()
+            conditions.append("ticker = ?")
+            params.append(ticker.zfill(6) if ticker.isdigit() else ticker)
+        if industry:
+            # 앞부분 일치를 범위 조건으로 표현하여 (industry, date) 인덱스를 그대로 사용
+            conditions.append("industry >= ? AND industry < ?")
+            params.extend([industry, industry + '\U0010ffff'])
+        if start:
+            conditions.append("date >= ?")
+            params.append(start)
+        if end:
+            conditions.append("date <= ?")
+            params.append(end)
+        for column, operator, value in (('rsi7', '<', rsi7_below), ('rsi7', '>', rsi7_above),
+                                        ('rsi14', '<', rsi14_below), ('rsi14', '>', rsi14_above)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(float(value))
+
+        sql = "SELECT * FROM results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY date DESC, ticker ASC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        columns = {column: key for key, column in COLUMN_MAP.items()}
+        results = []
+        for row in self.conn.execute(sql, params):
+            record = {columns[name]: row[name] for name in columns}
+            if row['extra']:
+                record.update(json.loads(row['extra']))
+            results.append(record)
+        return results
+
+    def stats(self):
+        """저장된 레코드 수, 종목 수, 날짜 범위"""
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS records, COUNT(DISTINCT ticker) AS tickers, "
+            "MIN(date) AS min_date, MAX(date) AS max_date FROM results"
+        ).fetchone()
+        return dict(row)
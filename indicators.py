@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여러 보조지표를 공통 중간값으로 한 번에 계산하는 파이프라인
+
+- 종목 × 일자 가격 행렬 하나에서 변화량, 누적합(구간 합), 지수이동평균(EMA)을 한 번만 계산하고
+  RSI, MACD, 볼린저 밴드, 스토캐스틱을 모두 그 중간값에서 유도
+- 같은 구간 합/EMA는 지표끼리 공유하므로 (예: 볼린저 중심선과 스토캐스틱 %D의 구간 평균)
+  지표를 추가해도 가격 데이터를 다시 훑지 않음
+- 결과는 결과 CSV에 추가할 열 이름 기준으로 반환
+
+사용 예:
+    pipeline = IndicatorPipeline(closes, highs, lows)    # (종목 수, 일수), 과거 → 현재
+    columns = pipeline.compute(['macd', 'bollinger'])    # {'MACD': (종목 수,), 'BB_Upper': ...}
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from rsi_engine import as_price_matrix, rsi_from_averages
+
+# 지표 이름 -> 결과 열 이름
+INDICATOR_COLUMNS = {
+    'rsi': ['RSI7', 'RSI14'],
+    'macd': ['MACD', 'MACD_Signal', 'MACD_Hist'],
+    'bollinger': ['BB_Middle', 'BB_Upper', 'BB_Lower', 'BB_PctB'],
+    'stochastic': ['Stoch_K', 'Stoch_D'],
+}
+
+# 지표별 마지막 값을 계산하는 데 필요한 최소 일수
+MIN_HISTORY = {'rsi': 15, 'macd': 35, 'bollinger': 20, 'stochastic': 16}
+
+
+def required_history(names):
+    """지표 목록을 계산하는 데 필요한 최소 일수를 반환합니다."""
+    return max((MIN_HISTORY[name] for name in names), default=0)
+
+
+class IndicatorPipeline:
+    def __init__(self, closes, highs=None, lows=None):
+        """
+        Args:
+            closes: (종목 수, 일수) 종가 배열 (결측은 NaN)
+            highs, lows: 같은 형태의 고가/저가 배열 (없으면 종가로 대신)
+        """
+        self.closes = as_price_matrix(closes)
+        self.highs = self.closes if highs is None else as_price_matrix(highs)
+        self.lows = self.closes if lows is None else as_price_matrix(lows)
+        self._cache = {}
+
+    def _memo(self, key, build):
+        """중간값을 한 번만 계산하여 공유합니다."""
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    # --- 공통 중간값 ---
+
+    def series(self, name):
+        """이름으로 기본 시계열을 반환합니다. ('close', 'close_sq', 'gain', 'loss', 'stoch_k', 'macd_12_26' 등)"""
+        if name == 'close':
+            return self.closes
+        if name == 'close_sq':
+            return self._memo('close_sq', lambda: self.closes ** 2)
+        if name in ('gain', 'loss'):
+            return self.deltas()[0 if name == 'gain' else 1]
+        if name == 'stoch_k':
+            return self.stochastic_k()
+        if name.startswith('macd_'):
+            fast, slow = (int(value) for value in name.split('_')[1:])
+            return self.macd_line(fast, slow)
+        raise KeyError(name)
+
+    def deltas(self):
+        """
+        가격 열에 맞춘 상승폭/하락폭 (첫 날과 앞뒤 가격이 없는 날은 NaN)
+
+        Returns:
+            (gains, losses) 튜플, 모두 (종목 수, 일수)
+        """
+        def build():
+            deltas = np.full(self.closes.shape, np.nan)
+            deltas[:, 1:] = np.diff(self.closes, axis=1)
+            return np.where(deltas > 0, deltas, np.where(np.isnan(deltas), np.nan, 0.0)), \
+                np.where(deltas < 0, -deltas, np.where(np.isnan(deltas), np.nan, 0.0))
+        return self._memo('deltas', build)
+
+    def first_valid(self):
+        """종목별 첫 유효 가격의 열 위치 (상장일이 달라 앞부분이 비어 있는 종목 대응, 가격이 없으면 일수)"""
+        def build():
+            valid = ~np.isnan(self.closes)
+            return np.where(valid.any(axis=1), np.argmax(valid, axis=1), self.closes.shape[1])
+        return self._memo('first_valid', build)
+
+    def _warm_up(self, values, days):
+        """종목별 첫 유효 가격부터 days일이 지나기 전 값을 NaN으로 바꿉니다."""
+        start = self.first_valid() + days
+        values[np.arange(values.shape[1]) < start[:, None]] = np.nan
+        return values
+
+    def _cumsum(self, name):
+        """시계열의 누적합과 유효 값 누적 개수 (구간 합 계산용, 앞에 0 열 추가)"""
+        def build():
+            values = self.series(name)
+            valid = ~np.isnan(values)
+            zeros = np.zeros((values.shape[0], 1))
+            total = np.concatenate([zeros, np.cumsum(np.where(valid, values, 0.0), axis=1)], axis=1)
+            count = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+            return total, count
+        return self._memo(('cumsum', name), build)
+
+    def rolling_mean(self, name, window):
+        """
+        최근 window일 단순 평균. 구간 안에 결측이 있으면 NaN
+
+        누적합의 차이로 계산하므로 구간 길이와 무관하게 O(일수)입니다.
+        """
+        def build():
+            total, count = self._cumsum(name)
+            result = np.full(self.closes.shape, np.nan)
+            if self.closes.shape[1] >= window:
+                window_sum = total[:, window:] - total[:, :-window]
+                window_count = count[:, window:] - count[:, :-window]
+                result[:, window - 1:] = np.where(window_count == window, window_sum / window, np.nan)
+            return result
+        return self._memo(('mean', name, window), build)
+
+    def rolling_extreme(self, name, window, func):
+        """최근 window일 최고가(np.max)/최저가(np.min). 구간 안에 결측이 있으면 NaN"""
+        def build():
+            values = self.highs if name == 'high' else self.lows
+            result = np.full(values.shape, np.nan)
+            if values.shape[1] >= window:
+                result[:, window - 1:] = func(sliding_window_view(values, window, axis=1), axis=-1)
+            return result
+        return self._memo(('extreme', name, window, func.__name__), build)
+
+    def ema(self, name, span):
+        """
+        series(name)의 지수이동평균 (첫 유효 값에서 시작, 결측일은 직전 값 유지)
+
+        일수만큼 반복하지만 각 반복은 전 종목을 한 번에 처리합니다.
+        """
+        def build():
+            values = self.series(name)
+            alpha = 2.0 / (span + 1)
+            result = np.full(values.shape, np.nan)
+            state = np.full(values.shape[0], np.nan)
+            for day in range(values.shape[1]):
+                x = values[:, day]
+                state = np.where(np.isnan(state), x, np.where(np.isnan(x), state, state + alpha * (x - state)))
+                result[:, day] = state
+            return result
+        return self._memo(('ema', name, span), build)
+
+    # --- 지표 ---
+
+    def rsi(self, period):
+        """단순 평균 RSI (rsi_engine.calculate_rsi_batch 기본 방식과 같음)"""
+        return self._memo(('rsi', period), lambda: rsi_from_averages(
+            self.rolling_mean('gain', period), self.rolling_mean('loss', period)
+        ))
+
+    def macd(self, fast=12, slow=26, signal=9):
+        """
+        MACD (빠른 EMA - 느린 EMA), 시그널(MACD의 EMA), 히스토그램
+
+        Returns:
+            (macd, signal, hist) 튜플
+        """
+        def build():
+            line = self.macd_line(fast, slow)
+            signal_line = self._warm_up(self.ema(f"macd_{fast}_{slow}", signal).copy(), slow + signal - 2)
+            return line, signal_line, line - signal_line
+        return self._memo(('macd', fast, slow, signal), build)
+
+    def macd_line(self, fast=12, slow=26):
+        """MACD 선 (빠른 EMA - 느린 EMA). 종목별로 느린 EMA가 자리 잡기 전 값은 버림"""
+        return self._memo(('macd_line', fast, slow), lambda: self._warm_up(
+            self.ema('close', fast) - self.ema('close', slow), slow - 1
+        ))
+
+    def bollinger(self, window=20, k=2.0):
+        """
+        볼린저 밴드 (중심선 = 구간 평균, 폭 = k × 모표준편차)
+
+        Returns:
+            (middle, upper, lower, %b) 튜플
+        """
+        def build():
+            mean = self.rolling_mean('close', window)
+            mean_sq = self.rolling_mean('close_sq', window)
+            std = np.sqrt(np.maximum(mean_sq - mean ** 2, 0.0))
+            upper = mean + k * std
+            lower = mean - k * std
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pct_b = np.where(upper > lower, (self.closes - lower) / (upper - lower), 0.5)
+            pct_b = np.where(np.isnan(mean), np.nan, pct_b)
+            return mean, upper, lower, pct_b
+        return self._memo(('bollinger', window, k), build)
+
+    def stochastic_k(self, window=14):
+        """스토캐스틱 %K (최근 window일 최고/최저 대비 종가 위치, 0~100)"""
+        def build():
+            highest = self.rolling_extreme('high', window, np.max)
+            lowest = self.rolling_extreme('low', window, np.min)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                k = np.where(highest > lowest, (self.closes - lowest) / (highest - lowest) * 100, 50.0)
+            return np.where(np.isnan(highest) | np.isnan(lowest), np.nan, k)
+        return self._memo(('stoch_k', window), build)
+
+    def stochastic(self, window=14, smooth=3):
+        """
+        스토캐스틱 %K와 %D(%K의 smooth일 평균)
+
+        Returns:
+            (k, d) 튜플
+        """
+        return self.stochastic_k(window), self.rolling_mean('stoch_k', smooth)
+
+    def compute(self, names, last_n=1):
+        """
+        지표들을 계산하여 결과 열 이름별 배열로 반환합니다.
+
+        Args:
+            names: 지표 이름 목록 ('rsi', 'macd', 'bollinger', 'stochastic')
+            last_n: 반환할 최근 일수 (1이면 (종목 수,) 배열, None이면 전체 기간)
+
+        Returns:
+            {열 이름: 배열} (소수점 둘째 자리까지, 계산할 수 없으면 NaN)
+        """
+        unknown = [name for name in names if name not in INDICATOR_COLUMNS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 지표입니다: {', '.join(unknown)} (가능: {', '.join(INDICATOR_COLUMNS)})")
+
+        arrays = {}
+        for name in names:
+            if name == 'rsi':
+                values = (self.rsi(7), self.rsi(14))
+            elif name == 'macd':
+                values = self.macd()
+            elif name == 'bollinger':
+                values = self.bollinger()
+            else:
+                values = self.stochastic()
+            arrays.update(zip(INDICATOR_COLUMNS[name], values))
+
+        results = {}
+        for column, values in arrays.items():
+            if column == 'BB_PctB':
+                values = np.round(values, 4)
+            else:
+                values = np.round(values, 2)
+            if last_n == 1:
+                results[column] = values[:, -1]
+            elif last_n is None:
+                results[column] = values
+            else:
+                results[column] = values[:, -last_n:]
+        return results
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+장중 실시간 RSI 감시 모드
+
+- N초마다 전 종목 현재가를 일괄 조회(get_bulk_quotes와 같은 API)하여 오늘의 미완성 봉으로 RSI를 계산
+- 가격 이력을 다시 받지 않고 RSI 증분 상태(rsi_state)의 직전 거래일 Wilder 평균에 현재가 하나만 반영
+  (rsi_state.preview와 같은 계산을 전 종목 배열로 한 번에 수행하며 상태는 바꾸지 않음)
+- 선별 규칙 마스크를 전 종목에 한 번에 적용하고, 맞은 규칙이 바뀐 종목만 이벤트로 내보냄
+- 주기마다 지연 예산(budget)을 두어 예산 안에 받지 못하거나 오류가 난 묶음은 이번 주기에서 제외 (이전 상태 유지)
+- 예산을 넘겨 아직 실행 중인 묶음은 끝날 때까지 다시 요청하지 않아 호스트별 동시 요청 수(per_host_limit)를 넘지 않음
+
+사용 예:
+    monitor = IntradayMonitor(collector, interval=30)
+    monitor.run()                       # 장 마감(15:30)까지 실행
+    events = monitor.poll_once()        # 한 주기만 실행
+"""
+
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+import numpy as np
+
+from rsi_engine import wilder_step
+from market_calendar import session_date
+
+SIGNALS_FILENAME = "intraday_signals.jsonl"
+MARKET_CLOSE = "15:30"
+
+
+class IntradayMonitor:
+    def __init__(self, collector, interval=60, budget=None, batch_size=None,
+                 output_path=SIGNALS_FILENAME, on_change=None):
+        """
+        Args:
+            collector: NaverStockDataCollector (rsi_state를 사용하도록 생성된 것)
+            interval: 조회 주기 (초)
+            budget: 주기당 지연 예산 (초, None이면 주기의 80%)
+            batch_size: 현재가 일괄 조회 요청당 종목 수 (None이면 수집기 설정)
+            output_path: 상태 변경 이벤트를 한 줄씩 추가할 JSONL 파일 (None이면 기록 안 함)
+            on_change: 이벤트 리스트를 받는 함수 (주기마다 변경이 있을 때 호출)
+        """
+        if collector.rsi_state is None:
+            raise ValueError("장중 감시에는 RSI 증분 상태(state_path)가 필요합니다")
+
+        self.collector = collector
+        self.interval = float(interval)
+        self.budget = float(budget) if budget is not None else self.interval * 0.8
+        self.batch_size = batch_size or collector.bulk_batch_size or 100
+        self.output_path = output_path
+        self.on_change = on_change
+        self.stocks = []
+        self._base = {}     # 직전 거래일 상태 배열 {'close': (종목 수,), 기간: (avg_gain, avg_loss, rsi)}
+        self._status = None  # 종목별로 맞은 규칙 (종목 수, 규칙 수) 불리언 배열
+        self._executor = None
+        self._in_flight = {}  # 예산을 넘겨 아직 실행 중인 묶음 {묶음 번호: future}
+        self.cycles = 0
+        self.late_cycles = 0
+
+    def prime(self, stocks=None):
+        """
+        감시할 종목을 정하고, RSI 상태가 없거나 오래된 종목은 가격 이력으로 상태를 초기화합니다.
+
+        Returns:
+            감시 가능한 종목 수
+        """
+        stocks = stocks if stocks is not None else self.collector.get_kospi200_list()
+        today = session_date()
+        state = self.collector.rsi_state
+
+        ready = []
+        bases = []
+        for stock_info in stocks:
+            ticker = stock_info['ticker']
+            if not state.is_usable(ticker, today):
+                # 이력을 받아 상태를 초기화 (수집기의 일일 수집과 같은 경로)
+                self.collector.get_stock_rsi_data(stock_info)
+            base = state.base_snapshot(ticker, today)
+            if base is not None:
+                ready.append(stock_info)
+                bases.append(base)
+            else:
+                logging.warning(f"종목 {ticker}: RSI 상태를 만들 수 없어 장중 감시에서 제외")
+
+        state.save()
+        self.stocks = ready
+        # 장중에는 기준 상태가 바뀌지 않으므로 배열로 한 번만 만들어 둠
+        self._base = {'close': np.array([base['close'] for base in bases], dtype=float)}
+        for period in state.periods:
+            self._base[period] = tuple(
+                np.array([base['periods'][str(period)][key] for base in bases], dtype=float)
+                for key in ('avg_gain', 'avg_loss', 'rsi')
+            )
+        self._status = np.zeros((len(ready), len(self.collector.screen.names)), dtype=bool)
+        logging.info(f"장중 감시 준비: {len(ready)}/{len(stocks)}개 종목")
+        return len(ready)
+
+    def _fetch_quotes(self, deadline):
+        """
+        현재가를 묶음별로 동시에 조회하고 deadline까지 도착한 묶음만 사용합니다.
+        조회 중 예외가 난 묶음도 늦은 묶음처럼 이번 주기에서 제외합니다.
+        이전 주기에서 늦어 아직 실행 중인 묶음은 다시 요청하지 않고 제외합니다.
+        (이미 시작된 요청은 취소할 수 없어 다시 요청하면 작업자가 쌓임)
+
+        Returns:
+            ({종목코드: 현재가}, 예산 초과나 오류로 제외된 묶음 수)
+        """
+        tickers = [stock['ticker'] for stock in self.stocks]
+        batches = [tickers[i:i + self.batch_size] for i in range(0, len(tickers), self.batch_size)]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, self.collector.per_host_limit))
+
+        self._in_flight = {index: future for index, future in self._in_flight.items() if not future.done()}
+        futures = {
+            index: self._executor.submit(self.collector._fetch_bulk_quote_batch, batch)
+            for index, batch in enumerate(batches) if index not in self._in_flight
+        }
+        skipped = len(batches) - len(futures)
+        done, pending = wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+        for index, future in futures.items():
+            # 대기열에서 시작하지 못한 요청은 취소하고, 이미 실행 중인 요청은 끝날 때까지 기억
+            if future in pending and not future.cancel():
+                self._in_flight[index] = future
+
+        quotes = {}
+        dropped = len(pending) + skipped
+        for future in done:
+            try:
+                quotes.update(future.result())
+            except Exception as e:
+                dropped += 1
+                logging.warning(f"장중 현재가 조회 오류, 묶음 제외: {e}")
+        return quotes, dropped
+
+    def poll_once(self):
+        """
+        한 주기를 실행합니다.
+
+        Returns:
+            상태가 바뀐 종목의 이벤트 리스트
+            [{'time', 'ticker', 'name', 'price', 'RSI7', 'RSI14', 'matched', 'rules', 'previous'}, ...]
+            (RSI 열은 rsi_state.periods의 기간마다 하나씩)
+        """
+        start = time.monotonic()
+        now = datetime.now()
+
+        quotes, dropped = self._fetch_quotes(start + self.budget)
+
+        prices = np.array([quotes.get(stock['ticker'], np.nan) for stock in self.stocks], dtype=float)
+        columns = self.columns(prices)
+
+        # 이번 주기에 시세를 받은 종목만 상태를 비교 (못 받은 종목은 이전 상태 유지)
+        screen = self.collector.screen
+        masks = screen.masks(columns)
+        table = np.column_stack([masks[name] for name in screen.names]) if len(prices) else self._status
+        changed = np.flatnonzero(~np.isnan(prices) & (table != self._status).any(axis=1))
+
+        events = []
+        timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
+        rsi_columns = [f"RSI{period}" for period in self.collector.rsi_state.periods]
+        for row in changed:
+            stock_info = self.stocks[row]
+            events.append({
+                'time': timestamp,
+                'ticker': stock_info['ticker'],
+                'name': stock_info['name'],
+                'price': float(prices[row]),
+                **{name: float(columns[name][row]) for name in rsi_columns},
+                'matched': bool(table[row].any()),
+                'rules': [name for name, hit in zip(screen.names, table[row]) if hit],
+                'previous': [name for name, hit in zip(screen.names, self._status[row]) if hit],
+            })
+            self._status[row] = table[row]
+
+        if events:
+            self._emit(events)
+
+        elapsed = time.monotonic() - start
+        self.cycles += 1
+        if dropped or elapsed > self.budget:
+            self.late_cycles += 1
+            logging.warning(f"장중 감시 지연: {elapsed:.2f}s (예산 {self.budget:.2f}s), 제외된 묶음 {dropped}개")
+        logging.info(f"장중 감시: 시세 {len(quotes)}/{len(self.stocks)}개, 상태 변경 {len(events)}개, {elapsed * 1000:.0f}ms")
+        return events
+
+    def columns(self, prices):
+        """
+        현재가 배열로 선별 규칙에 넣을 열 배열을 만듭니다. (현재가가 NaN인 종목은 RSI도 NaN)
+
+        Returns:
+            {'Price', 'RSI7', 'RSI14', 'Yesterday_RSI7', 'Yesterday_RSI14', ...: (종목 수,) 배열}
+        """
+        columns = {'Price': prices}
+        for period in self.collector.rsi_state.periods:
+            avg_gain, avg_loss, yesterday = self._base[period]
+            columns[f"RSI{period}"], _, _ = wilder_step(avg_gain, avg_loss, self._base['close'], prices, period)
+            columns[f"Yesterday_RSI{period}"] = yesterday
+
+        # 장중에 없는 열(보조지표 등)을 쓰는 규칙은 항상 거짓
+        for name in self.collector.screen.columns - set(columns):
+            columns[name] = np.full(len(prices), np.nan)
+        return columns
+
+    def _emit(self, events):
+        """상태 변경 이벤트를 로그, JSONL 파일, 콜백으로 내보냅니다."""
+        rsi_columns = [f"RSI{period}" for period in self.collector.rsi_state.periods]
+        for event in events:
+            rsi = ', '.join(f"{name} {event[name]}" for name in rsi_columns)
+            if event['matched']:
+                logging.info(f"조건 진입: {event['name']} ({event['ticker']}) {rsi}, 규칙: {', '.join(event['rules'])}")
+            else:
+                logging.info(f"조건 이탈: {event['name']} ({event['ticker']}) {rsi}")
+
+        if self.output_path:
+            try:
+                with open(self.output_path, 'a', encoding='utf-8') as f:
+                    for event in events:
+                        f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            except OSError as e:
+                logging.error(f"장중 이벤트 기록 실패: {e}")
+
+        if self.on_change is not None:
+            self.on_change(events)
+
+    def run(self, until=MARKET_CLOSE, max_cycles=None):
+        """
+        종료 시각이나 최대 주기 수에 도달할 때까지 주기적으로 감시합니다.
+
+        Args:
+            until: 'HH:MM' 종료 시각 (None이면 시각 제한 없음)
+            max_cycles: 최대 주기 수 (None이면 제한 없음)
+        """
+        if not self.stocks:
+            self.prime()
+
+        try:
+            while max_cycles is None or self.cycles < max_cycles:
+                if until and datetime.now().strftime('%H:%M') >= until:
+                    logging.info(f"장중 감시 종료 시각 도달 ({until})")
+                    break
+                start = time.monotonic()
+                self.poll_once()
+                time.sleep(max(0.0, self.interval - (time.monotonic() - start)))
+        finally:
+            self.close()
+
+        logging.info(f"장중 감시 종료: {self.cycles}회 조회, 예산 초과 {self.late_cycles}회")
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._in_flight = {}
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+한국거래소 거래일 달력
+
+- 주말과 양력 고정 휴장일은 기본으로 휴장일로 처리
+- 설날/추석 연휴, 대체공휴일, 임시 휴장일처럼 해마다 바뀌는 휴장일은 market_holidays.txt에 한 줄씩 추가
+  (YYYY-MM-DD, '#' 뒤는 주석)
+- 시세 날짜는 달력 날짜가 아니라 거래일(세션) 기준: 주말/휴장일이나 장 시작 전에 받은 시세는 직전 거래일 것
+
+사용 예:
+    session_date()                  # '2025-07-18' (토요일에 실행하면 금요일)
+    previous_trading_day('2025-07-21')  # '2025-07-18'
+"""
+
+import os
+import logging
+from datetime import date, datetime, time, timedelta
+
+HOLIDAYS_FILENAME = "market_holidays.txt"
+MARKET_OPEN = time(9, 0)
+MARKET_CLOSE = time(15, 30)
+
+# 양력 고정 휴장일 (신정, 삼일절, 어린이날, 현충일, 광복절, 개천절, 한글날, 성탄절, 연말 휴장일)
+FIXED_HOLIDAYS = ('01-01', '03-01', '05-05', '06-06', '08-15', '10-03', '10-09', '12-25', '12-31')
+
+_holidays = None
+
+
+def _to_date(day):
+    if isinstance(day, datetime):
+        return day.date()
+    if isinstance(day, date):
+        return day
+    return datetime.strptime(day, '%Y-%m-%d').date()
+
+
+def load_holidays(path=HOLIDAYS_FILENAME):
+    """휴장일 파일을 읽어 추가 휴장일 집합을 반환합니다. 파일이 없으면 빈 집합"""
+    holidays = set()
+    if not os.path.exists(path):
+        return holidays
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    holidays.add(_to_date(line))
+    except (OSError, ValueError) as e:
+        logging.warning(f"휴장일 파일 읽기 실패: {path} ({e})")
+    return holidays
+
+
+def set_holidays(days):
+    """추가 휴장일을 지정합니다. (None이면 다음 조회 때 휴장일 파일을 다시 읽음)"""
+    global _holidays
+    _holidays = None if days is None else {_to_date(day) for day in days}
+
+
+def is_trading_day(day):
+    """거래일인지 확인합니다. (date, datetime 또는 'YYYY-MM-DD')"""
+    global _holidays
+    day = _to_date(day)
+    if day.weekday() >= 5 or day.strftime('%m-%d') in FIXED_HOLIDAYS:
+        return False
+    if _holidays is None:
+        _holidays = load_holidays()
+    return day not in _holidays
+
+
+def previous_trading_day(day):
+    """day 직전 거래일을 'YYYY-MM-DD'로 반환합니다."""
+    day = _to_date(day) - timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day.strftime('%Y-%m-%d')
+
+
+def current_time():
+    """현재 시각 (거래일 판단에 쓰는 시계)"""
+    return datetime.now()
+
+
+def session_date(now=None):
+    """
+    now에 받은 시세가 속하는 거래일을 'YYYY-MM-DD'로 반환합니다.
+
+    거래일 장 시작 이후면 오늘, 장 시작 전이거나 휴장일이면 직전 거래일입니다.
+    """
+    now = now or current_time()
+    if is_trading_day(now) and now.time() >= MARKET_OPEN:
+        return now.strftime('%Y-%m-%d')
+    return previous_trading_day(now)
+
+
+def session_close(day):
+    """거래일 day의 장 마감 시각(datetime)을 반환합니다."""
+    return datetime.combine(_to_date(day), MARKET_CLOSE)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 파이프라인 단계별 소요 시간/횟수 계측
+
+- 엔드포인트(polling/fchart/html/bulk)별 응답 시간, 응답 파싱, RSI 계산, CSV 쓰기 시간을 히스토그램으로 기록
+- 다음 수집 방법으로 넘어간 횟수(fallback), 다시 받은 횟수(retry) 등은 카운터로 기록
+- 실행마다 JSON 요약(metrics/run_YYYYmmdd_HHMMSS.json)과 Prometheus 텍스트 형식(metrics/metrics.prom)으로 내보냄
+- 계측을 끄면 NULL_METRICS를 사용하며 모든 호출이 아무 일도 하지 않음 (타이머는 미리 만든 객체 재사용)
+
+사용 예:
+    metrics = Metrics()
+    with metrics.timer('endpoint_seconds', endpoint='fchart'):
+        ...
+    metrics.count('fallbacks_total', endpoint='polling')
+    metrics.export("metrics")
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+
+METRICS_DIR = "metrics"
+PROMETHEUS_FILENAME = "metrics.prom"
+PREFIX = "kospi200_"
+
+# 히스토그램 구간 상한 (초)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _label_text(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+
+
+class _Histogram:
+    __slots__ = ('counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """구간 상한 기준 근사 분위수 (마지막 구간은 최댓값)"""
+        target = q * self.count
+        total = 0
+        for index, count in enumerate(self.counts):
+            total += count
+            if total >= target and count:
+                return BUCKETS[index] if index < len(BUCKETS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': self.min,
+            'max': self.max,
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+        }
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'started')
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Metrics:
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """새 실행을 시작합니다. (기록을 비우고 실행 ID를 새로 정함)"""
+        with self._lock:
+            self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.started = time.time()
+            self._histograms = {}
+            self._counters = {}
+
+    def observe(self, name, seconds, **labels):
+        """소요 시간(초) 하나를 히스토그램에 기록합니다."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name, **labels):
+        """with 블록의 소요 시간을 기록하는 컨텍스트 관리자"""
+        return _Timer(self, name, labels)
+
+    def count(self, name, value=1, **labels):
+        """카운터를 value만큼 늘립니다."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def summary(self):
+        """
+        실행 요약을 딕셔너리로 반환합니다.
+
+        Returns:
+            {'run_id', 'started', 'duration', 'histograms': {이름: [{'labels', 'count', 'sum', ...}]},
+             'counters': {이름: [{'labels', 'value'}]}}
+        """
+        with self._lock:
+            histograms = {}
+            for (name, key), histogram in sorted(self._histograms.items()):
+                histograms.setdefault(name, []).append(dict(labels=dict(key), **histogram.summary()))
+            counters = {}
+            for (name, key), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({'labels': dict(key), 'value': value})
+
+        return {
+            'run_id': self.run_id,
+            'started': datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S'),
+            'duration': round(time.time() - self.started, 3),
+            'histograms': histograms,
+            'counters': counters,
+        }
+
+    def prometheus(self):
+        """Prometheus 텍스트 형식으로 반환합니다. (node_exporter textfile 수집기용)"""
+        lines = []
+        with self._lock:
+            names = sorted({name for name, _ in self._histograms})
+            for name in names:
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for (hname, key), histogram in sorted(self._histograms.items()):
+                    if hname != name:
+                        continue
+                    total = 0
+                    for bound, count in zip(BUCKETS + ('+Inf',), histogram.counts):
+                        total += count
+                        lines.append(f"{PREFIX}{name}_bucket{_label_text(key, [('le', bound)])} {total}")
+                    lines.append(f"{PREFIX}{name}_sum{_label_text(key)} {histogram.sum:.6f}")
+                    lines.append(f"{PREFIX}{name}_count{_label_text(key)} {histogram.count}")
+
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                for (cname, key), value in sorted(self._counters.items()):
+                    if cname == name:
+                        lines.append(f"{PREFIX}{name}{_label_text(key)} {value}")
+
+        lines.append(f"# TYPE {PREFIX}last_run_timestamp_seconds gauge")
+        lines.append(f"{PREFIX}last_run_timestamp_seconds {self.started:.0f}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, directory=METRICS_DIR):
+        """
+        실행 요약 JSON과 Prometheus 텍스트 파일을 씁니다. (같은 실행은 같은 JSON 파일을 덮어씀)
+
+        Returns:
+            JSON 파일 경로
+        """
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"run_{self.run_id}.json")
+        for path, text in ((json_path, json.dumps(self.summary(), ensure_ascii=False, indent=2)),
+                           (os.path.join(directory, PROMETHEUS_FILENAME), self.prometheus())):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return json_path
+
+
+class _NullMetrics:
+    """계측을 끈 경우 사용하는 객체 (모든 호출이 아무 일도 하지 않음)"""
+    enabled = False
+    _timer = nullcontext()
+
+    def reset(self):
+        pass
+
+    def observe(self, name, seconds, **labels):
+        pass
+
+    def timer(self, name, **labels):
+        return self._timer
+
+    def count(self, name, value=1, **labels):
+        pass
+
+    def export(self, directory=METRICS_DIR):
+        return None
+
+
+NULL_METRICS = _NullMetrics()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목별 일봉(OHLCV) 로컬 캐시
+
+- 종목마다 price_cache/{종목코드}.npy 파일 하나에 일봉을 구조화 배열로 저장
+- 읽을 때는 메모리 매핑(mmap)으로 필요한 열만 사용
+- 차트 API에는 마지막 캐시 날짜 이후의 일수만 요청하고 나머지는 캐시에서 제공
+- 마지막 거래일 장 마감 이후에 갱신된 캐시는 네트워크 요청 없이 그대로 사용
+  (장중이나 장 마감 전에 받은 일봉은 종가가 확정되지 않았으므로 다시 요청)
+"""
+
+import os
+import threading
+import logging
+from datetime import datetime
+
+import numpy as np
+
+from market_calendar import current_time, session_date, session_close
+
+# 종목별로 보관하는 기본 일봉 수 (약 2년)
+DEFAULT_MAX_BARS = 500
+
+# 날짜는 YYYYMMDD 정수로 저장
+BAR_DTYPE = np.dtype([
+    ('date', 'i4'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'i8'),
+])
+
+
+def int_to_date(value):
+    """YYYYMMDD 정수를 'YYYY-MM-DD' 문자열로 변환합니다."""
+    value = int(value)
+    return f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+
+class PriceCache:
+    def __init__(self, cache_dir="price_cache", max_bars=DEFAULT_MAX_BARS):
+        """
+        Args:
+            cache_dir: 캐시 파일을 저장할 디렉토리
+            max_bars: 종목별로 보관할 최대 일봉 수 (None이면 제한 없음).
+                      이미 이보다 길게 받아둔(백필한) 이력은 줄이지 않고 그 길이를 유지
+        """
+        self.cache_dir = cache_dir
+        self.max_bars = max_bars
+        self.hits = 0        # 네트워크 요청 없이 캐시로 처리
+        self.partial = 0     # 마지막 캐시 날짜 이후만 요청
+        self.misses = 0      # 전체 기간 요청
+        self._lock = threading.Lock()
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def _path(self, ticker):
+        return os.path.join(self.cache_dir, f"{ticker}.npy")
+
+    def load(self, ticker, mmap=True):
+        """
+        종목의 캐시된 일봉을 반환합니다. (날짜 오름차순)
+
+        Returns:
+            BAR_DTYPE 구조화 배열 또는 캐시가 없으면 None
+        """
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            bars = np.load(path, mmap_mode='r' if mmap else None)
+            if bars.dtype != BAR_DTYPE:
+                logging.warning(f"캐시 형식 불일치, 무시합니다: {path}")
+                return None
+            return bars
+        except (OSError, ValueError) as e:
+            logging.warning(f"캐시 파일 읽기 실패: {path} - {e}")
+            return None
+
+    def is_fresh(self, ticker, now=None):
+        """
+        확정된 마지막 거래일 일봉까지 캐시에 있는지 확인합니다.
+
+        마지막 거래일의 장 마감 이후에 저장됐고 마지막 일봉이 그 거래일이면 True입니다.
+        장중에는 오늘 종가가 확정되지 않았으므로 항상 False입니다.
+        """
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return False
+
+        now = now or current_time()
+        session = session_date(now)
+        close = session_close(session)
+        if now < close or datetime.fromtimestamp(os.path.getmtime(path)) < close:
+            return False
+
+        bars = self.load(ticker)
+        return bars is not None and len(bars) > 0 and int_to_date(bars['date'][-1]) >= session
+
+    def get_closes(self, ticker, days):
+        """
+        확정된 마지막 거래일까지 갱신된 캐시에 days일 이상 데이터가 있으면 최근 종가 리스트를 반환합니다.
+
+        Returns:
+            종가 리스트 (과거 → 현재) 또는 캐시로 처리할 수 없으면 None
+        """
+        if not self.is_fresh(ticker):
+            return None
+
+        bars = self.load(ticker)
+        if bars is None or len(bars) < days:
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return bars['close'][-days:].tolist()
+
+    def request_count(self, ticker, days, today=None):
+        """
+        차트 API에 요청할 일봉 수를 계산합니다.
+
+        마지막 캐시 날짜부터 지금 시세가 속하는 거래일까지의 영업일 수만큼만 요청하며,
+        캐시가 없거나 부족하면 days 전체를 요청합니다.
+        """
+        bars = self.load(ticker)
+        if bars is None or len(bars) == 0 or len(bars) < days:
+            with self._lock:
+                self.misses += 1
+            return days
+
+        today = today or session_date()
+        last_date = np.datetime64(int_to_date(bars['date'][-1]), 'D')
+        # 마지막 캐시 일봉부터 거래일까지의 영업일 수 (마지막 일봉도 다시 받아 확정 종가로 갱신)
+        gap = int(np.busday_count(last_date, np.datetime64(today, 'D') + 1))
+
+        with self._lock:
+            self.partial += 1
+        return max(1, min(days, gap))
+
+    def merge(self, ticker, new_bars):
+        """
+        새로 받은 일봉을 캐시와 합쳐 저장합니다. 같은 날짜는 새 값으로 덮어씁니다.
+
+        Returns:
+            합쳐진 전체 일봉 배열 (날짜 오름차순)
+        """
+        new_bars = np.asarray(new_bars, dtype=BAR_DTYPE)
+        cached = self.load(ticker, mmap=False)
+
+        if cached is not None and len(cached) > 0:
+            combined = np.concatenate([cached, new_bars])
+        else:
+            combined = new_bars
+
+        # 날짜순 정렬 후 날짜별 마지막(새로 받은) 값만 유지
+        combined = combined[np.argsort(combined['date'], kind='stable')]
+        if len(combined) > 0:
+            keep = np.append(combined['date'][1:] != combined['date'][:-1], True)
+            combined = combined[keep]
+
+        if self.max_bars is not None:
+            keep_bars = max(self.max_bars, len(cached) if cached is not None else 0)
+            combined = combined[-keep_bars:]
+
+        path = self._path(ticker)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, combined)
+        os.replace(tmp_path, path)
+        return combined
+
+    def stats(self):
+        """캐시 적중/미적중 통계를 반환합니다."""
+        with self._lock:
+            return {'hits': self.hits, 'partial': self.partial, 'misses': self.misses}
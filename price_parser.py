@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네이버증권 응답 파서
+
+- 차트 API(fchart sise.nhn) XML 응답을 정규식 없이 한 번에 읽어 일봉 배열로 변환
+  응답 예: <item data="20250718|64000|65000|63500|64500|12345678" />
+- 종목 HTML 페이지에서 DOM 전체를 만들지 않고 현재가만 추출
+  마크업 예: <p class="no_today"><em class="no_up"><span class="blind">64,500</span>...
+"""
+
+import logging
+
+import numpy as np
+
+from price_cache import BAR_DTYPE
+
+_ITEM_MARKER = b'<item data="'
+_FIELD_COUNT = len(BAR_DTYPE.names)
+# 이 개수 이하의 항목은 한 번에 변환하는 준비 비용이 더 크므로 항목별로 변환
+# (일봉 캐시 사용 시 대부분의 요청은 1~2개 항목)
+_SMALL_RESPONSE_ITEMS = 6
+
+# 숫자, 소수점, 부호 외의 바이트를 공백으로 바꾸는 변환 테이블
+_NUMERIC_ONLY = bytes(b if b in b'0123456789.-' else 0x20 for b in range(256))
+
+
+def _parse_item(payload):
+    """일봉 항목 하나를 변환합니다. 형식이 맞지 않으면 None"""
+    parts = payload.split(b'|')
+    if len(parts) < _FIELD_COUNT:
+        return None
+    try:
+        return (int(parts[0]), float(parts[1]), float(parts[2]),
+                float(parts[3]), float(parts[4]), int(float(parts[5] or 0)))
+    except ValueError:
+        return None
+
+
+def _parse_items(section):
+    """일봉 항목을 하나씩 변환하고 형식이 맞지 않는 항목은 건너뜁니다."""
+    rows = []
+    for chunk in section.split(_ITEM_MARKER)[1:]:
+        quote = chunk.find(b'"')
+        row = _parse_item(chunk[:quote]) if quote >= 0 else None
+        if row is not None:
+            rows.append(row)
+    return np.array(rows, dtype=BAR_DTYPE)
+
+
+def parse_fchart_sise(content):
+    """
+    차트 API XML 응답에서 일봉(날짜, 시가, 고가, 저가, 종가, 거래량)을 추출합니다.
+
+    항목 구간의 숫자가 아닌 바이트를 모두 공백으로 바꾼 뒤 NumPy로 한 번에 변환하여
+    미리 할당한 배열의 각 열을 채웁니다. 원화 가격은 정수이므로 한 번에 변환할 때는
+    정수로 읽고, 소수점이나 부호가 있거나 형식이 맞지 않는 항목이 섞여 있으면 항목별로 변환하여
+    해당 항목만 건너뜁니다. 항목이 적은 응답(일봉 캐시 사용 시 1~2개)은 처음부터 항목별로 변환합니다.
+
+    Args:
+        content: 응답 본문 (bytes 또는 str)
+
+    Returns:
+        BAR_DTYPE 구조화 배열 (응답 순서, 보통 날짜 오름차순)
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    n_items = content.count(_ITEM_MARKER)
+    if n_items <= _SMALL_RESPONSE_ITEMS:
+        return _parse_items(content)
+
+    start = content.find(_ITEM_MARKER)
+    end = content.rfind(b'/>')
+    section = content[start:end]
+    bars = np.empty(n_items, dtype=BAR_DTYPE)
+    numbers = section.translate(_NUMERIC_ONLY)
+
+    # np.fromstring은 읽을 수 없는 토큰에서 경고(NumPy 2부터는 예외)를 내는데, 경고 필터는
+    # 프로세스 전체에 적용되어 동시 수집 스레드끼리 간섭하므로 쓰지 않음. 대신 숫자와 공백만
+    # 남았을 때(원화 가격은 정수)만 한 번에 변환하고, 읽은 값 개수는 아래에서 항목 수와 맞춰 봄
+    values = None
+    if b'-' not in numbers and b'.' not in numbers:
+        values = np.fromstring(numbers, dtype=np.int64, sep=' ')
+
+    # 항목마다 필드가 정확히 6개이고 빈 필드가 없을 때만 한 번에 변환한 값을 사용
+    if (values is not None and values.size == n_items * _FIELD_COUNT
+            and section.count(b'|') == n_items * (_FIELD_COUNT - 1)
+            and b'||' not in section):
+        table = values.reshape(n_items, _FIELD_COUNT)
+        for index, name in enumerate(BAR_DTYPE.names):
+            bars[name] = table[:, index]
+        return bars
+
+    return _parse_items(section)
+
+
+_NO_TODAY_MARKER = b'class="no_today"'
+_BLIND_MARKER = b'class="blind"'
+
+
+def _parse_price_text(text):
+    """'64,500' 형태의 가격 문자열을 숫자로 변환합니다. 실패 시 None"""
+    try:
+        price = float(text.strip().replace(b',', b''))
+    except ValueError:
+        return None
+    return price if price > 0 else None
+
+
+def _find_current_price(content):
+    """
+    .no_today 영역 안의 첫 번째 .blind 요소 텍스트를 바이트 검색으로 찾습니다.
+
+    Returns:
+        현재가 또는 마크업이 예상과 다르면 None
+    """
+    section_start = content.find(_NO_TODAY_MARKER)
+    if section_start < 0:
+        return None
+
+    # .no_today 단락 밖의 .blind 요소를 잘못 읽지 않도록 단락 끝까지만 검색
+    section_end = content.find(b'</p>', section_start)
+    blind = content.find(_BLIND_MARKER, section_start, section_end if section_end >= 0 else len(content))
+    if blind < 0:
+        return None
+
+    text_start = content.find(b'>', blind) + 1
+    text_end = content.find(b'<', text_start)
+    if text_start <= 0 or text_end < 0:
+        return None
+
+    return _parse_price_text(content[text_start:text_end])
+
+
+def _find_current_price_bs4(content):
+    """BeautifulSoup으로 DOM 전체를 파싱하여 현재가를 찾습니다. (느린 대체 경로)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    price_elements = soup.select('.no_today .blind')
+    if not price_elements:
+        return None
+    return _parse_price_text(price_elements[0].text.encode('utf-8'))
+
+
+def extract_current_price(content):
+    """
+    종목 HTML 페이지에서 현재가를 추출합니다.
+
+    먼저 바이트 검색으로 .no_today .blind 요소만 읽고, 마크업이 바뀌어 찾지 못하면
+    BeautifulSoup으로 전체 페이지를 파싱하여 다시 찾습니다.
+
+    Args:
+        content: 페이지 본문 (bytes 또는 str)
+
+    Returns:
+        현재가 또는 찾지 못하면 None
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    price = _find_current_price(content)
+    if price is not None:
+        return price
+
+    price = _find_current_price_bs4(content)
+    if price is not None:
+        logging.warning("HTML 현재가 빠른 추출 실패, BeautifulSoup으로 대체했습니다 (마크업 변경 확인 필요)")
+    return price
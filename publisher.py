@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+웹페이지용 파일 원자적 게시(publish)
+
+- 임시 파일에 쓴 뒤 os.replace로 교체하여 브라우저가 쓰다 만 파일을 읽지 않도록 함
+- gzip(.gz)과 brotli(.br, brotli 패키지가 있을 때만) 압축본을 미리 생성
+- 내용 해시 기반 ETag를 publish_manifest.json에 기록하여
+  클라이언트/정적 호스트가 조건부 요청과 압축 전송을 사용할 수 있게 함
+
+매니페스트 구조:
+    {
+        "results_코스피_200.csv": {
+            "etag": "\"3f2a...\"", "size": 1496, "gzip_size": 612, "br_size": 540,
+            "modified": "2025-07-21 16:02:31"
+        }
+    }
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+import logging
+from datetime import datetime
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 .br 압축본을 만들지 않음
+    brotli = None
+
+MANIFEST_FILENAME = "publish_manifest.json"
+
+_manifest_lock = threading.Lock()
+
+
+def atomic_write(filename, data):
+    """
+    같은 디렉토리의 임시 파일에 쓴 뒤 교체합니다.
+
+    Args:
+        filename: 대상 파일 경로
+        data: 기록할 내용 (bytes)
+    """
+    directory = os.path.dirname(filename)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filename)
+
+
+def compute_etag(data):
+    """내용 해시 기반 강한 ETag를 반환합니다."""
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def _publish_variant(filename, compressed):
+    """압축본을 기록하거나, 만들 수 없으면 이전 압축본을 지워 내용이 어긋나지 않게 합니다."""
+    if compressed is None:
+        if os.path.exists(filename):
+            os.remove(filename)
+        return None
+
+    atomic_write(filename, compressed)
+    return len(compressed)
+
+
+def update_manifest(filename, entry):
+    """게시한 파일의 정보를 파일과 같은 디렉토리의 매니페스트에 기록합니다."""
+    manifest_path = os.path.join(os.path.dirname(filename), MANIFEST_FILENAME)
+
+    with _manifest_lock:
+        manifest = {}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"게시 매니페스트 읽기 실패, 새로 만듭니다: {e}")
+
+        manifest[os.path.basename(filename)] = entry
+        atomic_write(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+def publish_file(filename, data):
+    """
+    웹페이지용 파일을 원자적으로 게시하고 압축본과 ETag 매니페스트를 갱신합니다.
+
+    Args:
+        filename: 게시할 파일 경로
+        data: 파일 내용 (bytes 또는 str, str은 UTF-8로 기록)
+
+    Returns:
+        기록한 매니페스트 항목 딕셔너리
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    atomic_write(filename, data)
+
+    entry = {
+        'etag': compute_etag(data),
+        'size': len(data),
+        'gzip_size': _publish_variant(f"{filename}.gz", gzip.compress(data, compresslevel=9, mtime=0)),
+        'br_size': _publish_variant(f"{filename}.br", brotli.compress(data) if brotli else None),
+        'modified': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    update_manifest(filename, entry)
+
+    logging.info(f"게시 완료: {filename} ({entry['size']:,}bytes, gzip {entry['gzip_size']:,}bytes, ETag {entry['etag']})")
+    return entry
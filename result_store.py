@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+날짜별로 분할된 추가 전용(append-only) RSI 결과 저장소
+
+- 하루치 결과를 results_store/YYYY-MM/YYYY-MM-DD.csv 파일 하나로 저장
+  (일일 업데이트는 그날 파티션만 쓰므로 이력이 늘어나도 쓰기량이 일정)
+- 같은 날 다시 실행하면 그날 파티션만 교체
+- 웹페이지용 표시 파일과 월별 파일은 파티션을 모아 만드는 압축(compaction) 단계에서 생성
+  표시 파일은 최신 파티션부터 필요한 만큼만 읽고, 월별 파일은 해당 월 파티션만 읽음
+"""
+
+import io
+import os
+import csv
+import glob
+import threading
+import logging
+from datetime import datetime
+
+from publisher import publish_file
+from dashboard_payload import render_payload, payload_filename
+from file_manifest import record_write
+
+COLUMNS = ['Ticker', 'Name', 'Industry', 'Date', 'RSI7', 'RSI14', 'Yesterday_RSI7', 'Yesterday_RSI14']
+
+
+def _write_csv(filename, header, rows):
+    """CSV를 임시 파일에 쓴 뒤 교체합니다. (읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+    directory = os.path.dirname(filename)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+    os.replace(tmp_path, filename)
+
+
+def _render_csv(header, rows):
+    """CSV 내용을 UTF-8(BOM 포함) 바이트로 만듭니다."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8-sig')
+
+
+class ResultStore:
+    def __init__(self, root="results_store"):
+        """
+        Args:
+            root: 날짜별 파티션을 저장할 디렉토리
+        """
+        self.root = root
+        self._compact_lock = threading.Lock()
+
+    @property
+    def display_since(self):
+        """표시 파일에 포함할 첫 날짜 (새로운 월이 시작되면 갱신). 없으면 None"""
+        path = os.path.join(self.root, 'display_since')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+
+    @display_since.setter
+    def display_since(self, date):
+        if not os.path.exists(self.root):
+            os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, 'display_since'), 'w', encoding='utf-8') as f:
+            f.write(date or '')
+
+    def partition_path(self, date):
+        """날짜(YYYY-MM-DD)의 파티션 파일 경로를 반환합니다."""
+        return os.path.join(self.root, date[:7], f"{date}.csv")
+
+    def dates(self, month=None):
+        """
+        저장된 파티션 날짜 목록을 최신순으로 반환합니다. (파일 내용은 읽지 않음)
+
+        Args:
+            month: 'YYYY-MM'을 지정하면 해당 월만
+        """
+        pattern = os.path.join(self.root, month or '*', '????-??-??.csv')
+        return sorted((os.path.basename(path)[:-4] for path in glob.glob(pattern)), reverse=True)
+
+    def write_day(self, date, results):
+        """
+        하루치 결과를 해당 날짜 파티션으로 저장합니다. 기존 파티션은 교체됩니다.
+
+        Args:
+            date: 날짜 (YYYY-MM-DD)
+            results: RSI 결과 딕셔너리 리스트
+        """
+        header = list(COLUMNS)
+        for result in results:
+            header.extend(key for key in result if key not in header)
+
+        rows = [['' if result.get(key) is None else result.get(key) for key in header] for result in results]
+        _write_csv(self.partition_path(date), header, rows)
+        logging.info(f"결과 파티션 저장: {date} ({len(rows)}개 레코드)")
+
+    def read_day(self, date):
+        """
+        파티션 하나를 읽습니다.
+
+        Returns:
+            (헤더, 행 리스트) 튜플
+        """
+        with open(self.partition_path(date), 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or list(COLUMNS)
+            return header, [row for row in reader if row]
+
+    def import_csv(self, filename):
+        """
+        기존 결과 CSV를 날짜별 파티션으로 옮깁니다. 이미 파티션이 있는 날짜는 건너뜁니다.
+
+        Returns:
+            새로 만든 파티션 수
+        """
+        existing = set(self.dates())
+        by_date = {}
+
+        with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                date = (row.get('Date') or '').strip()
+                try:
+                    date = datetime.strptime(date, '%Y-%m-%d').strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+                if date not in existing:
+                    # pandas가 숫자로 읽어 앞자리 0이 빠진 종목코드 복원
+                    ticker = row.get('Ticker', '')
+                    if ticker.isdigit():
+                        row['Ticker'] = ticker.zfill(6)
+                    row['Date'] = date
+                    by_date.setdefault(date, []).append(row)
+
+        for date, rows in by_date.items():
+            self.write_day(date, rows)
+
+        if by_date:
+            logging.info(f"기존 결과 파일 가져오기: {filename} -> {len(by_date)}개 날짜 파티션")
+        return len(by_date)
+
+    def _collect(self, dates, limit=None):
+        """파티션을 최신순으로 읽어 (헤더, 행 리스트)를 만듭니다. limit개 행까지만 읽습니다."""
+        header = list(COLUMNS)
+        rows = []
+
+        for date in dates:
+            part_header, part_rows = self.read_day(date)
+            new_columns = [column for column in part_header if column not in header]
+            if new_columns:
+                header.extend(new_columns)
+
+            index = [part_header.index(column) if column in part_header else None for column in header]
+            for row in part_rows:
+                rows.append([row[i] if i is not None and i < len(row) else '' for i in index])
+                if limit is not None and len(rows) >= limit:
+                    break
+            if limit is not None and len(rows) >= limit:
+                break
+
+        # 나중에 추가된 열이 있으면 앞서 읽은 행 길이를 맞춤
+        width = len(header)
+        rows = [row + [''] * (width - len(row)) for row in rows]
+        return header, rows
+
+    def compact_display(self, filename, limit=1000, since=None):
+        """
+        웹페이지용 표시 파일을 최신 파티션에서 만듭니다.
+
+        최신 파티션부터 limit개 레코드가 찰 때까지만 읽으므로 이력 크기와 무관합니다.
+        표시 파일은 원자적으로 게시되며 압축본과 ETag 매니페스트도 함께 갱신됩니다.
+        웹페이지용 열 단위 JSON(표시 파일명.json)도 같은 내용으로 함께 게시합니다.
+
+        Args:
+            filename: 표시 파일 경로
+            limit: 최대 레코드 수
+            since: 이 날짜(YYYY-MM-DD) 이후 파티션만 포함
+
+        Returns:
+            기록한 레코드 수
+        """
+        dates = [date for date in self.dates() if since is None or date >= since]
+        header, rows = self._collect(dates, limit=limit)
+        content = _render_csv(header, rows)
+        publish_file(filename, content)
+        record_write(filename, content)
+        publish_file(payload_filename(filename), render_payload(dict(zip(header, row)) for row in rows))
+        return len(rows)
+
+    def compact_month(self, year, month, filename):
+        """
+        해당 월의 파티션을 모아 월별 파일을 만듭니다. (최신 날짜순)
+
+        Returns:
+            기록한 레코드 수
+        """
+        with self._compact_lock:
+            header, rows = self._collect(self.dates(f"{year}-{month:02d}"))
+            _write_csv(filename, header, rows)
+            record_write(filename)
+        logging.info(f"월별 파일 압축 완료: {filename} ({len(rows)}개 레코드)")
+        return len(rows)
+
+    def compact_month_in_background(self, year, month, filename):
+        """월별 파일 압축을 백그라운드 스레드에서 실행합니다."""
+        def run():
+            try:
+                self.compact_month(year, month, filename)
+            except Exception as e:
+                logging.error(f"월별 파일 압축 오류: {e}")
+
+        thread = threading.Thread(target=run, name=f"compact-{year}-{month:02d}")
+        thread.start()
+        return thread
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목 × 일자 가격 행렬에 대한 벡터화 RSI 계산 엔진
+
+- 전 종목의 종가를 2차원 배열 하나로 받아 한 번의 NumPy 연산으로 RSI 계산
+- 여러 기간(7일, 14일 등)과 최근 N일치 값을 한 번에 반환
+- 단순 이동평균(기본) 또는 Wilder 평활 방식 선택 가능
+
+사용 예:
+    closes = np.array([[...30일 종가...], [...], ...])   # (종목 수, 일수), 과거 → 현재
+    rsi = calculate_rsi_batch(closes, periods=(7, 14), last_n=2)
+    rsi[7][:, -1]   # 전 종목 오늘 RSI7
+    rsi[7][:, -2]   # 전 종목 어제 RSI7
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def as_price_matrix(closes):
+    """종가 데이터를 (종목 수, 일수) 형태의 float 배열로 변환합니다."""
+    matrix = np.asarray(closes, dtype=float)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2:
+        raise ValueError(f"종가 배열은 1차원 또는 2차원이어야 합니다: {matrix.shape}")
+    return matrix
+
+
+def price_deltas(closes):
+    """
+    가격 변화량에서 상승폭/하락폭을 분리합니다.
+
+    Returns:
+        (gains, losses, valid) 튜플. 모두 (종목 수, 일수 - 1) 형태이며
+        valid는 앞뒤 가격이 모두 있는(NaN이 아닌) 구간 여부
+    """
+    deltas = np.diff(as_price_matrix(closes), axis=1)
+    valid = ~np.isnan(deltas)
+    deltas = np.where(valid, deltas, 0.0)
+
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    return gains, losses, valid
+
+
+def rsi_from_deltas(gains, losses, valid, period, wilder=False):
+    """
+    상승폭/하락폭 배열에서 RSI와 평균 상승폭/하락폭을 계산합니다.
+
+    Args:
+        gains, losses, valid: price_deltas()의 반환값
+        period: RSI 계산 기간
+        wilder: True면 Wilder 평활, False면 최근 period개 변화량의 단순 평균
+
+    Returns:
+        (rsi, avg_gain, avg_loss) 튜플. 모두 (종목 수, 일수) 형태로 가격 행렬과
+        같은 열에 정렬되며, 계산할 수 없는 위치는 NaN
+    """
+    n_tickers, n_deltas = gains.shape
+    shape = (n_tickers, n_deltas + 1)
+    avg_gain = np.full(shape, np.nan)
+    avg_loss = np.full(shape, np.nan)
+
+    if n_deltas >= period:
+        # 각 시점에서 끝나는 period개 구간의 단순 평균 (변화량 인덱스 period-1부터)
+        window_valid = sliding_window_view(valid, period, axis=1).all(axis=-1)
+        window_gain = sliding_window_view(gains, period, axis=1).mean(axis=-1)
+        window_loss = sliding_window_view(losses, period, axis=1).mean(axis=-1)
+        window_gain[~window_valid] = np.nan
+        window_loss[~window_valid] = np.nan
+
+        if wilder:
+            gain_state = np.full(n_tickers, np.nan)
+            loss_state = np.full(n_tickers, np.nan)
+            run = np.zeros(n_tickers, dtype=int)
+
+            for j in range(n_deltas):
+                ok = valid[:, j]
+                run = np.where(ok, run + 1, 0)
+
+                # 연속 유효 구간이 period개가 되는 시점에 단순 평균으로 시작값 설정
+                seed = run == period
+                if j >= period - 1:
+                    gain_state = np.where(seed, window_gain[:, j - period + 1], gain_state)
+                    loss_state = np.where(seed, window_loss[:, j - period + 1], loss_state)
+
+                recur = run > period
+                gain_state = np.where(recur, (gain_state * (period - 1) + gains[:, j]) / period, gain_state)
+                loss_state = np.where(recur, (loss_state * (period - 1) + losses[:, j]) / period, loss_state)
+
+                # 결측 구간을 만나면 다시 처음부터 평활
+                gain_state = np.where(ok, gain_state, np.nan)
+                loss_state = np.where(ok, loss_state, np.nan)
+
+                avg_gain[:, j + 1] = gain_state
+                avg_loss[:, j + 1] = loss_state
+        else:
+            avg_gain[:, period:] = window_gain
+            avg_loss[:, period:] = window_loss
+
+    return rsi_from_averages(avg_gain, avg_loss), avg_gain, avg_loss
+
+
+def rsi_from_averages(avg_gain, avg_loss):
+    """평균 상승폭/하락폭으로 RSI를 계산합니다. (스칼라/배열 모두 가능)"""
+    avg_gain = np.asarray(avg_gain, dtype=float)
+    avg_loss = np.asarray(avg_loss, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    # 하락폭이 없으면 RSI 100
+    rsi = np.where(avg_loss == 0, 100.0, rsi)
+    rsi = np.where(np.isnan(avg_gain) | np.isnan(avg_loss), np.nan, rsi)
+    return np.round(rsi, 2)
+
+
+def wilder_step(avg_gain, avg_loss, prev_close, close, period):
+    """
+    직전 Wilder 평균 상승폭/하락폭에 새 종가 하나를 반영합니다. (스칼라/배열 모두 가능)
+
+    Returns:
+        (rsi, avg_gain, avg_loss) 튜플
+    """
+    delta = np.asarray(close, dtype=float) - np.asarray(prev_close, dtype=float)
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+
+    avg_gain = (np.asarray(avg_gain, dtype=float) * (period - 1) + gain) / period
+    avg_loss = (np.asarray(avg_loss, dtype=float) * (period - 1) + loss) / period
+    return rsi_from_averages(avg_gain, avg_loss), avg_gain, avg_loss
+
+
+def calculate_rsi_batch(closes, periods=(7, 14), last_n=1, wilder=False):
+    """
+    여러 종목의 RSI를 여러 기간에 대해 한 번에 계산합니다.
+
+    Args:
+        closes: (종목 수, 일수) 종가 배열 (과거 → 현재 순서, 결측은 NaN)
+        periods: RSI 계산 기간 목록
+        last_n: 반환할 최근 일수 (None이면 전체 기간)
+        wilder: True면 Wilder 평활 방식 사용
+
+    Returns:
+        {기간: (종목 수, last_n) 배열} 딕셔너리. 마지막 열이 가장 최근 값이며
+        데이터가 부족한 위치는 NaN
+    """
+    gains, losses, valid = price_deltas(closes)
+
+    results = {}
+    for period in periods:
+        rsi, _, _ = rsi_from_deltas(gains, losses, valid, period, wilder=wilder)
+        results[period] = rsi if last_n is None else rsi[:, -last_n:]
+
+    return results
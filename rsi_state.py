@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목별 RSI 증분 계산 상태 저장소
+
+- 종목별 마지막 종가와 기간별 Wilder 평균 상승폭/하락폭을 JSON 파일로 보관
+- 매일 새 종가 하나만으로 RSI를 갱신 (종목당 O(1))
+- 상태가 없거나 직전 거래일 상태가 아닌 경우(놓친 거래일이 있는 경우)에만 전체 가격 이력으로 다시 계산
+- 날짜는 달력 날짜가 아니라 거래일(market_calendar.session_date) 기준이므로 주말/휴장일에 실행해도
+  변동 없는 가짜 봉이 Wilder 평균에 더해지지 않음
+
+상태 파일 구조:
+    {
+        "005930": {
+            "date": "2025-07-21", "close": 64500.0,
+            "periods": {"7": {"avg_gain": ..., "avg_loss": ..., "rsi": ...}, "14": {...}},
+            "prev": {"date": "2025-07-18", "close": ..., "periods": {...}}
+        }
+    }
+
+prev에는 직전 거래일 상태를 보관하여 어제 RSI를 제공하고,
+같은 날 다시 실행해도 직전 상태에서 오늘 값을 재계산할 수 있게 합니다.
+"""
+
+import os
+import math
+import json
+import threading
+import logging
+from market_calendar import previous_trading_day
+from rsi_engine import price_deltas, rsi_from_deltas, wilder_step
+
+
+class RSIStateStore:
+    def __init__(self, path="rsi_state.json", periods=(7, 14)):
+        """
+        Args:
+            path: 상태 파일 경로
+            periods: 관리할 RSI 기간 목록
+        """
+        self.path = path
+        self.periods = tuple(periods)
+        self._lock = threading.Lock()
+        self._states = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """상태 파일을 읽어옵니다. 파일이 없거나 손상된 경우 빈 상태로 시작합니다."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._states = json.load(f)
+            logging.info(f"RSI 상태 로드: {len(self._states)}개 종목 ({self.path})")
+        except (OSError, ValueError) as e:
+            logging.warning(f"RSI 상태 파일 읽기 실패, 전체 재계산합니다: {e}")
+            self._states = {}
+
+    def save(self):
+        """변경된 상태를 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._states, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        logging.info(f"RSI 상태 저장: {len(self._states)}개 종목 ({self.path})")
+
+    def get(self, ticker):
+        """종목의 현재 상태를 반환합니다."""
+        with self._lock:
+            return self._states.get(ticker)
+
+    def put(self, ticker, state):
+        """저장해 둔 종목 상태를 그대로 반영합니다. (중단된 수집을 이어서 할 때)"""
+        with self._lock:
+            self._states[ticker] = state
+            self._dirty = True
+
+    def _has_periods(self, snapshot):
+        periods = (snapshot or {}).get('periods', {})
+        return all(str(period) in periods for period in self.periods)
+
+    def _base_snapshot(self, state, date):
+        """
+        거래일 date의 종가를 반영할 기준 상태를 반환합니다. 사용할 수 없으면 None
+
+        기준 상태는 직전 거래일 상태여야 하며, 그 사이 거래일을 놓쳤으면 한 봉으로 건너뛰지 않고 전체 재계산합니다.
+        """
+        if not state or not self._has_periods(state):
+            return None
+
+        if state['date'] == date:
+            # 같은 거래일 재실행: 직전 거래일 상태에서 다시 계산
+            prev = state.get('prev')
+            return prev if self._has_periods(prev) else None
+
+        try:
+            expected = previous_trading_day(date)
+        except ValueError:
+            return None
+        return state if state.get('date') == expected else None
+
+    def base_snapshot(self, ticker, date):
+        """
+        date의 가격을 반영할 기준 상태(직전 거래일 종가와 Wilder 평균)를 반환합니다.
+
+        장중에는 기준 상태가 바뀌지 않으므로 한 번 읽어 두고 현재가만 반영할 수 있습니다.
+
+        Returns:
+            {'date', 'close', 'periods': {기간: {'avg_gain', 'avg_loss', 'rsi'}}} 또는 사용할 수 없으면 None
+        """
+        with self._lock:
+            return self._base_snapshot(self._states.get(ticker), date)
+
+    def is_usable(self, ticker, date):
+        """증분 갱신이 가능한지(상태가 있고 오래되지 않았는지) 확인합니다."""
+        with self._lock:
+            return self._base_snapshot(self._states.get(ticker), date) is not None
+
+    @staticmethod
+    def _summary(base, snapshot):
+        return {
+            'yesterday': {int(p): v['rsi'] for p, v in base['periods'].items()},
+            'today': {int(p): v['rsi'] for p, v in snapshot['periods'].items()},
+        }
+
+    def _advance(self, ticker, date, close):
+        """기준 상태에 새 종가를 반영한 (기준 상태, 새 상태)를 반환합니다."""
+        with self._lock:
+            base = self._base_snapshot(self._states.get(ticker), date)
+        if base is None:
+            return None
+
+        snapshot = {'date': date, 'close': float(close), 'periods': {}}
+        for period in self.periods:
+            averages = base['periods'][str(period)]
+            rsi, avg_gain, avg_loss = wilder_step(
+                averages['avg_gain'], averages['avg_loss'], base['close'], close, period
+            )
+            snapshot['periods'][str(period)] = {
+                'avg_gain': float(avg_gain),
+                'avg_loss': float(avg_loss),
+                'rsi': float(rsi),
+            }
+
+        return base, snapshot
+
+    def preview(self, ticker, date, close):
+        """
+        새 종가 하나를 반영한 RSI를 상태를 바꾸지 않고 계산합니다. (장중 부분 봉 등)
+
+        Returns:
+            {'today': {기간: RSI}, 'yesterday': {기간: RSI}} 또는 상태를 사용할 수 없으면 None
+        """
+        advanced = self._advance(ticker, date, close)
+        if advanced is None:
+            return None
+        return self._summary(*advanced)
+
+    def update(self, ticker, date, close):
+        """
+        새 종가 하나로 RSI를 갱신하고 상태를 반영합니다.
+
+        Returns:
+            {'today': {기간: RSI}, 'yesterday': {기간: RSI}} 또는 상태를 사용할 수 없으면 None
+        """
+        advanced = self._advance(ticker, date, close)
+        if advanced is None:
+            return None
+
+        base, snapshot = advanced
+        snapshot['prev'] = {k: base[k] for k in ('date', 'close', 'periods')}
+
+        with self._lock:
+            self._states[ticker] = snapshot
+            self._dirty = True
+
+        return self._summary(base, snapshot)
+
+    def seed(self, ticker, date, prices, prev_date=None):
+        """
+        전체 가격 이력으로 Wilder RSI를 다시 계산하여 상태를 초기화합니다.
+
+        Args:
+            ticker: 종목 코드
+            date: 마지막 가격의 거래일 (YYYY-MM-DD)
+            prices: 가격 리스트 (과거 → 현재)
+            prev_date: 직전 가격의 거래일 (없으면 date의 직전 거래일)
+
+        Returns:
+            {'today': {기간: RSI}, 'yesterday': {기간: RSI}} 또는 데이터가 부족하면 None
+        """
+        gains, losses, valid = price_deltas(prices)
+
+        today = {'date': date, 'close': float(prices[-1]), 'periods': {}}
+        yesterday = {'date': prev_date or previous_trading_day(date), 'close': float(prices[-2]), 'periods': {}}
+
+        for period in self.periods:
+            rsi, avg_gain, avg_loss = rsi_from_deltas(gains, losses, valid, period, wilder=True)
+            for snapshot, column in ((today, -1), (yesterday, -2)):
+                snapshot['periods'][str(period)] = {
+                    'avg_gain': float(avg_gain[0, column]),
+                    'avg_loss': float(avg_loss[0, column]),
+                    'rsi': float(rsi[0, column]),
+                }
+
+        values = [v for s in (today, yesterday) for p in s['periods'].values() for v in p.values()]
+        if any(math.isnan(v) for v in values):  # 데이터 부족
+            return None
+
+        today['prev'] = yesterday
+        with self._lock:
+            self._states[ticker] = today
+            self._dirty = True
+
+        return self._summary(yesterday, today)
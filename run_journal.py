@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 실행 저널 (중단된 수집 이어서 하기)
+
+- 종목 하나를 수집할 때마다 결과를 실행 날짜별 JSONL 파일에 한 줄씩 추가
+- 수집이 중간에 실패하거나 중단되면 다음 실행은 같은 날짜 저널에서 끝난 종목을 읽고 남은 종목만 수집
+- RSI 증분 상태와 보조지표용 가격 이력도 함께 기록하여 이어서 수집해도 결과와 상태가 같음
+- 수집이 끝나면 완료 표시를 남기며, 같은 날 다시 실행하면 처음부터 새로 수집
+- 쓰다 만 마지막 줄은 읽을 때 건너뛰고, 이어서 기록하기 전에 잘라냄
+
+저널 파일 예 (run_journal/2025-07-21.jsonl):
+    {"ticker": "005930", "result": {...}, "state": {...}, "history": [[...], null, null]}
+    {"complete": true, "time": "2025-07-21 16:05:12", "records": 200}
+"""
+
+import os
+import glob
+import json
+import threading
+import logging
+from datetime import datetime, timedelta
+
+JOURNAL_DIR = "run_journal"
+DEDUPE_MODES = ('date', 'none')
+
+
+class RunJournal:
+    def __init__(self, directory=JOURNAL_DIR, run_date=None, dedupe='date', keep_days=7):
+        """
+        Args:
+            directory: 저널 디렉토리
+            run_date: 실행 날짜 (YYYY-MM-DD, None이면 오늘)
+            dedupe: 'date'면 같은 날짜의 미완료 저널에서 이어서 수집, 'none'이면 항상 처음부터 수집
+            keep_days: 이 일수보다 오래된 저널 파일은 삭제
+        """
+        if dedupe not in DEDUPE_MODES:
+            raise ValueError(f"지원하지 않는 중복 제거 방식입니다: {dedupe} (가능: {', '.join(DEDUPE_MODES)})")
+
+        self.directory = directory
+        self.run_date = run_date or datetime.now().strftime('%Y-%m-%d')
+        self.dedupe = dedupe
+        self.keep_days = keep_days
+        self.path = os.path.join(directory, f"{self.run_date}.jsonl")
+        self._lock = threading.Lock()
+        self._file = None
+
+    def open(self):
+        """
+        저널을 열고 이어서 수집할 수 있는 종목 기록을 반환합니다.
+
+        Returns:
+            {종목코드: {'result', 'state', 'history'}} (처음부터 수집하면 빈 딕셔너리)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._cleanup()
+
+        entries = {}
+        complete = False
+        if self.dedupe == 'date' and os.path.exists(self.path):
+            entries, complete = self._read()
+
+        if complete or self.dedupe == 'none' or not entries:
+            entries = {}
+            self._file = open(self.path, 'w', encoding='utf-8')
+        else:
+            logging.info(f"수집 저널에서 이어서 수집: 완료 {len(entries)}개 종목 ({self.path})")
+            self._truncate_partial_line()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return entries
+
+    def _truncate_partial_line(self):
+        """
+        쓰다 만 마지막 줄을 잘라냅니다.
+
+        그대로 이어 쓰면 새 기록이 잘린 줄 뒤에 붙어 그 종목까지 손상된 줄로 읽히기 때문입니다.
+        """
+        with open(self.path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b'\n')
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                logging.warning(f"수집 저널의 쓰다 만 마지막 줄 제거: {end - position}바이트 ({self.path})")
+                f.truncate(position)
+
+    def _read(self):
+        """저널 파일을 읽습니다. 손상된 줄은 건너뜁니다."""
+        entries = {}
+        complete = False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('complete'):
+                    complete = True
+                elif entry.get('ticker') and entry.get('result'):
+                    entries[entry['ticker']] = entry
+        return entries, complete
+
+    def _cleanup(self):
+        """keep_days보다 오래된 저널 파일을 삭제합니다."""
+        cutoff = (datetime.strptime(self.run_date, '%Y-%m-%d') - timedelta(days=self.keep_days)).strftime('%Y-%m-%d')
+        for path in glob.glob(os.path.join(self.directory, '*.jsonl')):
+            if os.path.basename(path)[:-6] < cutoff:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logging.warning(f"오래된 수집 저널 삭제 실패: {path} ({e})")
+
+    def record(self, ticker, result, state=None, history=None):
+        """종목 하나의 수집 결과를 저널에 추가합니다. (한 줄씩 바로 기록)"""
+        line = json.dumps({'ticker': ticker, 'result': result, 'state': state, 'history': history},
+                          ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def complete(self, records):
+        """수집이 끝났음을 기록하고 저널을 닫습니다."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps({
+                'complete': True,
+                'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'records': records,
+            }) + '\n')
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """완료 표시 없이 저널을 닫습니다. (다음 실행에서 이어서 수집)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
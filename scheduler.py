@@ -6,6 +6,10 @@
 매일 오후 4시에 데이터 업데이트
 매월 1일에 새로운 파일 생성
 
+프로세스가 살아 있는 동안 수집기(세션 커넥션 풀, 캐시)를 하나만 만들어 계속 사용하고,
+작업은 전용 작업 스레드 하나에서 순서대로 실행하여 겹치지 않게 합니다.
+다음 예정 시각까지 정확히 대기하며, 꺼져 있던 동안 놓친 작업은 시작할 때 한 번 실행합니다.
+
 설치 필요 패키지:
 pip install schedule requests beautifulsoup4 pandas numpy
 
@@ -13,14 +17,21 @@ pip install schedule requests beautifulsoup4 pandas numpy
 python scheduler.py
 """
 
-import schedule
 import time
 import os
+import json
+import queue
 import shutil
-from datetime import datetime, date
+import threading
+from datetime import datetime, date, timedelta
 import logging
-from data_collector import NaverStockDataCollector
-import pandas as pd
+from result_store import ResultStore
+from file_manifest import record_write
+from history_db import HistoryDB
+from market_calendar import is_trading_day
+
+# schedule, pandas, data_collector(requests/numpy)는 실제로 필요한 시점에 import 하여
+# status 같은 가벼운 명령은 무거운 패키지를 읽지 않고 바로 실행되도록 함
 
 # 로깅 설정
 logging.basicConfig(
@@ -32,14 +43,57 @@ logging.basicConfig(
     ]
 )
 
+STATE_FILENAME = "scheduler_state.json"
+DAILY_AT = "16:00"     # 일일 업데이트 시각
+MONTHLY_AT = "09:00"   # 매월 1일 새 파일 생성 시각
+MAX_SLEEP = 900        # 절전/시계 변경에 대비해 최대 이 시간(초)마다 깨어나 다음 예정 시각을 다시 확인
+
+def count_csv_records(filename):
+    """CSV 파일의 데이터 행 수를 pandas 없이 셉니다. (헤더 제외)"""
+    lines = 0
+    last = b''
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            lines += chunk.count(b'\n')
+            last = chunk[-1:]
+    
+    # 마지막 줄에 줄바꿈이 없는 경우
+    if last and last != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
 class KOSPI200Scheduler:
     def __init__(self):
-        self.collector = NaverStockDataCollector()
+        self._collector = None
+        self.store = ResultStore("results_store")
+        self.history_path = "history.db"
+        # 결과에 추가할 보조지표 (예: ['macd', 'bollinger', 'stochastic'], 비어 있으면 RSI만)
+        self.indicators = []
         self.base_filename = "results_코스피_200"
         self.current_filename = None
+    
+    @property
+    def collector(self):
+        """데이터 수집기 (처음 사용할 때 생성)"""
+        if self._collector is None:
+            from data_collector import NaverStockDataCollector
+            self._collector = NaverStockDataCollector(
+                state_path="rsi_state.json",
+                cache_dir="price_cache",
+                router_path="endpoint_stats.json",
+                bulk_batch_size=50,
+                rules_path="screen_rules.json",
+                indicators=self.indicators,
+                universe_path="universe.json",
+                journal_dir="run_journal",
+                metrics_dir="metrics",
+            )
+        return self._collector
         
-    def get_current_filename(self):
-        """현재 월에 해당하는 파일명을 반환합니다."""
+    def get_current_filename(self, date=None):
+        """현재 월(date를 지정하면 해당 날짜 YYYY-MM-DD의 월)에 해당하는 파일명을 반환합니다."""
+        if date is not None:
+            return f"{self.base_filename}_{date[:4]}_{date[5:7]}.csv"
         current_date = datetime.now()
         return f"{self.base_filename}_{current_date.year}_{current_date.month:02d}.csv"
     
@@ -48,7 +102,14 @@ class KOSPI200Scheduler:
         return f"{self.base_filename}.csv"
     
     def create_monthly_file(self):
-        """매월 1일에 새로운 파일을 생성합니다."""
+        """
+        매월 1일에 새로운 파일을 생성합니다.
+        
+        Returns:
+            새 월의 데이터 수집 성공 여부
+        """
+        import pandas as pd
+        
         try:
             current_filename = self.get_current_filename()
             display_filename = self.get_display_filename()
@@ -60,17 +121,24 @@ class KOSPI200Scheduler:
                 
                 if not os.path.exists(archive_filename):
                     shutil.copy2(display_filename, archive_filename)
+                    record_write(archive_filename)
                     logging.info(f"이전 월 파일 아카이브 완료: {archive_filename}")
             
             # 새로운 월 파일 생성
             logging.info(f"새로운 월 파일 생성: {current_filename}")
-            self.collect_and_update_data(is_new_month=True)
+            return self.collect_and_update_data(is_new_month=True)
             
         except Exception as e:
             logging.error(f"월별 파일 생성 오류: {e}")
+            return False
     
     def collect_and_update_data(self, is_new_month=False):
-        """데이터를 수집하고 CSV 파일을 업데이트합니다."""
+        """
+        데이터를 수집하고 CSV 파일을 업데이트합니다.
+        
+        오늘 결과는 날짜별 파티션 하나로만 저장하고, 표시 파일은 최신 파티션에서
+        최대 1000개 레코드만 다시 만들며, 월별 파일은 백그라운드에서 압축합니다.
+        """
         try:
             logging.info("=== 코스피 200 RSI 데이터 수집 시작 ===")
             
@@ -81,49 +149,40 @@ class KOSPI200Scheduler:
                 logging.warning("수집된 데이터가 없습니다.")
                 return False
             
-            # DataFrame 생성
-            df_new = pd.DataFrame(results)
             display_filename = self.get_display_filename()
             current_filename = self.get_current_filename()
+            today = results[0].get('Date') or datetime.now().strftime('%Y-%m-%d')
+            
+            # 저장소가 비어 있으면 기존 CSV를 한 번만 날짜별 파티션으로 옮김
+            if not self.store.dates():
+                for filename in (display_filename, current_filename):
+                    if os.path.exists(filename):
+                        self.store.import_csv(filename)
+            
+            metrics = self.collector.metrics
+            # 오늘 파티션만 기록 (같은 날 재실행 시 교체)
+            with metrics.timer('csv_write_seconds', target='partition'):
+                self.store.write_day(today, results)
+            with metrics.timer('stage_seconds', stage='history_db'):
+                self.update_history(today)
             
             if is_new_month or not os.path.exists(display_filename):
-                # 새로운 파일 생성 (새로운 월 또는 파일이 없는 경우)
-                df_new.to_csv(display_filename, index=False, encoding='utf-8-sig')
-                df_new.to_csv(current_filename, index=False, encoding='utf-8-sig')
+                # 새로운 월: 표시 파일은 오늘부터 다시 시작
+                self.store.display_since = today
                 logging.info(f"새로운 파일 생성: {display_filename}")
-                
-            else:
-                # 기존 파일에 데이터 추가
-                try:
-                    df_existing = pd.read_csv(display_filename, encoding='utf-8-sig')
-                    
-                    # 오늘 날짜의 기존 데이터가 있다면 제거
-                    today = datetime.now().strftime('%Y-%m-%d')
-                    df_existing = df_existing[df_existing['Date'] != today]
-                    
-                    # 새로운 데이터 추가
-                    df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-                    
-                    # 날짜순으로 정렬
-                    df_combined['Date'] = pd.to_datetime(df_combined['Date'])
-                    df_combined = df_combined.sort_values('Date', ascending=False)
-                    df_combined['Date'] = df_combined['Date'].dt.strftime('%Y-%m-%d')
-                    
-                    # 파일 저장
-                    df_combined.to_csv(display_filename, index=False, encoding='utf-8-sig')
-                    df_combined.to_csv(current_filename, index=False, encoding='utf-8-sig')
-                    
-                    logging.info(f"데이터 업데이트 완료: {len(results)}개 종목, 총 {len(df_combined)}개 레코드")
-                    
-                except Exception as e:
-                    logging.error(f"기존 파일 읽기 오류: {e}, 새로운 파일로 생성합니다.")
-                    df_new.to_csv(display_filename, index=False, encoding='utf-8-sig')
-                    df_new.to_csv(current_filename, index=False, encoding='utf-8-sig')
             
-            # 파일 크기 관리 (최대 1000개 레코드 유지)
-            self.manage_file_size(display_filename)
-            self.manage_file_size(current_filename)
+            # 표시 파일은 최신 파티션에서 최대 1000개 레코드만 다시 생성
+            with metrics.timer('csv_write_seconds', target='display'):
+                total = self.store.compact_display(display_filename, limit=1000, since=self.store.display_since)
+            logging.info(f"데이터 업데이트 완료: {len(results)}개 종목, 총 {total}개 레코드")
+            
+            # 월별 파일은 오늘 파티션이 속한 월만 모아 백그라운드에서 압축
+            # (1일이 휴장일이거나 장 시작 전이면 거래일은 지난달이므로 현재 시각의 월을 쓰지 않음)
+            self.store.compact_month_in_background(int(today[:4]), int(today[5:7]),
+                                                   self.get_current_filename(today))
             
+            # 수집 단계 계측에 저장 단계까지 더해 다시 내보냄 (같은 실행 파일을 덮어씀)
+            self.collector.export_metrics()
             logging.info("=== 데이터 수집 및 업데이트 완료 ===")
             return True
             
@@ -131,8 +190,26 @@ class KOSPI200Scheduler:
             logging.error(f"데이터 수집 및 업데이트 오류: {e}")
             return False
     
+    def update_history(self, date):
+        """날짜 파티션을 이력 데이터베이스에 적재합니다. (실패해도 수집 결과에는 영향 없음)"""
+        try:
+            with HistoryDB(self.history_path) as db:
+                db.load_file(self.store.partition_path(date))
+        except Exception as e:
+            logging.warning(f"이력 데이터베이스 적재 실패: {e}")
+    
+    def compact(self, year=None, month=None):
+        """월별 파일을 날짜별 파티션에서 즉시 다시 만듭니다. (수동 압축)"""
+        now = datetime.now()
+        year = year or now.year
+        month = month or now.month
+        filename = f"{self.base_filename}_{year}_{month:02d}.csv"
+        return self.store.compact_month(year, month, filename)
+    
     def manage_file_size(self, filename):
         """파일 크기를 관리합니다. (최대 1000개 레코드 유지)"""
+        import pandas as pd
+        
         try:
             if os.path.exists(filename):
                 df = pd.read_csv(filename, encoding='utf-8-sig')
@@ -144,6 +221,7 @@ class KOSPI200Scheduler:
                     df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
                     
                     df.to_csv(filename, index=False, encoding='utf-8-sig')
+                    record_write(filename)
                     logging.info(f"파일 크기 관리: {filename} - 최신 1000개 레코드 유지")
                     
         except Exception as e:
@@ -174,48 +252,194 @@ class KOSPI200Scheduler:
             ).strftime('%Y-%m-%d %H:%M:%S')
             
             try:
-                df = pd.read_csv(display_filename, encoding='utf-8-sig')
-                status['record_count'] = len(df)
+                status['record_count'] = count_csv_records(display_filename)
             except:
                 pass
         
         return status
 
+_scheduler = None
+
+def get_scheduler():
+    """프로세스 전체에서 함께 쓰는 스케줄러 (수집기와 세션을 작업마다 새로 만들지 않음)"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = KOSPI200Scheduler()
+    return _scheduler
+
+class JobRunner:
+    def __init__(self, state_path=STATE_FILENAME):
+        """
+        작업을 전용 스레드 하나에서 순서대로 실행하고 작업별 마지막 성공 시각을 기록합니다.
+        
+        Args:
+            state_path: 작업별 마지막 실행 시각 파일 (놓친 작업 확인용)
+        """
+        self.state_path = state_path
+        self._queue = queue.Queue()
+        self._pending = set()  # 대기 중이거나 실행 중인 작업 이름
+        self._lock = threading.Lock()
+        self._state = {}
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"스케줄러 상태 파일 읽기 실패: {e}")
+        self._thread = threading.Thread(target=self._work, name="scheduler-worker", daemon=True)
+        self._thread.start()
+    
+    def submit(self, name, func, covers=()):
+        """
+        작업을 실행 대기열에 넣습니다. 같은 작업이 이미 대기 중이거나 실행 중이면 건너뜁니다.
+        
+        Args:
+            name: 작업 이름
+            func: 실행할 함수 (False를 반환하면 실패로 보고 실행 시각을 기록하지 않음)
+            covers: 이 작업이 성공하면 함께 완료로 기록할 작업 이름 (예: 월별 작업은 수집도 함께 수행)
+        
+        Returns:
+            대기열에 넣었으면 True
+        """
+        with self._lock:
+            if name in self._pending:
+                logging.warning(f"작업 {name}이(가) 아직 실행 중이어서 이번 실행은 건너뜁니다")
+                return False
+            self._pending.add(name)
+        self._queue.put((name, func, covers))
+        return True
+    
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            name, func, covers = item
+            try:
+                started = datetime.now()
+                if func() is not False:
+                    for covered in (name, *covers):
+                        self.mark(covered, started)
+            except Exception as e:
+                logging.error(f"작업 {name} 실행 오류: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(name)
+    
+    def last_run(self, name):
+        """작업의 마지막 성공 시각 (기록이 없으면 None)"""
+        with self._lock:
+            value = self._state.get(name)
+        return datetime.fromisoformat(value) if value else None
+    
+    def mark(self, name, when=None):
+        """작업의 마지막 성공 시각을 기록합니다."""
+        with self._lock:
+            self._state[name] = (when or datetime.now()).isoformat(timespec='seconds')
+            try:
+                tmp_path = f"{self.state_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._state, f)
+                os.replace(tmp_path, self.state_path)
+            except OSError as e:
+                logging.warning(f"스케줄러 상태 저장 실패: {e}")
+    
+    def stop(self, timeout=None):
+        """대기 중인 작업을 마친 뒤 작업 스레드를 종료합니다."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+def last_deadline(now, at, monthly=False):
+    """
+    now 이전(포함)의 가장 최근 예정 시각을 반환합니다.
+    
+    Args:
+        at: 'HH:MM'
+        monthly: True면 매월 1일 at, False면 매일 at
+    """
+    hour, minute = map(int, at.split(':'))
+    deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if monthly:
+        deadline = deadline.replace(day=1)
+        if deadline > now:
+            deadline = (deadline - timedelta(days=1)).replace(day=1)
+    elif deadline > now:
+        deadline -= timedelta(days=1)
+    return deadline
+
+def catch_up(runner, now=None):
+    """
+    꺼져 있던 동안 놓친 작업을 한 번씩 실행합니다. (여러 번 놓쳤어도 최신 데이터로 한 번만 수집)
+    
+    처음 실행이라 기록이 없으면 실행하지 않고 현재 시각을 기준으로 기록합니다.
+    
+    Returns:
+        놓쳐서 실행하게 된 작업 이름 리스트 (다른 작업이 함께 처리하는 작업 포함)
+    """
+    now = now or datetime.now()
+    submitted = []
+    # 월별 작업도 데이터를 수집하므로 월별 작업을 실행하면 일일 작업은 따로 실행하지 않음
+    for name, func, at, monthly, covers in (('monthly', job_monthly_reset, MONTHLY_AT, True, ('daily',)),
+                                            ('daily', job_daily_update, DAILY_AT, False, ())):
+        last = runner.last_run(name)
+        if last is None:
+            runner.mark(name, now)
+            continue
+        deadline = last_deadline(now, at, monthly)
+        if last < deadline and name not in submitted:
+            logging.info(f"놓친 작업 실행: {name} (예정 {deadline:%Y-%m-%d %H:%M}, 마지막 실행 {last:%Y-%m-%d %H:%M})")
+            if runner.submit(name, func, covers):
+                submitted += [name, *covers]
+    return submitted
+
 def job_daily_update():
-    """매일 오후 4시에 실행되는 작업"""
+    """매일 오후 4시에 실행되는 작업 (휴장일에는 새 시세가 없으므로 건너뜀)"""
+    if not is_trading_day(datetime.now()):
+        logging.info("📅 휴장일이므로 일일 업데이트를 건너뜁니다")
+        return True
+    
     logging.info("📅 일일 업데이트 작업 시작")
-    scheduler = KOSPI200Scheduler()
-    success = scheduler.collect_and_update_data()
+    success = get_scheduler().collect_and_update_data()
     
     if success:
         logging.info("✅ 일일 업데이트 완료")
     else:
         logging.error("❌ 일일 업데이트 실패")
+    return success
 
 def job_monthly_reset():
-    """매월 1일에 실행되는 작업"""
+    """매월 1일에 실행되는 작업 (실패하면 일일 작업도 완료로 기록하지 않아 다시 실행됨)"""
     logging.info("📅 월별 파일 생성 작업 시작")
-    scheduler = KOSPI200Scheduler()
-    scheduler.create_monthly_file()
-    logging.info("✅ 월별 파일 생성 완료")
+    success = get_scheduler().create_monthly_file()
+    
+    if success:
+        logging.info("✅ 월별 파일 생성 완료")
+    else:
+        logging.error("❌ 월별 파일 생성 실패")
+    return success
 
 def main():
     """메인 스케줄러 실행 함수"""
+    import schedule
+    
     print("🚀 코스피 200 RSI 자동 업데이트 스케줄러 시작")
     print("=" * 50)
     
+    # 작업은 작업 스레드에서 하나씩 실행 (스케줄 확인은 막지 않음)
+    runner = JobRunner()
+    
     # 스케줄 설정
-    schedule.every().day.at("16:00").do(job_daily_update)  # 매일 오후 4시
+    schedule.every().day.at(DAILY_AT).do(runner.submit, 'daily', job_daily_update)  # 매일 오후 4시
     
     # 매월 1일 체크 함수
     def check_monthly_reset():
         if datetime.now().day == 1:  # 매월 1일에만 실행
-            job_monthly_reset()
+            runner.submit('monthly', job_monthly_reset, covers=('daily',))
     
-    schedule.every().day.at("09:00").do(check_monthly_reset)  # 매일 오전 9시에 체크
+    schedule.every().day.at(MONTHLY_AT).do(check_monthly_reset)  # 매일 오전 9시에 체크
     
     # 현재 상태 출력
-    scheduler = KOSPI200Scheduler()
+    scheduler = get_scheduler()
     status = scheduler.get_status()
     
     print(f"📁 표시 파일: {status['display_file']} ({'존재' if status['display_exists'] else '없음'})")
@@ -229,14 +453,19 @@ def main():
     print("=" * 50)
     print("종료하려면 Ctrl+C를 누르세요...")
     
+    catch_up(runner)
+    
     try:
         while True:
             schedule.run_pending()
-            time.sleep(60)  # 1분마다 체크
+            # 다음 예정 시각까지 대기
+            idle = schedule.idle_seconds()
+            time.sleep(min(max(idle, 0), MAX_SLEEP) if idle is not None else MAX_SLEEP)
             
     except KeyboardInterrupt:
         print("\n⏹️ 스케줄러가 중단되었습니다.")
         logging.info("스케줄러가 사용자에 의해 중단되었습니다.")
+        runner.stop(timeout=5)
 
 if __name__ == "__main__":
     # 명령줄 인자 처리
@@ -258,10 +487,24 @@ if __name__ == "__main__":
             for key, value in status.items():
                 print(f"   {key}: {value}")
                 
+        elif sys.argv[1] == "compact":
+            # 월별 파일 수동 압축
+            print("🗜️ 월별 파일 압축...")
+            records = scheduler.compact()
+            print(f"✅ 완료 ({records}개 레코드)")
+            
         elif sys.argv[1] == "newmonth":
             # 새로운 월 파일 생성
             print("📅 새로운 월 파일 생성...")
-            scheduler.create_monthly_file()
+            success = scheduler.create_monthly_file()
+            print("✅ 완료" if success else "❌ 실패")
+            
+        elif sys.argv[1] == "intraday":
+            # 장중 실시간 감시 (장 마감까지)
+            from intraday import IntradayMonitor
+            interval = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+            print(f"📡 장중 감시 시작 ({interval}초 주기, 15:30 종료)...")
+            IntradayMonitor(scheduler.collector, interval=interval).run()
             print("✅ 완료")
             
     else:
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목 선별 조건 규칙
+
+- 조건을 파이썬 비교식 형태의 문자열로 적고, 한 번 컴파일하여 그날 전체 결과에 벡터 연산으로 적용
+- 식에는 결과 열 이름(RSI7, RSI14, Yesterday_RSI7 등 계산된 모든 숫자 열), 숫자, 사칙연산,
+  비교(<, <=, >, >=, ==, !=), and/or/not, abs/min/max만 사용할 수 있음 (ast로 검사, eval 사용 안 함)
+- 규칙 중 하나라도 맞으면 선별되며, 종목마다 어떤 규칙이 맞았는지 함께 반환
+- screen_rules.json 파일로 규칙을 바꿀 수 있고, 파일이 없으면 기존 meets_rsi_conditions와 같은 기본 규칙 사용
+
+설정 파일 예:
+    {
+        "require": ["RSI7", "RSI14", "Yesterday_RSI7", "Yesterday_RSI14"],
+        "rules": [
+            {"name": "rsi7_oversold", "when": "RSI7 <= 25"},
+            {"name": "rsi14_rebound", "when": "Yesterday_RSI14 < 30 and RSI14 >= 30"}
+        ]
+    }
+"""
+
+import os
+import ast
+import json
+import logging
+
+import numpy as np
+
+RULES_FILENAME = "screen_rules.json"
+
+# 기본 규칙의 기준값 (기존 meets_rsi_conditions와 동일)
+DEFAULT_THRESHOLDS = {
+    'oversold': 30,       # RSI 이하면 과매도
+    'overbought': 70,     # RSI 이상이면 과매수
+    'rsi7_change': 5,     # RSI7 하루 변화량(절대값) 기준
+    'rsi14_change': 3,    # RSI14 하루 변화량(절대값) 기준
+    'center': 50,         # RSI7 중심선 돌파 기준
+}
+
+DEFAULT_REQUIRE = ['RSI7', 'RSI14', 'Yesterday_RSI7', 'Yesterday_RSI14']
+
+_COMPARE = {
+    ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater,
+    ast.GtE: np.greater_equal, ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+_BINARY = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+_FUNCTIONS = {'abs': np.abs, 'min': np.minimum, 'max': np.maximum}
+
+
+def _to_number(value):
+    """결과 값을 숫자로 변환합니다. 비어 있거나 숫자가 아니면 NaN"""
+    if value is None or value == '':
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def default_rules(thresholds=None):
+    """
+    기존 meets_rsi_conditions의 조건을 규칙 목록으로 만듭니다. (과매도/과매수와 돌파 방향은 규칙을 나눔)
+
+    Args:
+        thresholds: 기준값 (DEFAULT_THRESHOLDS 중 바꿀 항목만)
+    """
+    t = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    return [
+        {'name': 'rsi7_oversold', 'when': f"RSI7 <= {t['oversold']}"},
+        {'name': 'rsi7_overbought', 'when': f"RSI7 >= {t['overbought']}"},
+        {'name': 'rsi14_oversold', 'when': f"RSI14 <= {t['oversold']}"},
+        {'name': 'rsi14_overbought', 'when': f"RSI14 >= {t['overbought']}"},
+        {'name': 'rsi7_change', 'when': f"abs(RSI7 - Yesterday_RSI7) >= {t['rsi7_change']}"},
+        {'name': 'rsi14_change', 'when': f"abs(RSI14 - Yesterday_RSI14) >= {t['rsi14_change']}"},
+        {'name': 'rsi7_cross_up', 'when': f"Yesterday_RSI7 <= {t['center']} and RSI7 > {t['center']}"},
+        {'name': 'rsi7_cross_down', 'when': f"Yesterday_RSI7 >= {t['center']} and RSI7 < {t['center']}"},
+    ]
+
+
+def compile_expression(text):
+    """
+    조건식을 검사하여 {열 이름: 배열} -> 불리언 배열 함수로 컴파일합니다.
+
+    Returns:
+        (평가 함수, 식에서 사용한 열 이름 집합) 튜플
+
+    Raises:
+        ValueError: 허용되지 않는 문법이나 함수를 사용한 경우
+    """
+    try:
+        tree = ast.parse(text, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"조건식 문법 오류: {text} ({e.msg})")
+
+    names = set()
+
+    def build(node):
+        if isinstance(node, ast.Expression):
+            return build(node.body)
+
+        if isinstance(node, ast.BoolOp):
+            parts = [build(value) for value in node.values]
+            reduce = np.logical_and.reduce if isinstance(node.op, ast.And) else np.logical_or.reduce
+            return lambda columns: reduce([part(columns) for part in parts])
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = build(node.operand)
+            return lambda columns: np.logical_not(operand(columns))
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand = build(node.operand)
+            return lambda columns: np.negative(operand(columns))
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            func = _BINARY[type(node.op)]
+            left, right = build(node.left), build(node.right)
+            return lambda columns: func(left(columns), right(columns))
+
+        if isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            # 연쇄 비교(a < b < c)는 인접한 비교를 and로 결합
+            operands = [build(node.left)] + [build(comparator) for comparator in node.comparators]
+            funcs = [_COMPARE[type(op)] for op in node.ops]
+
+            def compare(columns):
+                values = [operand(columns) for operand in operands]
+                return np.logical_and.reduce([
+                    func(values[i], values[i + 1]) for i, func in enumerate(funcs)
+                ])
+            return compare
+
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in _FUNCTIONS and node.args and not node.keywords):
+            func = _FUNCTIONS[node.func.id]
+            args = [build(arg) for arg in node.args]
+            if node.func.id == 'abs':
+                if len(args) != 1:
+                    raise ValueError(f"abs()는 인자가 하나여야 합니다: {text}")
+                return lambda columns: func(args[0](columns))
+
+            def reduce_args(columns):
+                result = args[0](columns)
+                for arg in args[1:]:
+                    result = func(result, arg(columns))
+                return result
+            return reduce_args
+
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+            name = node.id
+            return lambda columns: columns[name]
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            value = float(node.value)
+            return lambda columns: value
+
+        raise ValueError(f"조건식에 사용할 수 없는 표현입니다: {ast.dump(node)[:60]} ({text})")
+
+    func = build(tree)
+    return func, names
+
+
+class Screen:
+    def __init__(self, rules=None, require=None):
+        """
+        Args:
+            rules: [{'name': 규칙 이름, 'when': 조건식}, ...] (None이면 기본 규칙)
+            require: 값이 모두 있어야(NaN이 아님) 규칙을 적용하는 열 목록 (None이면 기본 목록)
+        """
+        rules = default_rules() if rules is None else rules
+        self.require = list(DEFAULT_REQUIRE if require is None else require)
+        self.rules = []
+        self.columns = set(self.require)
+
+        for index, rule in enumerate(rules):
+            name = rule.get('name') or f"rule{index + 1}"
+            func, names = compile_expression(rule['when'])
+            self.rules.append((name, rule['when'], func))
+            self.columns |= names
+
+        if not self.rules:
+            raise ValueError("선별 규칙이 하나도 없습니다")
+
+    @property
+    def names(self):
+        return [name for name, _, _ in self.rules]
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        설정 파일에서 규칙을 읽습니다. 경로가 없거나 파일이 없으면 기본 규칙을 사용합니다.
+
+        Raises:
+            ValueError: 설정 파일 형식이나 조건식이 잘못된 경우
+        """
+        if not path or not os.path.exists(path):
+            return cls()
+
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                config = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"선별 규칙 파일 형식 오류: {path} ({e})")
+
+        screen = cls(config.get('rules'), config.get('require'))
+        logging.info(f"선별 규칙 {len(screen.rules)}개 적용: {path}")
+        return screen
+
+    def masks(self, columns):
+        """
+        열 배열(1차원 또는 2차원)에 규칙을 적용합니다.
+
+        Args:
+            columns: {열 이름: 배열} (규칙에서 쓰는 열이 모두 있어야 함, 결측은 NaN)
+
+        Returns:
+            {규칙 이름: 불리언 배열} 딕셔너리 (require 열이 비어 있는 위치는 False)
+        """
+        missing = self.columns - set(columns)
+        if missing:
+            raise KeyError(f"선별 규칙에 필요한 열이 없습니다: {', '.join(sorted(missing))}")
+
+        shape = np.shape(columns[next(iter(self.columns))]) if self.columns else np.shape(next(iter(columns.values())))
+        ready = np.ones(shape, dtype=bool)
+        for name in self.require:
+            ready &= ~np.isnan(columns[name])
+
+        masks = {}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for name, _, func in self.rules:
+                masks[name] = np.broadcast_to(func(columns), shape) & ready
+        return masks
+
+    def evaluate(self, records):
+        """
+        그날 전체 결과에 규칙을 한 번에 적용합니다.
+
+        Args:
+            records: 결과 딕셔너리 리스트
+
+        Returns:
+            (선별 여부 불리언 배열, 종목별로 맞은 규칙 이름 리스트의 리스트) 튜플
+        """
+        columns = {}
+        for name in self.columns:
+            values = [_to_number(record.get(name)) for record in records]
+            if records and all(name not in record for record in records):
+                logging.warning(f"선별 규칙의 열 {name}이(가) 결과에 없습니다 (해당 조건은 항상 거짓)")
+            columns[name] = np.array(values, dtype=float)
+
+        masks = self.masks(columns)
+        names = self.names
+        table = np.column_stack([masks[name] for name in names]) if records else np.zeros((0, len(names)), bool)
+        fired = [[names[j] for j in np.flatnonzero(row)] for row in table]
+        return table.any(axis=1), fired
@@ -14,6 +14,9 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // 데이터 저장소
     let allData = [];
+    // 불러온 원래 순서의 데이터와 미리 계산된 정렬 순서 (JSON으로 불러온 경우)
+    let baseData = [];
+    let sortOrders = null;
     
     // 정렬 상태 저장
     let sortConfig = {
@@ -43,21 +46,44 @@ document.addEventListener('DOMContentLoaded', function() {
     function loadData() {
         showLoading();
         
-        // 코스피200 CSV 파일 로드
+        // 코스피200 데이터 파일 (JSON을 먼저 시도하고 없으면 CSV 사용)
+        const jsonFile = 'results_코스피_200.json';
         const csvFile = 'results_코스피_200.csv';
         
         // 데이터 초기화
         allData = [];
+        baseData = [];
+        sortOrders = null;
         
-        fetch(csvFile)
+        // 'no-cache': 캐시된 사본을 쓰기 전에 항상 ETag로 재검증 (변경 없으면 304로 본문 전송 생략)
+        fetch(jsonFile, { cache: 'no-cache' })
             .then(response => {
                 if (!response.ok) {
                     throw new Error(`HTTP error! status: ${response.status}`);
                 }
-                return response.text();
+                return response.json();
             })
-            .then(csv => {
-                allData = parseCSV(csv);
+            .then(payload => {
+                baseData = parsePayload(payload);
+                sortOrders = payload.order || null;
+                return baseData;
+            })
+            .catch(error => {
+                console.log(`Error loading ${jsonFile}: ${error.message}, CSV로 대체합니다`);
+                return fetch(csvFile, { cache: 'no-cache' })
+                    .then(response => {
+                        if (!response.ok) {
+                            throw new Error(`HTTP error! status: ${response.status}`);
+                        }
+                        return response.text();
+                    })
+                    .then(csv => {
+                        baseData = parseCSV(csv);
+                        return baseData;
+                    });
+            })
+            .then(data => {
+                allData = data.slice();
                 if (allData.length > 0) {
                     renderTable();
                     updateStats();
@@ -73,6 +99,30 @@ document.addEventListener('DOMContentLoaded', function() {
             });
     }
 
+    // 열 단위 JSON 변환 함수 (종목/날짜 사전을 풀어 행 객체로 변환, 숫자는 이미 변환되어 있음)
+    function parsePayload(payload) {
+        const columns = payload.columns;
+        const result = new Array(payload.count);
+        
+        for (let i = 0; i < payload.count; i++) {
+            const stock = payload.stocks[columns.stock[i]];
+            result[i] = {
+                Ticker: stock[0],
+                Name: stock[1],
+                Industry: stock[2],
+                Date: payload.dates[columns.date[i]],
+                RSI7: columns.RSI7[i],
+                RSI14: columns.RSI14[i],
+                Yesterday_RSI7: columns.Yesterday_RSI7[i],
+                Yesterday_RSI14: columns.Yesterday_RSI14[i],
+                RSI7_Change: columns.RSI7_Change[i],
+                RSI14_Change: columns.RSI14_Change[i]
+            };
+        }
+        
+        return result;
+    }
+
     // CSV 파싱 함수
     function parseCSV(csv) {
         const lines = csv.split('\n');
@@ -134,6 +184,16 @@ document.addEventListener('DOMContentLoaded', function() {
         
         tableHeaders[columnIndex].classList.add(direction === 'asc' ? 'sort-asc' : 'sort-desc');
         
+        // 미리 계산된 정렬 순서가 있으면 비교 없이 그대로 사용 (내림차순은 뒤집기)
+        if (sortOrders && sortOrders[column]) {
+            allData = sortOrders[column].map(index => baseData[index]);
+            if (direction === 'desc') {
+                allData.reverse();
+            }
+            renderTable();
+            return;
+        }
+        
         // 데이터 정렬
         allData.sort((a, b) => {
             let valueA = a[column] ? a[column] : '';
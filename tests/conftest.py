@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공통 설정
+
+- 저장소 루트의 모듈을 import 할 수 있도록 경로 추가
+- 네이버증권 실시간 시세(polling, 일괄 조회), 차트 API(fchart), 종목 페이지(item)를 흉내 내는 로컬 서버
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class NaverStub:
+    """
+    종목코드로 정해지는 가격 이력을 돌려주는 네이버증권 스텁 서버
+
+    Attributes:
+        session: 마지막 일봉 날짜 (numpy datetime64[D], 이전 일봉은 영업일 간격)
+        history_days: 종목별 가격 이력 길이 (차트 API가 돌려줄 수 있는 최대 일봉 수)
+        latency: 응답 지연 (초)
+        fail: HTTP 500으로 응답할 엔드포인트 이름 집합 ('polling', 'bulk', 'fchart', 'item')
+        requests: 엔드포인트별 요청 수
+        max_in_flight: 동시에 처리 중이던 요청 수의 최댓값
+    """
+
+    def __init__(self):
+        self.session = np.datetime64('2025-07-21', 'D')
+        self.history_days = 120
+        self.latency = 0.0
+        self.fail = set()
+        self.prices = {}
+        self.requests = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def closes(self, ticker, days=None):
+        days = days or self.history_days
+        if ticker in self.prices:
+            return np.asarray(self.prices[ticker], dtype=float)[-days:]
+        rng = np.random.default_rng(int(ticker))
+        return np.round(20000 * np.cumprod(1 + rng.normal(0, 0.02, self.history_days)))[-days:]
+
+    def dates(self, count):
+        days = np.busday_offset(self.session, np.arange(-count + 1, 1), roll='backward')
+        return [str(day).replace('-', '') for day in days]
+
+    def count(self, endpoint):
+        with self.lock:
+            return self.requests.get(endpoint, 0)
+
+    def reset(self):
+        with self.lock:
+            self.requests = {}
+            self.max_in_flight = 0
+
+    def point(self, collector):
+        """수집기가 이 서버로 요청하도록 엔드포인트 주소를 바꿉니다."""
+        collector.POLLING_URL = self.url + "/api/realtime/domestic/stock/{ticker}"
+        collector.BULK_QUOTE_URL = self.url + "/api/realtime?query=SERVICE_ITEM:{tickers}"
+        collector.FCHART_URL = self.url + "/sise.nhn?symbol={ticker}&timeframe=day&count={days}&requestType=0"
+        collector.ITEM_URL = self.url + "/item/main.naver?code={ticker}"
+        collector.delay = 0
+        return collector
+
+    def render(self, endpoint, query, path):
+        if endpoint == 'bulk':
+            tickers = query['query'][0].split(':', 1)[-1].split(',')
+            datas = [{'cd': ticker, 'nv': float(self.closes(ticker)[-1])} for ticker in tickers]
+            return json.dumps({'result': {'areas': [{'datas': datas}]}})
+        if endpoint == 'polling':
+            return json.dumps({'closePrice': str(int(self.closes(path.rsplit('/', 1)[-1])[-1]))})
+        if endpoint == 'fchart':
+            ticker, count = query['symbol'][0], int(query['count'][0])
+            closes = self.closes(ticker)[-count:]
+            items = ''.join(
+                f'<item data="{day}|{close:.0f}|{close * 1.01:.0f}|{close * 0.99:.0f}|{close:.0f}|1000" />'
+                for day, close in zip(self.dates(len(closes)), closes)
+            )
+            return f'<?xml version="1.0" encoding="EUC-KR" ?><protocol><chartdata symbol="{ticker}">{items}</chartdata></protocol>'
+        close = self.closes(query['code'][0])[-1]
+        return f'<p class="no_today"><em class="no_up"><span class="blind">{int(close):,}</span></em></p>'
+
+
+def _handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == '/api/realtime':
+                endpoint = 'bulk'
+            elif url.path.startswith('/api/realtime/'):
+                endpoint = 'polling'
+            elif url.path == '/sise.nhn':
+                endpoint = 'fchart'
+            else:
+                endpoint = 'item'
+
+            with stub.lock:
+                stub.requests[endpoint] = stub.requests.get(endpoint, 0) + 1
+                stub.in_flight += 1
+                stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            try:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if endpoint in stub.fail:
+                    status, body = 500, b'error'
+                else:
+                    status, body = 200, stub.render(endpoint, parse_qs(url.query), url.path).encode('utf-8')
+            finally:
+                with stub.lock:
+                    stub.in_flight -= 1
+
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def naver_stub():
+    stub = NaverStub()
+    stub.server = ThreadingHTTPServer(('127.0.0.1', 0), _handler(stub))
+    stub.server.daemon_threads = True
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+def make_stocks(count, start=1):
+    return [{'ticker': f"{i:06d}", 'name': f"종목{i}", 'industry': '기타'} for i in range(start, start + count)]
+
+
+@pytest.fixture
+def market_now(monkeypatch):
+    """거래일 달력이 보는 현재 시각을 고정합니다. (market_now('2025-07-21 16:00'))"""
+    import market_calendar
+
+    market_calendar.set_holidays([])
+
+    def freeze(value):
+        frozen = datetime.strptime(value, '%Y-%m-%d %H:%M')
+
+        class FrozenDateTime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return frozen
+
+        monkeypatch.setattr(market_calendar, 'datetime', FrozenDateTime)
+        return frozen
+
+    yield freeze
+    market_calendar.set_holidays(None)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""백테스트용 일봉 백필: 긴 이력을 캐시에 채우고, 이후 매일 수집에서도 그 길이를 유지하는지 확인"""
+
+import numpy as np
+
+from conftest import make_stocks
+
+from backtest import run_backtest, evaluate
+from data_collector import NaverStockDataCollector
+from price_cache import PriceCache
+
+
+def test_backfill_keeps_long_history(naver_stub, tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    market_now('2025-07-21 16:00')
+    naver_stub.history_days = 800
+    tickers = [stock['ticker'] for stock in make_stocks(3)]
+
+    collector = naver_stub.point(NaverStockDataCollector(cache_dir="price_cache", cache_max_bars=800))
+    assert collector.backfill_cache(tickers, 800) == 3
+    bars = PriceCache("price_cache").load(tickers[0])
+    assert len(bars) == 800
+    assert bars['close'].tolist() == naver_stub.closes(tickers[0]).tolist()
+
+    # 다음 거래일 수집은 기본 보관 한도(500)로도 백필한 이력을 줄이지 않음
+    naver_stub.session += 1
+    market_now('2025-07-22 16:00')
+    daily = naver_stub.point(NaverStockDataCollector(cache_dir="price_cache"))
+    assert daily.get_stock_price_data(tickers[0], 30) is not None
+    bars = PriceCache("price_cache").load(tickers[0])
+    assert len(bars) == 800
+    assert bars['date'][-1] == 20250722
+
+    report = run_backtest("price_cache", workers=1)
+    assert report['days'] == 3 * (800 - 15)
+
+
+def test_default_rsi_is_wilder():
+    closes = np.round(20000 * np.cumprod(1 + np.random.default_rng(0).normal(0, 0.02, (4, 200)), axis=1))
+    assert evaluate(closes) == evaluate(closes, wilder=True)
+    assert evaluate(closes) != evaluate(closes, wilder=False)
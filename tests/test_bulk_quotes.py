@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""현재가 일괄 조회: 묶음 요청 수와 결과, 미리 받은 현재가가 엔드포인트 통계에 섞이지 않는지 확인"""
+
+from conftest import make_stocks
+
+from data_collector import NaverStockDataCollector
+
+
+def test_bulk_quotes_are_batched(naver_stub):
+    collector = naver_stub.point(NaverStockDataCollector(bulk_batch_size=50))
+    tickers = [stock['ticker'] for stock in make_stocks(120)]
+
+    quotes = collector.get_bulk_quotes(tickers)
+
+    assert naver_stub.count('bulk') == 3
+    assert quotes == {ticker: float(naver_stub.closes(ticker)[-1]) for ticker in tickers}
+
+
+def test_failed_batch_returns_no_quotes(naver_stub):
+    naver_stub.fail = {'bulk'}
+    collector = naver_stub.point(NaverStockDataCollector(bulk_batch_size=50))
+
+    assert collector.get_bulk_quotes(['005930', '000660']) == {}
+
+
+def test_prefetched_quotes_skip_router(naver_stub):
+    collector = naver_stub.point(NaverStockDataCollector(bulk_batch_size=50))
+    tickers = [stock['ticker'] for stock in make_stocks(5)]
+    collector._quotes = collector.get_bulk_quotes(tickers)
+
+    for ticker in tickers:
+        assert collector.get_current_price(ticker) == float(naver_stub.closes(ticker)[-1])
+
+    # 미리 받은 현재가는 실시간 시세 요청도, 엔드포인트 통계 기록도 없음
+    assert naver_stub.count('polling') == 0
+    assert collector.router.stats() == {}
+
+    # 미리 받은 현재가를 다 쓴 뒤에는 실제로 요청하고 통계에 기록
+    assert collector.get_current_price(tickers[0]) == float(naver_stub.closes(tickers[0])[-1])
+    assert naver_stub.count('polling') == 1
+    assert collector.router.stats()['polling']['attempts'] == 1
+
+
+def test_collect_all_data_uses_prefetched_quotes(naver_stub, tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    market_now('2025-07-21 16:00')
+    stocks = make_stocks(120)
+    collector = naver_stub.point(NaverStockDataCollector(bulk_batch_size=50))
+    monkeypatch.setattr(collector, 'get_kospi200_list', lambda: stocks)
+
+    collector.collect_all_data()
+
+    # 상태 파일 없이 처음 수집해도 종목별 실시간 시세 요청 없이 일괄 조회 3회로 현재가를 받음
+    assert naver_stub.count('bulk') == 3
+    assert naver_stub.count('polling') == 0
+    assert naver_stub.count('item') == 0
+    assert 'polling' not in collector.router.stats()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""동시 수집 모드: 순차 수집과 결과가 같고 호스트별 동시 요청 상한을 지키는지 확인"""
+
+from conftest import make_stocks
+
+from data_collector import NaverStockDataCollector
+
+
+def make_collector(stub, stocks, **kwargs):
+    collector = stub.point(NaverStockDataCollector(**kwargs))
+    collector.get_kospi200_list = lambda: stocks
+    return collector
+
+
+def test_concurrent_matches_sequential(naver_stub, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # 실시간 시세는 실패시켜 차트 API의 실제 일봉으로만 계산 (결과가 항상 같음)
+    naver_stub.fail = {'polling'}
+    stocks = make_stocks(12)
+
+    sequential = make_collector(naver_stub, stocks, max_workers=1)
+    concurrent = make_collector(naver_stub, stocks, max_workers=6, per_host_limit=3)
+
+    all_sequential = sequential._collect_sequential(stocks)
+    all_concurrent = concurrent._collect_concurrent(stocks, 6)
+    assert all(all_sequential)
+    assert all_concurrent == all_sequential
+
+    filtered_sequential = sequential.collect_all_data()
+    filtered_concurrent = concurrent.collect_all_data()
+    assert filtered_sequential
+    assert filtered_concurrent == filtered_sequential
+
+
+def test_per_host_limit(naver_stub, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    naver_stub.fail = {'polling'}
+    naver_stub.latency = 0.02
+    stocks = make_stocks(16)
+
+    collector = make_collector(naver_stub, stocks, max_workers=8, per_host_limit=3)
+    outcomes = collector._collect_concurrent(stocks, 8)
+
+    assert all(outcomes)
+    assert 1 < naver_stub.max_in_flight <= 3
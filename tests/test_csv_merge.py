@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""스트리밍 병합: 정렬 구간이 행 수와 크기 상한을 넘지 않고, 구간을 나눠도 결과가 같은지 확인"""
+
+import csv
+
+import pytest
+
+import csv_merge
+from csv_merge import merge_csv_files
+
+
+def write_results(path, rows, note=''):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Ticker', 'Date', 'RSI14', 'Note'])
+        for ticker, date, rsi in rows:
+            writer.writerow([ticker, date, rsi, note])
+
+
+def read_results(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return [(row['Ticker'], row['Date'], row['RSI14']) for row in csv.DictReader(f)]
+
+
+@pytest.fixture
+def run_sizes(monkeypatch):
+    """정렬 구간마다 (행 수, 행 내용 크기)를 기록합니다."""
+    sizes = []
+    write_run = csv_merge._write_run
+
+    def recording(directory, entries):
+        entries = list(entries)
+        sizes.append((len(entries), sum(csv_merge._row_size(values) for _, _, values in entries)))
+        return write_run(directory, entries)
+
+    monkeypatch.setattr(csv_merge, '_write_run', recording)
+    return sizes
+
+
+def make_inputs(tmp_path, note=''):
+    old = [(f"{i:06d}", f"2025-07-{day:02d}", '40') for i in range(1, 6) for day in (18, 21)]
+    new = [('000003', '2025-07-21', '25'), ('000007', '2025-07-21', '31')]
+    write_results(tmp_path / "old.csv", old, note)
+    write_results(tmp_path / "new.csv", new, note)
+    return [str(tmp_path / "old.csv"), str(tmp_path / "new.csv")]
+
+
+def test_chunk_rows_bounds_each_run(tmp_path, run_sizes):
+    files = make_inputs(tmp_path)
+    whole = str(tmp_path / "whole.csv")
+    chunked = str(tmp_path / "chunked.csv")
+
+    assert merge_csv_files(files, whole) == 11
+    assert run_sizes == []
+    assert merge_csv_files(files, chunked, chunk_rows=3) == 11
+    assert len(run_sizes) == 4 and max(rows for rows, _ in run_sizes) <= 3
+
+    rows = read_results(chunked)
+    assert rows == read_results(whole)
+    assert rows[:3] == [('000001', '2025-07-21', '40'), ('000002', '2025-07-21', '40'), ('000003', '2025-07-21', '25')]
+
+
+def test_chunk_bytes_bounds_wide_rows(tmp_path, run_sizes):
+    files = make_inputs(tmp_path, note='x' * 1000)
+    output = str(tmp_path / "merged.csv")
+
+    assert merge_csv_files(files, output, chunk_rows=50000, chunk_bytes=2500) == 11
+    # 행 하나가 약 1KB이므로 행 수 상한과 관계없이 세 번째 행에서 구간을 비움
+    assert len(run_sizes) == 4
+    assert all(rows <= 3 and size < 2500 + 1100 for rows, size in run_sizes)
+    assert len(read_results(output)) == 11
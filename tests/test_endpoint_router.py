@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""엔드포인트 선택: 실패하는 엔드포인트는 뒤로 밀리고, 정해진 횟수마다 기본 순서로 다시 확인하며, 고정한 엔드포인트는 항상 먼저인지 확인"""
+
+from data_collector import NaverStockDataCollector
+from endpoint_router import EndpointRouter
+
+
+def test_failing_endpoint_is_demoted_and_reprobed():
+    router = EndpointRouter(reprobe_interval=5)
+    assert router.order('005930', ('polling', 'html')) == ['polling', 'html']
+
+    for _ in range(5):
+        router.record('005930', 'polling', False, 0.1)
+        router.record('005930', 'html', True, 0.2)
+
+    # 2~4번째, 6~9번째 호출은 통계 순서, 5·10번째 호출은 기본 순서로 재확인
+    orders = [router.order('005930', ('polling', 'html')) for _ in range(9)]
+    assert orders[:3] == [['html', 'polling']] * 3
+    assert orders[3] == ['polling', 'html']
+    assert orders[4:8] == [['html', 'polling']] * 4
+    assert orders[8] == ['polling', 'html']
+
+
+def test_ties_prefer_faster_endpoint_and_fall_back_to_global_stats():
+    router = EndpointRouter(reprobe_interval=1000)
+    for _ in range(4):
+        router.record('005930', 'polling', True, 0.5)
+        router.record('005930', 'html', True, 0.1)
+
+    assert router.order('005930', ('polling', 'html')) == ['html', 'polling']
+    # 기록이 없는 종목은 전체 통계를 사용
+    assert router.order('000660', ('polling', 'html')) == ['html', 'polling']
+
+
+def test_pinned_tier_stays_first():
+    collector = NaverStockDataCollector()
+    for _ in range(10):
+        collector.router.record('005930', 'fchart', False, 2.0)
+        collector.router.record('005930', 'polling', True, 0.01)
+
+    calls = []
+
+    def tier(name, result):
+        return lambda: calls.append(name) or result
+
+    tiers = {'fchart': tier('fchart', None), 'polling': tier('polling', [1.0]), 'html': tier('html', [2.0])}
+    assert collector._route('005930', tiers, ('fchart', 'polling', 'html'), pinned=('fchart',)) == ('polling', [1.0])
+    assert calls == ['fchart', 'polling']
+
+    # 고정하지 않으면 통계에 따라 실패가 많은 차트 API를 마지막에 시도
+    calls.clear()
+    tiers['polling'] = tier('polling', None)
+    assert collector._route('005930', tiers, ('fchart', 'polling', 'html')) == ('html', [2.0])
+    assert calls == ['polling', 'html']
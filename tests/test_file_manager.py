@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""파일 관리: 표시 파일이 아닌 파일의 백업은 원래 파일로 복구되고 표시 파일은 그대로인지 확인"""
+
+from file_manager import KOSPI200FileManager
+
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_restore_monthly_snapshot_to_its_source(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = KOSPI200FileManager()
+    monthly = manager.get_monthly_filename(2025, 6)
+    display = "Ticker,Date\n005930,2025-07-21\n"
+    write(manager.display_filename, display)
+    write(monthly, "Ticker,Date\n000660,2025-06-30\n")
+
+    snapshot_id = manager.create_backup(monthly)
+    write(monthly, "Ticker,Date\n")
+
+    assert manager.restore_from_backup(snapshot_id)
+    assert read(monthly) == "Ticker,Date\n000660,2025-06-30\n"
+    assert read(manager.display_filename) == display
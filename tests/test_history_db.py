@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""이력 데이터베이스: 다시 쓴 파티션과 같아지도록 적재하고, 산업군은 앞부분으로 조회하는지 확인"""
+
+import os
+
+from history_db import HistoryDB
+from result_store import ResultStore
+
+
+def result(ticker, industry='반도체와반도체장비', rsi14=25.0):
+    return {'Ticker': ticker, 'Name': f"종목{ticker}", 'Industry': industry, 'Date': '2025-07-21',
+            'RSI7': 20.0, 'RSI14': rsi14, 'Yesterday_RSI7': 30.0, 'Yesterday_RSI14': 35.0}
+
+
+def rewrite_day(store, results, tick):
+    store.write_day('2025-07-21', results)
+    # 같은 초 안에 다시 써도 바뀐 파일로 보이도록 수정 시각을 옮김
+    path = store.partition_path('2025-07-21')
+    os.utime(path, ns=(tick, tick))
+
+
+def test_rewritten_partition_drops_removed_rows(tmp_path):
+    store = ResultStore(str(tmp_path / "results_store"))
+    with HistoryDB(str(tmp_path / "history.db")) as db:
+        rewrite_day(store, [result('000001'), result('000002'), result('000003')], 1_000_000_000)
+        db.sync(store=store, pattern=str(tmp_path / "*.none"))
+        assert [row['Ticker'] for row in db.query(start='2025-07-21')] == ['000001', '000002', '000003']
+
+        rewrite_day(store, [result('000001'), result('000002', rsi14=45.0)], 2_000_000_000)
+        assert db.sync(store=store, pattern=str(tmp_path / "*.none")) == 2
+        rows = db.query(start='2025-07-21')
+        assert [row['Ticker'] for row in rows] == ['000001', '000002']
+        assert rows[1]['RSI14'] == 45.0
+
+
+def test_industry_matches_prefix_of_full_name(tmp_path):
+    with HistoryDB(str(tmp_path / "history.db")) as db:
+        db.upsert([result('000660'), result('005380', industry='자동차'), result('035420', industry='반도체')])
+
+        assert [row['Ticker'] for row in db.query(industry='반도체')] == ['000660', '035420']
+        assert [row['Ticker'] for row in db.query(industry='반도체와반도체장비', rsi14_below=30)] == ['000660']
+        assert db.query(industry='도체') == []
+
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM results WHERE industry >= ? AND industry < ?", ('반도체', '반도체\U0010ffff')
+        ).fetchall()
+        assert 'idx_results_industry_date' in ' '.join(row[-1] for row in plan)
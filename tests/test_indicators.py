@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""보조지표 파이프라인: 상장일이 달라 앞부분이 비어 있는 종목도 단독 계산과 같은 MACD가 나오는지 확인"""
+
+import numpy as np
+
+from indicators import IndicatorPipeline
+
+
+def test_macd_warm_up_is_per_row():
+    rng = np.random.default_rng(1)
+    closes = np.round(20000 * np.cumprod(1 + rng.normal(0, 0.02, (2, 80)), axis=1))
+    closes[1, :30] = np.nan  # 30일 늦게 상장한 종목
+
+    together = IndicatorPipeline(closes).macd()
+    alone = IndicatorPipeline(closes[1:, 30:]).macd()
+
+    for both, single in zip(together, alone):
+        np.testing.assert_array_equal(both[1, 30:], single[0])
+        assert np.isnan(both[1, :30]).all()
+
+    line, signal, _ = together
+    assert np.isnan(line[1, :30 + 25]).all() and not np.isnan(line[1, 30 + 25])
+    assert np.isnan(signal[1, :30 + 33]).all() and not np.isnan(signal[1, 30 + 33])
+    assert not np.isnan(signal[0, 33])
+
+
+def test_ema_memo_is_keyed_on_series_name():
+    pipeline = IndicatorPipeline(np.arange(1.0, 61.0).reshape(1, -1))
+    pipeline.macd()
+    keys = [key for key in pipeline._cache if key[0] == 'ema']
+    assert sorted(keys) == [('ema', 'close', 12), ('ema', 'close', 26), ('ema', 'macd_12_26', 9)]
+    assert pipeline.ema('macd_12_26', 9) is pipeline._cache[('ema', 'macd_12_26', 9)]
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""장중 감시: 가격이 그대로면 이벤트가 없고, 상태가 바뀐 종목만 한 번 알리며, 늦거나 실패한 묶음은 이전 상태를 유지하고
+늦은 묶음이 끝나기 전에는 다시 요청하지 않는지 확인"""
+
+import time
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import make_stocks
+
+from data_collector import NaverStockDataCollector
+from intraday import IntradayMonitor
+from market_calendar import session_date
+from rsi_state import RSIStateStore
+from screen_rules import Screen
+
+
+class FakeFeed:
+    """현재가 일괄 조회(_fetch_bulk_quote_batch)를 대신하는 가격 공급원"""
+
+    def __init__(self, prices):
+        self.prices = dict(prices)
+        self.delay = {}    # {종목코드: 그 종목이 든 묶음의 응답 지연(초)}
+        self.broken = set()  # 조회하면 예외가 나는 묶음의 종목코드
+        self.calls = {}      # {종목코드: 그 종목이 든 묶음을 요청한 횟수}
+        self.lock = threading.Lock()
+
+    def __call__(self, tickers):
+        with self.lock:
+            for ticker in tickers:
+                self.calls[ticker] = self.calls.get(ticker, 0) + 1
+        delay = max((self.delay.get(ticker, 0.0) for ticker in tickers), default=0.0)
+        if delay:
+            time.sleep(delay)
+        if self.broken & set(tickers):
+            raise ConnectionError("feed down")
+        with self.lock:
+            return {ticker: self.prices[ticker] for ticker in tickers}
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    market_now('2025-07-21 10:00')
+    stocks = make_stocks(6)
+
+    collector = NaverStockDataCollector(per_host_limit=4, state_path="rsi_state.json")
+    rng = np.random.default_rng(3)
+    today = session_date()
+    for stock in stocks:
+        history = np.round(50000 * np.cumprod(1 + rng.normal(0.002, 0.01, 40)))
+        collector.rsi_state.seed(stock['ticker'], today, list(history))
+
+    monitor = IntradayMonitor(collector, interval=1, budget=2.0, batch_size=2, output_path=None)
+    assert monitor.prime(stocks) == 6
+
+    # 직전 거래일 종가 그대로에서 시작
+    monitor.feed = FakeFeed(zip((stock['ticker'] for stock in stocks), monitor._base['close']))
+    collector._fetch_bulk_quote_batch = monitor.feed
+    monitor.poll_once()
+    yield monitor
+    monitor.close()
+
+
+def test_frozen_feed_emits_nothing(monitor):
+    status = monitor._status.copy()
+    for _ in range(3):
+        assert monitor.poll_once() == []
+    np.testing.assert_array_equal(monitor._status, status)
+
+
+def test_status_flip_emits_one_event(monitor):
+    ticker = monitor.stocks[2]['ticker']
+    monitor.feed.prices[ticker] *= 0.8
+
+    events = monitor.poll_once()
+    assert [event['ticker'] for event in events] == [ticker]
+    assert events[0]['rules'] != events[0]['previous']
+    assert events[0]['RSI7'] < 30
+    # 같은 가격이면 다시 알리지 않음
+    assert monitor.poll_once() == []
+
+
+@pytest.mark.parametrize('failure', ['slow', 'broken'])
+def test_dropped_batch_keeps_previous_status(monitor, failure):
+    ticker = monitor.stocks[0]['ticker']
+    status = monitor._status.copy()
+    monitor.feed.prices[ticker] *= 0.8
+    if failure == 'slow':
+        monitor.feed.delay[ticker] = 1.0
+    else:
+        monitor.feed.broken.add(ticker)
+    monitor.budget = 0.3
+
+    start = time.monotonic()
+    events = monitor.poll_once()
+    elapsed = time.monotonic() - start
+
+    assert events == []
+    assert elapsed < 0.3 + 0.2
+    assert monitor.late_cycles == 1
+    np.testing.assert_array_equal(monitor._status, status)
+
+    # 다음 주기에 제시간에 받으면 그때 상태가 바뀜 (늦은 묶음은 끝난 뒤에 다시 요청)
+    monitor.feed.delay.clear()
+    monitor.feed.broken.clear()
+    if failure == 'slow':
+        time.sleep(1.0)
+    assert [event['ticker'] for event in monitor.poll_once()] == [ticker]
+
+
+def test_running_batch_is_not_resubmitted(monitor):
+    ticker = monitor.stocks[0]['ticker']
+    other = monitor.stocks[2]['ticker']  # 다른 묶음의 종목
+    monitor.feed.delay[ticker] = 0.8
+    monitor.budget = 0.2
+    calls = monitor.feed.calls[ticker]
+
+    # 늦은 묶음이 실행 중인 동안의 주기는 그 묶음을 다시 요청하지 않고 나머지만 조회
+    for _ in range(2):
+        monitor.poll_once()
+    assert monitor.feed.calls[ticker] == calls + 1
+    assert monitor.feed.calls[other] == calls + 2
+    assert monitor.late_cycles == 2
+
+    time.sleep(0.8)
+    monitor.feed.delay.clear()
+    monitor.poll_once()
+    assert monitor.feed.calls[ticker] == calls + 2
+
+
+def test_events_follow_state_periods(tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    market_now('2025-07-21 10:00')
+    stocks = make_stocks(2)
+
+    collector = NaverStockDataCollector(state_path="rsi_state.json")
+    collector.rsi_state = RSIStateStore("rsi_state.json", periods=(9, 21))
+    collector.screen = Screen([{'name': 'rsi9_oversold', 'when': "RSI9 <= 30"}], require=['RSI9'])
+    history = np.round(50000 * np.cumprod(1 + np.tile([0.01, -0.005], 20)))
+    for stock in stocks:
+        collector.rsi_state.seed(stock['ticker'], session_date(), list(history))
+
+    monitor = IntradayMonitor(collector, interval=1, budget=2.0, output_path="signals.jsonl")
+    try:
+        assert monitor.prime(stocks) == 2
+        feed = FakeFeed(zip((stock['ticker'] for stock in stocks), monitor._base['close']))
+        collector._fetch_bulk_quote_batch = feed
+        assert monitor.poll_once() == []
+
+        feed.prices[stocks[1]['ticker']] *= 0.8
+        events = monitor.poll_once()
+    finally:
+        monitor.close()
+
+    assert [event['ticker'] for event in events] == [stocks[1]['ticker']]
+    assert events[0]['rules'] == ['rsi9_oversold']
+    assert 'RSI9' in events[0] and 'RSI21' in events[0] and 'RSI7' not in events[0]
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""일봉 캐시: 장 마감 후 같은 날 다시 수집하면 요청이 없고, 장중에 받은 일봉은 마감 후 다시 받는지 확인"""
+
+import os
+
+import numpy as np
+
+from data_collector import NaverStockDataCollector
+from price_cache import PriceCache
+
+
+def make_collector(stub):
+    return stub.point(NaverStockDataCollector(cache_dir="price_cache"))
+
+
+def test_second_run_after_close_makes_no_requests(naver_stub, tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    market_now('2025-07-21 16:00')
+    expected = naver_stub.closes('005930')[-30:].tolist()
+
+    assert make_collector(naver_stub).get_stock_price_data('005930', 30) == expected
+    assert naver_stub.count('fchart') == 1
+
+    naver_stub.reset()
+    collector = make_collector(naver_stub)
+    assert collector.get_stock_price_data('005930', 30) == expected
+    assert naver_stub.requests == {}
+    assert collector.price_cache.stats()['hits'] == 1
+
+    # 다음 날 장 시작 전에도 마지막 거래일 종가는 확정되어 있으므로 요청 없음
+    market_now('2025-07-22 08:00')
+    assert make_collector(naver_stub).get_stock_price_data('005930', 30) == expected
+    assert naver_stub.requests == {}
+
+
+def test_intraday_cache_is_refreshed_after_close(naver_stub, tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    final = naver_stub.closes('005930')
+    partial = final.copy()
+    partial[-1] = final[-1] * 1.05
+
+    # 09:30에 받은 장중 일봉 (마지막 일봉이 확정 전 가격)
+    naver_stub.prices['005930'] = partial
+    morning = market_now('2025-07-21 09:30')
+    make_collector(naver_stub).get_stock_price_data('005930', 30)
+    path = os.path.join("price_cache", "005930.npy")
+    os.utime(path, (morning.timestamp(), morning.timestamp()))
+
+    # 같은 날 장중 재실행도 캐시를 그대로 쓰지 않음
+    assert not PriceCache("price_cache").is_fresh('005930')
+
+    naver_stub.prices['005930'] = final
+    naver_stub.reset()
+    market_now('2025-07-21 16:00')
+    prices = make_collector(naver_stub).get_stock_price_data('005930', 30)
+    assert naver_stub.count('fchart') == 1
+    assert prices == final[-30:].tolist()
+    assert len(np.load(path)) == 30
+
+
+def test_router_statistics_do_not_demote_fchart(naver_stub, tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    market_now('2025-07-21 16:00')
+    collector = make_collector(naver_stub)
+
+    # 차트 API가 느리고 실시간 시세가 빠르다고 기록되어 있어도 캐시를 채울 실제 일봉을 먼저 받음
+    for _ in range(10):
+        collector.router.record('005930', 'polling', True, 0.01)
+        collector.router.record('005930', 'fchart', True, 1.0)
+
+    assert collector.get_stock_price_data('005930', 30) == naver_stub.closes('005930')[-30:].tolist()
+    assert naver_stub.requests == {'fchart': 1}
+    assert os.path.exists(os.path.join("price_cache", "005930.npy"))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""응답 파서: 차트 API 일봉은 항목 수와 관계없이 같고, 종목 페이지 현재가는 기존 BeautifulSoup 방식과 같은지 확인"""
+
+import os
+import warnings
+
+import numpy as np
+import pytest
+from bs4 import BeautifulSoup
+
+import price_parser
+from price_parser import parse_fchart_sise, extract_current_price
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'naver')
+
+
+def response(items):
+    return ('<?xml version="1.0" encoding="EUC-KR" ?><protocol><chartdata symbol="005930">'
+            + ''.join(f'<item data="{item}" />' for item in items) + '</chartdata></protocol>').encode()
+
+
+def items(count):
+    return [f"202507{day:02d}|{64000 + day}|{65000 + day}|{63000 + day}|{64500 + day}|{1000 * day}"
+            for day in range(1, count + 1)]
+
+
+def test_small_and_large_responses_agree():
+    large = parse_fchart_sise(response(items(30)))
+    assert len(large) == 30
+    for count in (1, 2, 6, 7):
+        small = parse_fchart_sise(response(items(count)))
+        assert (small == large[:count]).all()
+    assert large['close'][-1] == 64530 and large['volume'][-1] == 30000
+
+
+def test_malformed_items_are_skipped():
+    for count in (2, 30):
+        rows = items(count)
+        rows[0] = "20250701|64000||63000|64500|1000"
+        bars = parse_fchart_sise(response(rows))
+        assert len(bars) == count - 1
+        assert bars['date'][0] == 20250702
+
+    # 응답이 중간에 끊겨 닫는 따옴표가 없는 마지막 항목은 건너뜀
+    content = response(items(2))
+    truncated = content[:content.rfind(b'" />')]
+    assert parse_fchart_sise(truncated)['date'].tolist() == [20250701]
+    assert len(parse_fchart_sise(b'<chartdata></chartdata>')) == 0
+    assert parse_fchart_sise(b'').dtype == np.dtype(parse_fchart_sise(response(items(1))).dtype)
+
+
+def test_unreadable_numbers_fall_back_without_warnings():
+    for bad in ("-", ".", "1.2.3", "64000..5", "-64000"):
+        rows = items(30)
+        rows[3] = f"20250704|{bad}|65000|63000|64500|1000"
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            bars = parse_fchart_sise(response(rows))
+        assert caught == []
+        expected = 30 if bad == "-64000" else 29
+        assert len(bars) == expected
+        assert bars['close'][-1] == 64530
+
+
+def legacy_extract(content):
+    """바이트 검색으로 바꾸기 전 data_collector의 HTML 현재가 추출 방식"""
+    soup = BeautifulSoup(content, 'html.parser')
+    price_elements = soup.select('.no_today .blind')
+    if price_elements:
+        return float(price_elements[0].text.replace(',', ''))
+    return None
+
+
+@pytest.mark.parametrize('filename, expected, fallback', [
+    ('item_005930.html', 71300.0, False),
+    ('item_035420.html', 231500.0, False),
+    ('item_000660_fallback.html', 268500.0, True),
+    ('item_900000_noprice.html', None, True),
+])
+def test_item_page_price_matches_beautifulsoup(filename, expected, fallback, monkeypatch):
+    with open(os.path.join(FIXTURES, filename), 'rb') as f:
+        content = f.read()
+
+    calls = []
+    slow_path = price_parser._find_current_price_bs4
+    monkeypatch.setattr(price_parser, '_find_current_price_bs4',
+                        lambda content: calls.append(1) or slow_path(content))
+
+    assert legacy_extract(content) == expected
+    assert extract_current_price(content) == expected
+    # 마크업이 예상과 다를 때만 BeautifulSoup 대체 경로를 사용
+    assert bool(calls) == fallback
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""배치 RSI 엔진: 종목별 기존 calculate_rsi와 같은 값을 내고, Wilder 한 봉 갱신이 전체 재계산과 같은지 확인"""
+
+import numpy as np
+import pytest
+
+from rsi_engine import calculate_rsi_batch, price_deltas, rsi_from_deltas, wilder_step
+
+
+def legacy_rsi(prices, period=14):
+    """배치 엔진으로 옮기기 전 NaverStockDataCollector.calculate_rsi (기간+1개 가격 구간 기준)"""
+    if len(prices) < period + 1:
+        return None
+    deltas = np.diff(prices)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+    avg_gain = np.mean(gains[:period])
+    avg_loss = np.mean(losses[:period])
+    if avg_loss == 0:
+        return 100
+    rs = avg_gain / avg_loss
+    return round(100 - (100 / (1 + rs)), 2)
+
+
+def series():
+    rng = np.random.default_rng(11)
+    return {
+        'random': np.round(20000 * np.cumprod(1 + rng.normal(0, 0.02, 40))),
+        'flat': np.full(40, 50000.0),
+        'all_gain': 10000 + 100 * np.arange(40.0),
+        'all_loss': 20000 - 100 * np.arange(40.0),
+        # 앞은 오르기만, 뒤는 내리기만 하여 구간마다 한쪽만 있는 경우가 섞임
+        'gain_then_loss': np.concatenate([10000 + 50 * np.arange(20.0), 11000 - 70 * np.arange(1, 21.0)]),
+    }
+
+
+@pytest.mark.parametrize('period', [7, 14])
+def test_batch_matches_per_ticker_rsi(period):
+    data = series()
+    closes = np.vstack(list(data.values()))
+
+    rsi = calculate_rsi_batch(closes, periods=(period,), last_n=None)[period]
+    assert rsi.shape == closes.shape
+    for row, prices in enumerate(data.values()):
+        assert np.isnan(rsi[row, :period]).all()
+        for t in range(period, len(prices)):
+            assert rsi[row, t] == pytest.approx(legacy_rsi(prices[t - period:t + 1], period), abs=1e-9)
+
+    assert (rsi[1, period:] == 100).all()
+    assert (rsi[2, period:] == 100).all()
+    assert (rsi[3, period:] == 0).all()
+
+
+def test_nan_padding_matches_unpadded_rows():
+    data = series()
+    lengths = [40, 25, 16, 30, 10]
+    # 상장 기간이 짧은 종목은 앞을 NaN으로 채워 같은 행렬에 넣음
+    closes = np.full((len(lengths), 40), np.nan)
+    for row, (prices, length) in enumerate(zip(data.values(), lengths)):
+        closes[row, -length:] = prices[-length:]
+
+    batch = calculate_rsi_batch(closes, periods=(7, 14), last_n=2)
+    for row, length in enumerate(lengths):
+        prices = closes[row, -length:]
+        for period in (7, 14):
+            # 어제(가격 하나 제외), 오늘 순서. 가격이 기간+1개보다 적으면 기존 함수처럼 계산하지 않음
+            for value, end in zip(batch[period][row], (length - 1, length)):
+                expected = legacy_rsi(prices[max(0, end - period - 1):end], period)
+                if expected is None:
+                    assert np.isnan(value)
+                else:
+                    assert value == pytest.approx(expected, abs=1e-9)
+
+    # 중간에 빠진 가격이 있으면 그 가격을 포함하는 구간은 계산하지 않음
+    gapped = data['random'].copy()
+    gapped[-3] = np.nan
+    assert np.isnan(calculate_rsi_batch(gapped, periods=(7,), last_n=1)[7][0, 0])
+
+
+@pytest.mark.parametrize('name', ['random', 'flat', 'all_gain', 'all_loss', 'gain_then_loss'])
+def test_wilder_step_matches_full_recompute(name):
+    prices = series()[name]
+    for period in (7, 14):
+        gains, losses, valid = price_deltas(prices[:-1])
+        _, avg_gain, avg_loss = rsi_from_deltas(gains, losses, valid, period, wilder=True)
+
+        rsi, next_gain, next_loss = wilder_step(avg_gain[0, -1], avg_loss[0, -1], prices[-2], prices[-1], period)
+
+        gains, losses, valid = price_deltas(prices)
+        full_rsi, full_gain, full_loss = rsi_from_deltas(gains, losses, valid, period, wilder=True)
+        assert rsi == full_rsi[0, -1]
+        assert next_gain == pytest.approx(full_gain[0, -1], rel=1e-12, abs=1e-12)
+        assert next_loss == pytest.approx(full_loss[0, -1], rel=1e-12, abs=1e-12)
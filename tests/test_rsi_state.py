@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""RSI 증분 상태: 거래일 기준으로만 갱신되고 휴장일에 가짜 봉이 더해지지 않는지 확인"""
+
+import numpy as np
+
+from conftest import make_stocks
+
+import market_calendar
+from market_calendar import session_date, previous_trading_day, is_trading_day
+from rsi_engine import calculate_rsi_batch
+from rsi_state import RSIStateStore
+from data_collector import NaverStockDataCollector
+
+
+def test_session_date(market_now):
+    market_now('2025-07-19 16:00')  # 토요일
+    assert session_date() == '2025-07-18'
+    market_now('2025-07-21 08:30')  # 월요일 장 시작 전
+    assert session_date() == '2025-07-18'
+    market_now('2025-07-21 10:00')
+    assert session_date() == '2025-07-21'
+
+    assert not is_trading_day('2025-08-15')
+    assert previous_trading_day('2025-08-18') == '2025-08-14'
+    market_calendar.set_holidays(['2025-07-18'])
+    assert previous_trading_day('2025-07-21') == '2025-07-17'
+
+
+def test_seed_records_previous_trading_day(tmp_path, market_now):
+    market_now('2025-07-21 16:00')
+    store = RSIStateStore(str(tmp_path / "state.json"))
+    prices = list(20000 * np.cumprod(1 + np.random.default_rng(0).normal(0, 0.02, 30)))
+
+    store.seed('005930', '2025-07-21', prices)
+    assert store.get('005930')['prev']['date'] == '2025-07-18'
+
+
+def test_update_only_from_previous_trading_day(tmp_path, market_now):
+    market_now('2025-07-21 16:00')
+    store = RSIStateStore(str(tmp_path / "state.json"))
+    prices = list(20000 * np.cumprod(1 + np.random.default_rng(1).normal(0, 0.02, 31)))
+    store.seed('005930', '2025-07-18', prices[:-1])  # 금요일
+
+    # 월요일은 금요일 상태에서 한 봉만 갱신 (주말은 봉이 아님)
+    assert store.is_usable('005930', '2025-07-21')
+    rsi = store.update('005930', '2025-07-21', prices[-1])
+    expected = calculate_rsi_batch(prices, periods=(7, 14), last_n=1, wilder=True)
+    assert abs(rsi['today'][14] - expected[14][0, 0]) < 1e-6
+
+    # 화요일을 놓치고 수요일에 실행하면 한 봉으로 건너뛰지 않고 전체 재계산 대상
+    assert not store.is_usable('005930', '2025-07-23')
+
+
+def test_weekend_run_does_not_add_a_bar(naver_stub, tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    naver_stub.session = np.datetime64('2025-07-18', 'D')
+    stocks = make_stocks(3)
+
+    def collect():
+        collector = naver_stub.point(NaverStockDataCollector(state_path="state.json"))
+        return [collector.get_stock_rsi_data(stock) for stock in stocks], collector.rsi_state
+
+    market_now('2025-07-18 16:00')
+    friday, state = collect()
+    friday_states = {stock['ticker']: state.get(stock['ticker']) for stock in stocks}
+    state.save()
+
+    # 토요일/일요일 실행: 같은 금요일 종가로 금요일 결과를 다시 계산할 뿐 상태가 앞으로 가지 않음
+    for now in ('2025-07-19 16:00', '2025-07-20 16:00'):
+        market_now(now)
+        weekend, state = collect()
+        state.save()
+        assert [result['Date'] for result in weekend] == ['2025-07-18'] * 3
+        assert weekend == friday
+        for stock in stocks:
+            assert state.get(stock['ticker'])['periods'] == friday_states[stock['ticker']]['periods']
+
+
+def test_synthetic_history_is_not_seeded(naver_stub, tmp_path, monkeypatch, market_now):
+    monkeypatch.chdir(tmp_path)
+    market_now('2025-07-21 16:00')
+    stock = make_stocks(1)[0]
+    collector = naver_stub.point(NaverStockDataCollector(state_path="state.json"))
+
+    # 차트 API가 실패하면 현재가로 만든 합성 이력으로 오늘 RSI만 계산하고 상태는 남기지 않음
+    naver_stub.fail = {'fchart'}
+    result = collector.get_stock_rsi_data(stock)
+    assert result is not None and naver_stub.count('polling') == 1
+    assert collector.rsi_state.get(stock['ticker']) is None
+
+    naver_stub.fail = set()
+    assert collector.get_stock_rsi_data(stock) is not None
+    assert collector.rsi_state.get(stock['ticker'])['prev']['date'] == '2025-07-18'
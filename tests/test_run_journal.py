@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""수집 저널: 쓰다 만 마지막 줄 뒤에 이어서 기록해도 새 기록이 손상되지 않는지 확인"""
+
+import os
+
+import pytest
+
+from run_journal import RunJournal
+
+
+def write_torn_journal(directory, tail):
+    journal = RunJournal(directory, run_date='2025-07-21')
+    journal.open()
+    journal.record('005930', {'Ticker': '005930', 'RSI14': 41.2})
+    journal.record('000660', {'Ticker': '000660', 'RSI14': 55.0})
+    journal.close()
+    # 기록 도중 중단되어 마지막 줄이 잘린 상태
+    with open(journal.path, 'ab') as f:
+        f.write(tail)
+    return journal.path
+
+
+@pytest.mark.parametrize('tail', [b'{"ticker": "373220", "result": {"Tick', b'{"ticker": "3732' * 1000, b''],
+                         ids=['torn', 'torn-long', 'intact'])
+def test_resume_after_torn_line(tmp_path, tail):
+    directory = str(tmp_path / "run_journal")
+    path = write_torn_journal(directory, tail)
+
+    journal = RunJournal(directory, run_date='2025-07-21')
+    assert sorted(journal.open()) == ['000660', '005930']
+    journal.record('373220', {'Ticker': '373220', 'RSI14': 28.7})
+    journal.close()
+
+    entries = RunJournal(directory, run_date='2025-07-21').open()
+    assert sorted(entries) == ['000660', '005930', '373220']
+    assert entries['373220']['result']['RSI14'] == 28.7
+    with open(path, 'rb') as f:
+        assert f.read().count(b'\n') == 3
+
+
+def test_torn_first_line_is_dropped(tmp_path):
+    directory = str(tmp_path / "run_journal")
+    os.makedirs(directory)
+    journal = RunJournal(directory, run_date='2025-07-21')
+    with open(journal.path, 'wb') as f:
+        f.write(b'{"ticker": "0059')
+
+    # 완료된 종목이 없으면 처음부터 새로 기록
+    assert journal.open() == {}
+    journal.record('005930', {'Ticker': '005930', 'RSI14': 41.2})
+    journal.close()
+    assert sorted(RunJournal(directory, run_date='2025-07-21').open()) == ['005930']
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""스케줄러: 월별 작업 실패는 완료로 기록하지 않고, 월초 휴장일 수집은 거래일이 속한 월로 압축하는지 확인"""
+
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import scheduler
+from metrics import NULL_METRICS
+from scheduler import JobRunner, KOSPI200Scheduler, catch_up, last_deadline
+
+
+@pytest.fixture
+def failing_scheduler(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    instance = KOSPI200Scheduler()
+    monkeypatch.setattr(instance, 'collect_and_update_data', lambda is_new_month=False: False)
+    monkeypatch.setattr(scheduler, '_scheduler', instance)
+    return instance
+
+
+def test_failed_monthly_job_leaves_daily_deadline_unsatisfied(failing_scheduler, tmp_path):
+    assert failing_scheduler.create_monthly_file() is False
+
+    state_path = str(tmp_path / "scheduler_state.json")
+    runner = JobRunner(state_path)
+    before = datetime(2025, 7, 31, 16, 5)
+    runner.mark('monthly', before)
+    runner.mark('daily', before)
+
+    runner.submit('monthly', scheduler.job_monthly_reset, covers=('daily',))
+    runner.stop(timeout=5)
+    assert runner.last_run('monthly') == before
+    assert runner.last_run('daily') == before
+
+    # 다시 시작하면 놓친 작업으로 보고 월별 작업(일일 수집 포함)을 다시 실행
+    now = datetime(2025, 8, 1, 17, 0)
+    assert runner.last_run('daily') < last_deadline(now, scheduler.DAILY_AT)
+    runner = JobRunner(state_path)
+    try:
+        assert catch_up(runner, now) == ['monthly', 'daily']
+    finally:
+        runner.stop(timeout=5)
+
+
+def test_first_of_month_before_open_compacts_previous_month(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class FirstOfMonth(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2025, 8, 1, 9, 0)
+
+    monkeypatch.setattr(scheduler, 'datetime', FirstOfMonth)
+    instance = KOSPI200Scheduler()
+    # 8월 1일 장 시작 전에 받은 시세는 7월 31일 거래일 것
+    results = [{'Ticker': '005930', 'Name': '삼성전자', 'Industry': '반도체와반도체장비', 'Date': '2025-07-31',
+                'RSI7': 20.0, 'RSI14': 25.0, 'Yesterday_RSI7': 30.0, 'Yesterday_RSI14': 35.0}]
+    instance._collector = SimpleNamespace(collect_all_data=lambda: results, metrics=NULL_METRICS,
+                                          export_metrics=lambda: None)
+    compacted = []
+    monkeypatch.setattr(instance.store, 'compact_month_in_background',
+                        lambda year, month, filename: compacted.append(
+                            (year, month, filename, instance.store.compact_month(year, month, filename))))
+
+    assert instance.collect_and_update_data(is_new_month=True)
+    assert compacted == [(2025, 7, "results_코스피_200_2025_07.csv", 1)]
+    assert os.path.exists(instance.store.partition_path('2025-07-31'))
+    assert not os.path.exists("results_코스피_200_2025_08.csv")
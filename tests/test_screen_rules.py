@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""선별 규칙: 허용되지 않는 식을 거부하고, 결측값을 거짓으로 처리하며, 기본 규칙이 기존 조건과 같은지 확인"""
+
+import json
+
+import numpy as np
+import pytest
+
+from screen_rules import Screen, compile_expression
+
+
+def meets_rsi_conditions(rsi_data):
+    """기본 규칙으로 옮기기 전 NaverStockDataCollector.meets_rsi_conditions의 조건"""
+    rsi7 = rsi_data.get('RSI7')
+    rsi14 = rsi_data.get('RSI14')
+    rsi7_yesterday = rsi_data.get('Yesterday_RSI7')
+    rsi14_yesterday = rsi_data.get('Yesterday_RSI14')
+    if not all([rsi7, rsi14, rsi7_yesterday, rsi14_yesterday]):
+        return False
+    return (rsi7 <= 30 or rsi7 >= 70 or rsi14 <= 30 or rsi14 >= 70
+            or abs(rsi7 - rsi7_yesterday) >= 5 or abs(rsi14 - rsi14_yesterday) >= 3
+            or (rsi7_yesterday <= 50 and rsi7 > 50) or (rsi7_yesterday >= 50 and rsi7 < 50))
+
+
+@pytest.mark.parametrize('text', [
+    "__import__('os').system('true')",
+    "RSI7.real > 0",
+    "open('x')",
+    "abs(RSI7, key=1) > 0",
+    "RSI7 if RSI14 else 0",
+    "[RSI7][0] > 0",
+    "RSI7 ** 2 > 0",
+    "RSI7 >",
+])
+def test_disallowed_expressions_are_rejected(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+def test_expression_columns_and_operators():
+    func, names = compile_expression("0 < RSI7 - Yesterday_RSI7 <= 5 or not max(RSI14, 40) > 40")
+    assert names == {'RSI7', 'Yesterday_RSI7', 'RSI14'}
+    columns = {'RSI7': np.array([32.0, 40.0, 20.0]), 'Yesterday_RSI7': np.array([30.0, 30.0, 30.0]),
+               'RSI14': np.array([50.0, 50.0, 35.0])}
+    assert func(columns).tolist() == [True, False, True]
+
+
+def test_missing_values_never_match():
+    screen = Screen([{'name': 'low', 'when': "RSI7 <= 30"}, {'name': 'weak', 'when': "not RSI14 > 50"}],
+                    require=['RSI7'])
+    columns = {'RSI7': np.array([[np.nan, 20.0], [40.0, 25.0]]), 'RSI14': np.array([[10.0, np.nan], [60.0, 80.0]])}
+
+    masks = screen.masks(columns)
+    # require 열이 비면 규칙과 관계없이 거짓, 식 안의 NaN 비교는 거짓(not은 참)
+    assert masks['low'].tolist() == [[False, True], [False, True]]
+    assert masks['weak'].tolist() == [[False, True], [False, False]]
+
+    matched, fired = screen.evaluate([{'RSI7': '', 'RSI14': 10}, {'RSI7': 'n/a', 'RSI14': 10}, {'RSI7': 25}])
+    assert matched.tolist() == [False, False, True]
+    assert fired == [[], [], ['low', 'weak']]
+
+    with pytest.raises(KeyError):
+        screen.masks({'RSI7': np.array([1.0])})
+
+
+def test_default_rules_match_previous_conditions():
+    rng = np.random.default_rng(7)
+    keys = ('RSI7', 'RSI14', 'Yesterday_RSI7', 'Yesterday_RSI14')
+    # 기존 조건은 0을 결측으로 보았으므로 값은 0이 나오지 않는 범위에서 뽑고, 경계값과 결측을 섞음
+    records = [dict(zip(keys, rng.uniform(1, 99, 4).round(1))) for _ in range(2000)]
+    records += [
+        {'RSI7': 30, 'RSI14': 50, 'Yesterday_RSI7': 30, 'Yesterday_RSI14': 50},
+        {'RSI7': 50, 'RSI14': 50, 'Yesterday_RSI7': 50, 'Yesterday_RSI14': 50},
+        {'RSI7': 51, 'RSI14': 50, 'Yesterday_RSI7': 50, 'Yesterday_RSI14': 50},
+        {'RSI7': 55, 'RSI14': 53, 'Yesterday_RSI7': 52, 'Yesterday_RSI14': 50},
+        {'RSI7': 20, 'RSI14': 50, 'Yesterday_RSI7': None, 'Yesterday_RSI14': 50},
+        {'RSI7': 20, 'RSI14': 50, 'Yesterday_RSI14': 50},
+    ]
+
+    matched, _ = Screen().evaluate(records)
+    assert matched.tolist() == [meets_rsi_conditions(record) for record in records]
+
+
+def test_load_rules_from_file(tmp_path):
+    path = tmp_path / "screen_rules.json"
+    path.write_text(json.dumps({'require': ['RSI14'], 'rules': [{'when': "RSI14 < 30"}]}), encoding='utf-8')
+
+    screen = Screen.load(str(path))
+    assert screen.names == ['rule1']
+    assert Screen.load(str(tmp_path / "missing.json")).names == Screen().names
+
+    path.write_text(json.dumps({'rules': [{'when': "RSI14.__class__"}]}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        Screen.load(str(path))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""종목 목록 로더: 저장해 둔 네이버증권 페이지(EUC-KR)에서 종목/업종을 읽고 갱신 시 편입/제외만 반영하는지 확인"""
+
+import os
+import json
+
+import pytest
+
+from universe import (UniverseLoader, decode_page, parse_item_links, parse_last_page, parse_industry_links,
+                      BASE_URL)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "naver")
+
+# 요청 경로 -> 저장해 둔 페이지
+PAGES = {
+    "/sise/entryJongmok.naver?type=KPI200&page=1": "kpi200_page1.html",
+    "/sise/entryJongmok.naver?type=KPI200&page=2": "kpi200_page2.html",
+    "/sise/sise_group.naver?type=upjong": "upjong_list.html",
+    "/item/main.naver?code=035420": "item_035420.html",
+}
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise IOError(f"HTTP {self.status_code}")
+
+
+class FakeNaver:
+    """저장해 둔 페이지로 응답하고 요청 경로를 기록하는 get 함수"""
+
+    def __init__(self):
+        self.requested = []
+
+    def __call__(self, url, **kwargs):
+        path = url[len(BASE_URL):]
+        self.requested.append(path)
+        if path not in PAGES:
+            return FakeResponse(b'', 404)
+        return FakeResponse(fixture(PAGES[path]))
+
+
+def test_parse_item_links():
+    html = decode_page(fixture("kpi200_page1.html"))
+    assert parse_item_links(html) == [
+        ('005930', '삼성전자'), ('000660', 'SK하이닉스'), ('373220', 'LG에너지솔루션'),
+        ('207940', '삼성바이오로직스'), ('005380', '현대차'),
+    ]
+    # 같은 페이지의 중복 링크는 한 번만
+    item_page = decode_page(fixture("item_035420.html"))
+    assert parse_item_links(item_page + item_page) == [('035420', 'NAVER'), ('035720', '카카오')]
+
+
+def test_parse_last_page():
+    assert parse_last_page(decode_page(fixture("kpi200_page1.html"))) == 2
+    # 마지막 페이지에는 '맨뒤' 링크가 없음
+    assert parse_last_page(decode_page(fixture("kpi200_page2.html"))) == 1
+
+
+def test_parse_industry_links():
+    groups = parse_industry_links(decode_page(fixture("upjong_list.html")))
+    assert groups == [('278', '반도체와반도체장비'), ('273', '자동차'), ('267', '양방향미디어와서비스')]
+    assert parse_industry_links(decode_page(fixture("item_035420.html"))) == [('267', '양방향미디어와서비스')]
+
+
+def test_fetch_members_dedupes_across_pages():
+    loader = UniverseLoader(None, get=FakeNaver(), max_workers=1)
+    members = loader.fetch_members('KOSPI200')
+    assert [ticker for ticker, _ in members] == ['005930', '000660', '373220', '207940', '005380', '035420', '000270']
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_refresh_applies_only_added_and_removed(tmp_path, max_workers):
+    cache_path = str(tmp_path / "universe.json")
+    previous = [
+        {'ticker': '005930', 'name': '삼성전자', 'industry': '반도체와반도체장비'},
+        {'ticker': '000660', 'name': 'SK하이닉스', 'industry': '반도체와반도체장비'},
+        {'ticker': '373220', 'name': 'LG에너지솔루션', 'industry': '전기제품'},
+        {'ticker': '207940', 'name': '삼성바이오로직스', 'industry': '생물공학'},
+        {'ticker': '005380', 'name': '현대차', 'industry': '자동차'},
+        {'ticker': '000270', 'name': '기아', 'industry': '자동차'},
+        {'ticker': '068270', 'name': '셀트리온', 'industry': '제약'},
+    ]
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'KOSPI200': {'date': '2025-07-18', 'stocks': previous}}, f, ensure_ascii=False)
+
+    naver = FakeNaver()
+    loader = UniverseLoader(cache_path, get=naver, max_workers=max_workers)
+    stocks, added, removed = loader.refresh('KOSPI200')
+
+    assert added == ['035420']
+    assert removed == ['068270']
+    # 기존 종목은 저장된 산업군을 쓰고, 새로 편입된 종목 페이지만 조회
+    assert sorted(naver.requested) == sorted(list(PAGES)[:2] + ["/item/main.naver?code=035420"])
+    industries = {stock['ticker']: stock['industry'] for stock in stocks}
+    assert industries['035420'] == '양방향미디어와서비스'
+    assert industries['373220'] == '전기제품'
+    assert '068270' not in industries
+
+    changes = UniverseLoader(cache_path, get=naver).changes('KOSPI200')
+    assert changes['added'] == ['035420'] and changes['removed'] == ['068270']
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 대상 종목 목록(유니버스) 로더
+
+- 네이버증권 목록 페이지에서 코스피200 구성 종목(또는 코스피/코스닥 전 종목)을 수집
+- 첫 페이지에서 마지막 페이지 번호를 읽고 나머지 페이지는 동시에 요청
+- 결과는 JSON 파일에 캐시하여 같은 날에는 네트워크 요청 없이 사용 (하루 단위 만료)
+- 만료 후 갱신 시 편입/제외 종목만 반영하고, 새로 편입된 종목만 산업군을 조회
+- 갱신에 실패하면 마지막으로 받은 목록을 그대로 사용
+
+사용 예:
+    loader = UniverseLoader("universe.json")
+    stocks = loader.load('KOSPI200')    # [{'ticker': '005930', 'name': '삼성전자', 'industry': '반도체와반도체장비'}, ...]
+"""
+
+import os
+import re
+import json
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+UNIVERSE_FILENAME = "universe.json"
+BASE_URL = "https://finance.naver.com"
+
+# 시장별 목록 페이지 (page는 1부터)
+MARKET_PAGES = {
+    'KOSPI200': "/sise/entryJongmok.naver?type=KPI200&page={page}",
+    'KOSPI': "/sise/sise_market_sum.naver?sosok=0&page={page}",
+    'KOSDAQ': "/sise/sise_market_sum.naver?sosok=1&page={page}",
+}
+INDUSTRY_LIST_PAGE = "/sise/sise_group.naver?type=upjong"
+INDUSTRY_PAGE = "/sise/sise_group_detail.naver?type=upjong&no={no}"
+ITEM_PAGE = "/item/main.naver?code={ticker}"
+
+# 산업군을 모르는 종목이 이보다 많으면 종목 페이지 대신 업종 페이지 전체를 조회
+INDUSTRY_SCAN_THRESHOLD = 30
+
+_ITEM_LINK = re.compile(r'href="/item/main\.naver\?code=(\d{6})"[^>]*>\s*([^<]+?)\s*</a>')
+_LAST_PAGE = re.compile(r'class="pgRR".*?page=(\d+)', re.S)
+_INDUSTRY_LINK = re.compile(r'sise_group_detail\.naver\?type=upjong&(?:amp;)?no=(\d+)"[^>]*>\s*([^<]+?)\s*</a>')
+
+
+def decode_page(content):
+    """네이버증권 페이지 본문을 문자열로 변환합니다. (대부분 EUC-KR, 일부 UTF-8)"""
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content.decode('cp949', errors='replace')
+
+
+def parse_item_links(html):
+    """
+    목록 페이지에서 종목 링크를 추출합니다.
+
+    Returns:
+        [(종목코드, 종목명), ...] (페이지 순서, 중복 제거)
+    """
+    seen = set()
+    items = []
+    for ticker, name in _ITEM_LINK.findall(html):
+        if ticker not in seen:
+            seen.add(ticker)
+            items.append((ticker, name))
+    return items
+
+
+def parse_last_page(html):
+    """목록 페이지의 '맨뒤' 링크에서 마지막 페이지 번호를 읽습니다. 없으면 1"""
+    match = _LAST_PAGE.search(html)
+    return int(match.group(1)) if match else 1
+
+
+def parse_industry_links(html):
+    """업종 목록 페이지 또는 종목 페이지에서 (업종 번호, 업종명) 목록을 추출합니다."""
+    return _INDUSTRY_LINK.findall(html)
+
+
+class UniverseLoader:
+    def __init__(self, cache_path=UNIVERSE_FILENAME, get=None, max_workers=4, base_url=BASE_URL):
+        """
+        Args:
+            cache_path: 종목 목록 캐시 파일 경로 (None이면 메모리에만 보관)
+            get: GET 요청 함수 (url, **kwargs) -> 응답 (None이면 requests 세션 사용)
+            max_workers: 페이지 동시 요청 수
+            base_url: 네이버증권 주소 (로컬에 저장해 둔 페이지로 확인할 때 변경)
+        """
+        self.cache_path = cache_path
+        self.max_workers = max(1, int(max_workers))
+        self.base_url = base_url.rstrip('/')
+        if get is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = 'Mozilla/5.0'
+            get = session.get
+        self._get = get
+        self._lock = threading.Lock()
+        self._cache = self._load_cache()
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"종목 목록 캐시 읽기 실패: {e}")
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._cache, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def _fetch(self, path):
+        """페이지 하나를 받아 문자열로 반환합니다."""
+        response = self._get(self.base_url + path, timeout=10)
+        response.raise_for_status()
+        return decode_page(response.content)
+
+    def _fetch_all(self, paths):
+        """여러 페이지를 동시에 받습니다. (요청 순서대로 반환)"""
+        if len(paths) <= 1 or self.max_workers == 1:
+            return [self._fetch(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as executor:
+            return list(executor.map(self._fetch, paths))
+
+    def fetch_members(self, market):
+        """
+        시장의 목록 페이지를 모두 받아 종목 목록을 만듭니다.
+
+        Returns:
+            [(종목코드, 종목명), ...] (목록 페이지 순서)
+        """
+        template = MARKET_PAGES[market]
+        first = self._fetch(template.format(page=1))
+        last_page = parse_last_page(first)
+        pages = [first] + self._fetch_all([template.format(page=page) for page in range(2, last_page + 1)])
+
+        members = {}
+        for html in pages:
+            for ticker, name in parse_item_links(html):
+                members.setdefault(ticker, name)
+        return list(members.items())
+
+    def fetch_industries(self, tickers):
+        """
+        종목들의 산업군을 조회합니다.
+
+        종목이 많으면 업종 목록과 업종별 페이지 전체를, 적으면 해당 종목 페이지만 받습니다.
+
+        Returns:
+            {종목코드: 산업군} (찾지 못한 종목은 없음)
+        """
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+
+        industries = {}
+        if len(tickers) > INDUSTRY_SCAN_THRESHOLD:
+            groups = parse_industry_links(self._fetch(INDUSTRY_LIST_PAGE))
+            pages = self._fetch_all([INDUSTRY_PAGE.format(no=no) for no, _ in groups])
+            wanted = set(tickers)
+            for (_, industry), html in zip(groups, pages):
+                for ticker, _ in parse_item_links(html):
+                    if ticker in wanted:
+                        industries.setdefault(ticker, industry)
+        else:
+            pages = self._fetch_all([ITEM_PAGE.format(ticker=ticker) for ticker in tickers])
+            for ticker, html in zip(tickers, pages):
+                links = parse_industry_links(html)
+                if links:
+                    industries[ticker] = links[0][1]
+        return industries
+
+    def refresh(self, market='KOSPI200'):
+        """
+        종목 목록을 새로 받아 캐시에 편입/제외 종목만 반영합니다.
+
+        Returns:
+            (종목 리스트, 편입 종목코드 리스트, 제외 종목코드 리스트) 튜플
+        """
+        entry = self._cache.get(market, {})
+        previous = {stock['ticker']: stock for stock in entry.get('stocks', [])}
+
+        members = self.fetch_members(market)
+        if not members:
+            raise ValueError(f"{market} 목록 페이지에서 종목을 찾지 못했습니다")
+
+        current = {ticker for ticker, _ in members}
+        added = [ticker for ticker, _ in members if ticker not in previous]
+        removed = [ticker for ticker in previous if ticker not in current]
+
+        # 기존 종목은 저장된 산업군을 그대로 쓰고, 새로 편입됐거나 산업군을 모르는 종목만 조회
+        unknown = [ticker for ticker, _ in members if not previous.get(ticker, {}).get('industry')]
+        try:
+            industries = self.fetch_industries(unknown)
+        except Exception as e:
+            logging.warning(f"산업군 조회 실패: {e}")
+            industries = {}
+
+        stocks = []
+        for ticker, name in members:
+            industry = previous.get(ticker, {}).get('industry') or industries.get(ticker, '')
+            stocks.append({'ticker': ticker, 'name': name, 'industry': industry})
+
+        today = datetime.now().strftime('%Y-%m-%d')
+        with self._lock:
+            self._cache[market] = {
+                'date': today,
+                'stocks': stocks,
+                'changes': {'date': today, 'added': added, 'removed': removed} if previous else
+                           entry.get('changes'),
+            }
+            self._save_cache()
+
+        if previous and (added or removed):
+            logging.info(f"{market} 종목 변경: 편입 {len(added)}개 {added[:10]}, 제외 {len(removed)}개 {removed[:10]}")
+        return stocks, added, removed
+
+    def load(self, market='KOSPI200', force=False):
+        """
+        종목 목록을 반환합니다. 오늘 받은 캐시가 있으면 그대로 사용합니다.
+
+        Args:
+            market: 'KOSPI200', 'KOSPI', 'KOSDAQ'
+            force: True면 캐시 날짜와 무관하게 새로 받음
+
+        Returns:
+            [{'ticker', 'name', 'industry'}, ...] (받을 수 없고 캐시도 없으면 빈 리스트)
+        """
+        if market not in MARKET_PAGES:
+            raise ValueError(f"지원하지 않는 시장입니다: {market} (가능: {', '.join(MARKET_PAGES)})")
+
+        entry = self._cache.get(market)
+        today = datetime.now().strftime('%Y-%m-%d')
+        if entry and entry.get('date') == today and not force:
+            return entry['stocks']
+
+        try:
+            stocks, _, _ = self.refresh(market)
+            logging.info(f"{market} 종목 목록 갱신: {len(stocks)}개")
+            return stocks
+        except Exception as e:
+            if entry:
+                logging.warning(f"{market} 종목 목록 갱신 실패, {entry.get('date')} 목록 사용: {e}")
+                return entry['stocks']
+            logging.error(f"{market} 종목 목록 수집 실패: {e}")
+            return []
+
+    def changes(self, market='KOSPI200'):
+        """마지막 갱신의 편입/제외 종목 ({'date', 'added', 'removed'} 또는 None)"""
+        return self._cache.get(market, {}).get('changes')